@@ -0,0 +1,49 @@
+"""evaluation records
+
+Revision ID: 5d8a3f61b2c9
+Revises: e41a7b6c0d28
+Create Date: 2026-10-19 11:52:08.417530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8a3f61b2c9'
+down_revision: Union[str, Sequence[str], None] = 'e41a7b6c0d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('evaluation_records',
+    sa.Column('environment_id', sa.String(), nullable=False),
+    sa.Column('episodes', sa.Integer(), nullable=False),
+    sa.Column('seed', sa.Integer(), nullable=False),
+    sa.Column('mean_return', sa.Float(), nullable=False),
+    sa.Column('std_return', sa.Float(), nullable=False),
+    sa.Column('min_return', sa.Float(), nullable=False),
+    sa.Column('max_return', sa.Float(), nullable=False),
+    sa.Column('percentiles', sa.JSON(), nullable=False),
+    sa.Column('mean_length', sa.Float(), nullable=False),
+    sa.Column('returns', sa.JSON(), nullable=True),
+    sa.Column('q_table_states', sa.Integer(), nullable=True),
+    sa.Column('duration_seconds', sa.Float(), nullable=True),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['environment_id'], ['environments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_evaluation_records_id'), 'evaluation_records', ['id'], unique=True)
+    op.create_index('ix_evaluation_records_environment_id_created_at', 'evaluation_records', ['environment_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_evaluation_records_environment_id_created_at', table_name='evaluation_records')
+    op.drop_index(op.f('ix_evaluation_records_id'), table_name='evaluation_records')
+    op.drop_table('evaluation_records')
@@ -0,0 +1,40 @@
+"""training session summary stats
+
+Revision ID: 7c2e91d0a4f3
+Revises: 4a1109b5dbc6
+Create Date: 2026-10-19 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e91d0a4f3'
+down_revision: Union[str, Sequence[str], None] = '4a1109b5dbc6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('training_sessions', sa.Column('reward_mean', sa.Float(), nullable=True))
+    op.add_column('training_sessions', sa.Column('reward_std', sa.Float(), nullable=True))
+    op.add_column('training_sessions', sa.Column('reward_min', sa.Float(), nullable=True))
+    op.add_column('training_sessions', sa.Column('reward_max', sa.Float(), nullable=True))
+    op.add_column('training_sessions', sa.Column('td_error_mean', sa.Float(), nullable=True))
+    op.add_column('training_sessions', sa.Column('td_error_max', sa.Float(), nullable=True))
+    op.add_column('training_sessions', sa.Column('epsilon', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('training_sessions', 'epsilon')
+    op.drop_column('training_sessions', 'td_error_max')
+    op.drop_column('training_sessions', 'td_error_mean')
+    op.drop_column('training_sessions', 'reward_max')
+    op.drop_column('training_sessions', 'reward_min')
+    op.drop_column('training_sessions', 'reward_std')
+    op.drop_column('training_sessions', 'reward_mean')
@@ -0,0 +1,48 @@
+"""sweeps
+
+Revision ID: a92c4e7d1f60
+Revises: 5d8a3f61b2c9
+Create Date: 2026-10-19 12:14:51.093826
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a92c4e7d1f60'
+down_revision: Union[str, Sequence[str], None] = '5d8a3f61b2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sweeps',
+    sa.Column('environment_id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('spec', sa.JSON(), nullable=False),
+    sa.Column('trials', sa.JSON(), nullable=True),
+    sa.Column('best_params', sa.JSON(), nullable=True),
+    sa.Column('best_score', sa.Float(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['environment_id'], ['environments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sweeps_id'), 'sweeps', ['id'], unique=True)
+    op.create_index('ix_sweeps_environment_id_created_at', 'sweeps', ['environment_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sweeps_environment_id_created_at', table_name='sweeps')
+    op.drop_index(op.f('ix_sweeps_id'), table_name='sweeps')
+    op.drop_table('sweeps')
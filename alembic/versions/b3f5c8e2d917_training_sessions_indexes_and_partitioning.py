@@ -0,0 +1,128 @@
+"""training_sessions indexes and optional partitioning
+
+Revision ID: b3f5c8e2d917
+Revises: 7c2e91d0a4f3
+Create Date: 2026-10-19 10:03:54.118602
+
+Adds a composite (environment_id, started_at) index so per-environment
+history queries become index range scans instead of sequential scans.
+
+On PostgreSQL, `training_sessions` can optionally be converted into a table
+partitioned by month on `started_at`:
+
+    alembic -x partition_training_sessions=true upgrade head
+
+Monthly partitions are created from the oldest session up to a few months
+ahead; a DEFAULT partition catches anything outside that range. Later months
+are created by the "training-session-partitions" background task
+(app.tasks.partitions), which also moves rows out of DEFAULT. Note that a
+partitioned table cannot keep the unique index on `id` alone, so the primary
+key becomes (id, started_at).
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f5c8e2d917'
+down_revision: Union[str, Sequence[str], None] = '7c2e91d0a4f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX_NAME = 'ix_training_sessions_environment_id_started_at'
+MONTHS_AHEAD = 3
+
+
+def _partitioning_requested() -> bool:
+    value = context.get_x_argument(as_dictionary=True).get('partition_training_sessions', '')
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _is_partitioned(bind) -> bool:
+    return bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'training_sessions')"
+    )).scalar()
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def _partition_training_sessions(bind) -> None:
+    oldest = bind.execute(sa.text("SELECT min(started_at) FROM training_sessions")).scalar()
+    today = date.today().replace(day=1)
+    start = oldest.date().replace(day=1) if oldest else today
+    end = _add_months(today, MONTHS_AHEAD)
+
+    op.execute("ALTER TABLE training_sessions RENAME TO training_sessions_unpartitioned")
+    op.execute(
+        "CREATE TABLE training_sessions "
+        "(LIKE training_sessions_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (started_at)"
+    )
+
+    month = start
+    while month < end:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE training_sessions_{month:%Y_%m} PARTITION OF training_sessions "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE training_sessions_default PARTITION OF training_sessions DEFAULT")
+
+    op.execute("INSERT INTO training_sessions SELECT * FROM training_sessions_unpartitioned")
+    op.execute("DROP TABLE training_sessions_unpartitioned")
+
+    op.create_primary_key('training_sessions_pkey', 'training_sessions', ['id', 'started_at'])
+    op.create_foreign_key(
+        'training_sessions_environment_id_fkey', 'training_sessions', 'environments',
+        ['environment_id'], ['id'],
+    )
+    op.create_index(INDEX_NAME, 'training_sessions', ['environment_id', 'started_at'], unique=False)
+
+
+def _unpartition_training_sessions() -> None:
+    op.execute("ALTER TABLE training_sessions RENAME TO training_sessions_partitioned")
+    op.execute(
+        "CREATE TABLE training_sessions "
+        "(LIKE training_sessions_partitioned INCLUDING DEFAULTS)"
+    )
+    op.execute("INSERT INTO training_sessions SELECT * FROM training_sessions_partitioned")
+    op.execute("DROP TABLE training_sessions_partitioned CASCADE")
+
+    op.create_primary_key('training_sessions_pkey', 'training_sessions', ['id'])
+    op.create_foreign_key(
+        'training_sessions_environment_id_fkey', 'training_sessions', 'environments',
+        ['environment_id'], ['id'],
+    )
+    op.create_index(op.f('ix_training_sessions_id'), 'training_sessions', ['id'], unique=True)
+    op.create_index(INDEX_NAME, 'training_sessions', ['environment_id', 'started_at'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql' and _partitioning_requested():
+        _partition_training_sessions(bind)
+        return
+
+    op.create_index(INDEX_NAME, 'training_sessions', ['environment_id', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql' and _is_partitioned(bind):
+        _unpartition_training_sessions()
+
+    op.drop_index(INDEX_NAME, table_name='training_sessions')
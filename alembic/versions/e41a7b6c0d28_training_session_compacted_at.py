@@ -0,0 +1,28 @@
+"""training session compacted_at
+
+Revision ID: e41a7b6c0d28
+Revises: b3f5c8e2d917
+Create Date: 2026-10-19 11:27:45.836214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a7b6c0d28'
+down_revision: Union[str, Sequence[str], None] = 'b3f5c8e2d917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('training_sessions', sa.Column('compacted_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('training_sessions', 'compacted_at')
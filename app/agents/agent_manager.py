@@ -2,11 +2,16 @@ import os
 import pickle
 from typing import Optional
 from app.agents.q_agent import QAgent
+from app.core.metrics import registry
 
 MODEL_DIR = "agents/models"
 
 os.makedirs(MODEL_DIR, exist_ok=True)
 
+Q_TABLE_STATES = registry.gauge(
+    "rlforge_q_table_states", "Number of states in the saved Q-table", ["env_name"]
+)
+
 class AgentManager:
     @staticmethod
     def get_model_path(env_name: str) -> str:
@@ -17,7 +22,9 @@ class AgentManager:
         path = AgentManager.get_model_path(env_name)
         if os.path.exists(path):
             with open(path, "rb") as f:
-                return pickle.load(f)
+                agent = pickle.load(f)
+            Q_TABLE_STATES.labels(env_name).set(len(agent.q_table))
+            return agent
         return None
 
     @staticmethod
@@ -25,3 +32,11 @@ class AgentManager:
         path = AgentManager.get_model_path(env_name)
         with open(path, "wb") as f:
             pickle.dump(agent, f)
+        Q_TABLE_STATES.labels(env_name).set(len(agent.q_table))
+
+    @staticmethod
+    def save_shared(env_name: str, q_table, agent: QAgent) -> QAgent:
+        """Save `agent` with a private copy of a SharedQTable that workers trained."""
+        agent.q_table = q_table.to_dict()
+        AgentManager.save(env_name, agent)
+        return agent
@@ -2,39 +2,74 @@ import numpy as np
 import random
 
 class QAgent:
-    def __init__(self, state_size, action_size, learning_rate=0.1, discount_factor=0.99, epsilon=1.0):
+    # Defaults for agents pickled before these were configurable
+    epsilon_decay = 0.995
+    epsilon_min = 0.01
+
+    def __init__(self, state_size, action_size, learning_rate=0.1, discount_factor=0.99, epsilon=1.0,
+                 epsilon_decay=0.995, epsilon_min=0.01):
         self.state_size = state_size
         self.action_size = action_size
         self.lr = learning_rate
         self.gamma = discount_factor
         self.epsilon = epsilon
+        self.epsilon_decay = epsilon_decay
+        self.epsilon_min = epsilon_min
         self.q_table = {}
 
     def get_state_key(self, state):
         return tuple(np.round(state, 4))
 
+    def _values(self, key):
+        """Action values of `key`, added as zeros if unseen."""
+        values = self.q_table.get(key)
+        if values is None:
+            # setdefault: a table shared between processes may have gained the key meanwhile
+            values = self.q_table.setdefault(key, np.zeros(self.action_size))
+        return values
+
     def choose_action(self, state):
-        key = self.get_state_key(state)
-        if key not in self.q_table:
-            self.q_table[key] = np.zeros(self.action_size)
+        values = self._values(self.get_state_key(state))
 
         if random.uniform(0, 1) < self.epsilon:
             return random.randint(0, self.action_size - 1)
-        return int(np.argmax(self.q_table[key]))
+        return int(np.argmax(values))
 
-    def learn(self, state, action, reward, next_state, done):
-        key = self.get_state_key(state)
-        next_key = self.get_state_key(next_state)
+    def greedy_action(self, state):
+        """Best known action, without exploring or adding states to the Q-table."""
+        values = self.q_table.get(self.get_state_key(state))
+        return 0 if values is None else int(np.argmax(values))
 
-        if key not in self.q_table:
-            self.q_table[key] = np.zeros(self.action_size)
-        if next_key not in self.q_table:
-            self.q_table[next_key] = np.zeros(self.action_size)
+    def learn(self, state, action, reward, next_state, done):
+        values = self._values(self.get_state_key(state))
+        next_values = self._values(self.get_state_key(next_state))
 
-        best_next = np.max(self.q_table[next_key])
+        best_next = np.max(next_values)
         td_target = reward + self.gamma * best_next * (not done)
-        td_error = td_target - self.q_table[key][action]
-        self.q_table[key][action] += self.lr * td_error
+        td_error = td_target - values[action]
+        values[action] += self.lr * td_error
 
         if done:
-            self.epsilon = max(0.01, self.epsilon * 0.995)
+            self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+
+        return td_error
+
+    def replay(self, buffer, batch_size):
+        """
+        One TD update per transition of a minibatch sampled from `buffer`,
+        all computed from the values before the batch. Returns the TD errors.
+        """
+        indices, weights = buffer.sample(batch_size)
+        rows = [self._values(tuple(key)) for key in buffer.states[indices]]
+        next_rows = [self._values(tuple(key)) for key in buffer.next_states[indices]]
+        actions = buffer.actions[indices]
+
+        best_next = np.max(next_rows, axis=1)
+        td_target = buffer.rewards[indices] + self.gamma * best_next * ~buffer.dones[indices]
+        td_errors = td_target - np.array(rows)[np.arange(len(rows)), actions]
+        deltas = self.lr * td_errors if weights is None else self.lr * weights * td_errors
+        for values, action, delta in zip(rows, actions, deltas):
+            values[action] += delta
+
+        buffer.update_priorities(indices, td_errors)
+        return td_errors
@@ -0,0 +1,105 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    Experience replay for tabular agents: the last `capacity` transitions in
+    preallocated arrays, overwritten oldest first.
+
+    States are stored as Q-table keys (QAgent.get_state_key), so replaying
+    a transition needs no rounding. Sampling is uniform, or with
+    `prioritized` proportional to |TD error| ** `alpha` through a sum tree,
+    which keeps adding, sampling and re-prioritising logarithmic in the
+    capacity. New transitions get the highest priority seen so far, so each
+    is replayed at least once with high probability.
+    """
+
+    def __init__(
+        self, capacity: int, state_size: int, prioritized: bool = False,
+        alpha: float = 0.6, beta: float = 0.4, seed: Optional[int] = None,
+    ):
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+        self.states = np.zeros((capacity, state_size))
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity)
+        self.next_states = np.zeros((capacity, state_size))
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self.position = 0
+        self.rng = np.random.default_rng(seed)
+        if prioritized:
+            # Node i has children 2i and 2i + 1; leaves start at `_leaves`
+            self._leaves = 1 << max(0, (capacity - 1).bit_length())
+            self._tree = np.zeros(2 * self._leaves)
+            self._max_priority = 1.0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.states, self.actions, self.rewards, self.next_states, self.dones]
+        if self.prioritized:
+            arrays.append(self._tree)
+        return sum(a.nbytes for a in arrays)
+
+    def add(self, state_key, action: int, reward: float, next_state_key, done: bool):
+        i = self.position
+        self.states[i] = state_key
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state_key
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        if self.prioritized:
+            # One leaf: walking up in Python beats the vectorised update
+            tree = self._tree
+            node = i + self._leaves
+            tree[node] = self._max_priority
+            node //= 2
+            while node:
+                tree[node] = tree[2 * node] + tree[2 * node + 1]
+                node //= 2
+
+    def sample(self, batch_size: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Indices of `batch_size` transitions, drawn with replacement, and
+        their importance-sampling weights (None when sampling uniformly).
+        """
+        if not self.prioritized:
+            return self.rng.integers(0, self.size, batch_size), None
+
+        tree = self._tree
+        total = tree[1]
+        target = self.rng.uniform(0.0, total, batch_size)
+        node = np.ones(batch_size, dtype=np.int64)
+        # All leaves are at the same depth: descend the whole batch level by level
+        while node[0] < self._leaves:
+            left = tree[2 * node]
+            right = target >= left
+            target -= left * right
+            node = 2 * node + right
+        # Rounding can land on an empty leaf past the end
+        node = np.minimum(node, self._leaves + self.size - 1)
+
+        weights = (self.size * tree[node] / total) ** -self.beta
+        return node - self._leaves, weights / weights.max()
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray):
+        if not self.prioritized:
+            return
+        priorities = (np.abs(td_errors) + 1e-6) ** self.alpha
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        tree = self._tree
+        node = indices + self._leaves
+        tree[node] = priorities
+        node = np.unique(node // 2)
+        while node[0]:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node = np.unique(node // 2)
@@ -0,0 +1,157 @@
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.agents.q_agent import QAgent
+
+EMPTY, READY = 0, 1
+
+
+class QTableFullError(RuntimeError):
+    """No free slot is left for a new state."""
+
+
+def _attach(name: str, state_size: int, action_size: int, capacity: int, locks: list, lock_updates: bool):
+    return SharedQTable(state_size, action_size, capacity, locks, lock_updates, name=name)
+
+
+class SharedQTable:
+    """
+    Q-table in `multiprocessing.shared_memory` that several processes read
+    and update at once.
+
+    It is an open-addressing hash table with linear probing over fixed-size
+    arrays: a slot flag, the state key and the action values. Only claiming
+    a slot for a new state takes a lock (one of `locks`, striped by slot).
+    Value updates are Hogwild: plain in-place writes, where an occasional
+    lost update between processes is accepted for speed. With
+    `lock_updates`, HogwildQAgent serialises updates per stripe instead.
+
+    It behaves like the dict QAgent expects: `table[key]` is a view into
+    shared memory, so `table[key][action] += delta` updates it for everyone.
+    Pickling it (e.g. as a Process argument) attaches the other process to
+    the same memory.
+    """
+
+    def __init__(
+        self, state_size: int, action_size: int, capacity: int, locks: list,
+        lock_updates: bool = False, name: Optional[str] = None,
+    ):
+        self.state_size = state_size
+        self.action_size = action_size
+        self.capacity = capacity
+        self.locks = locks
+        self.lock_updates = lock_updates
+        used_bytes = -(-capacity // 8) * 8
+        keys_bytes = capacity * state_size * 8
+        size = used_bytes + keys_bytes + capacity * action_size * 8
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        buf = self._shm.buf
+        self._used = np.ndarray((capacity,), dtype=np.uint8, buffer=buf)
+        self._keys = np.ndarray((capacity, state_size), dtype=np.float64, buffer=buf, offset=used_bytes)
+        self._values = np.ndarray((capacity, action_size), dtype=np.float64, buffer=buf, offset=used_bytes + keys_bytes)
+        if self._owner:
+            self._used[:] = EMPTY
+
+    @classmethod
+    def create(cls, ctx, state_size: int, action_size: int, capacity: int, stripes: int = 64, lock_updates: bool = False):
+        return cls(state_size, action_size, capacity, [ctx.RLock() for _ in range(stripes)], lock_updates)
+
+    def __reduce__(self):
+        return _attach, (self._shm.name, self.state_size, self.action_size, self.capacity, self.locks, self.lock_updates)
+
+    def lock(self, key):
+        return self.locks[hash(key) % len(self.locks)]
+
+    def _probe(self, key) -> Tuple[int, bool]:
+        """Slot holding `key`, or the first free slot on its probe path (-1 if full)."""
+        slot = hash(key) % self.capacity
+        for _ in range(self.capacity):
+            if self._used[slot] == EMPTY:
+                return slot, False
+            if tuple(self._keys[slot]) == key:
+                return slot, True
+            slot = slot + 1 if slot + 1 < self.capacity else 0
+        return -1, False
+
+    def _insert(self, key, values) -> Tuple[int, bool]:
+        """Slot of `key`, claimed with `values` if it was missing; and whether it was."""
+        while True:
+            slot, found = self._probe(key)
+            if found:
+                return slot, False
+            if slot < 0:
+                raise QTableFullError(f"Shared Q-table is full ({self.capacity} states).")
+            with self.locks[slot % len(self.locks)]:
+                if self._used[slot] == EMPTY:
+                    self._keys[slot] = key
+                    self._values[slot] = values
+                    # Published last: readers only compare keys of READY slots
+                    self._used[slot] = READY
+                    return slot, True
+            # Another process took the slot first; probe again
+
+    def __contains__(self, key) -> bool:
+        return self._probe(key)[1]
+
+    def __getitem__(self, key) -> np.ndarray:
+        slot, found = self._probe(key)
+        if not found:
+            raise KeyError(key)
+        return self._values[slot]
+
+    def __setitem__(self, key, values):
+        slot, inserted = self._insert(key, values)
+        if not inserted:
+            self._values[slot] = values
+
+    def setdefault(self, key, values) -> np.ndarray:
+        return self._values[self._insert(key, values)[0]]
+
+    def get(self, key, default=None):
+        slot, found = self._probe(key)
+        return self._values[slot] if found else default
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._used))
+
+    def items(self) -> Iterator[Tuple[tuple, np.ndarray]]:
+        for slot in np.flatnonzero(self._used):
+            yield tuple(self._keys[slot]), self._values[slot]
+
+    def update(self, q_table: dict):
+        for key, values in q_table.items():
+            self[key] = values
+
+    def to_dict(self) -> dict:
+        """Private copy, e.g. to pickle into a regular QAgent."""
+        return {key: values.copy() for key, values in self.items()}
+
+    def close(self):
+        # Views must go before the buffer can be released
+        self._used = self._keys = self._values = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class HogwildQAgent(QAgent):
+    """QAgent over a SharedQTable, optionally locking each update's stripe."""
+
+    def __init__(self, q_table: SharedQTable, **params):
+        super().__init__(state_size=q_table.state_size, action_size=q_table.action_size, **params)
+        self.q_table = q_table
+
+    def learn(self, state, action, reward, next_state, done):
+        if not self.q_table.lock_updates:
+            return super().learn(state, action, reward, next_state, done)
+        key = self.get_state_key(state)
+        # Claim both rows first: claiming takes the lock of a slot's stripe,
+        # which must not be acquired while holding the update's stripe
+        self._values(key)
+        self._values(self.get_state_key(next_state))
+        with self.q_table.lock(key):
+            return super().learn(state, action, reward, next_state, done)
+
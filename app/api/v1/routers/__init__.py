@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from .environments import env_router
 from .auth import auth_router
 from .training import training_router
+from .admin import admin_router
 
 
 router = APIRouter(prefix="/v1")
@@ -9,4 +10,5 @@ router = APIRouter(prefix="/v1")
 
 router.include_router(env_router)
 router.include_router(auth_router)
-router.include_router(training_router)
\ No newline at end of file
+router.include_router(training_router)
+router.include_router(admin_router)
\ No newline at end of file
@@ -0,0 +1,74 @@
+# app/api/v1/routers/admin.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.dependencies.permissions import require_admin
+from app.db.session import database
+from app.services.memory import memory_service
+from app.services.profiling import profiler_service
+from app.middleware.timing import TimedRoute
+
+admin_router = APIRouter(prefix="/admin", tags=["Admin"], route_class=TimedRoute)
+
+
+@admin_router.get("/db/pool", summary="Database connection pool metrics")
+async def db_pool_metrics(user=Depends(require_admin)):
+    """
+    Connection pool saturation data: checkouts in flight, wait and hold time
+    histograms, overflow usage and checkout timeouts.
+    Only admins can read pool metrics.
+    """
+    return database.pool_stats()
+
+
+@admin_router.get("/memory", summary="Memory usage by agents, environments and training buffers")
+async def memory_report(
+    tracemalloc: bool = False,
+    top: int = Query(20, ge=1, le=500),
+    user=Depends(require_admin)
+):
+    """
+    Estimated bytes per Q-table of active trainings, live environment
+    instances by env_id, and trajectory buffer sizes per active training.
+    With `tracemalloc=true` the `top` allocation sites grown since the
+    previous traced request are included; the first such request only
+    starts tracing, which stays on until DELETE /admin/memory/tracemalloc.
+    Only admins can read memory usage.
+    """
+    return memory_service.report(trace=tracemalloc, top=top)
+
+
+@admin_router.delete("/memory/tracemalloc", summary="Stop allocation tracing")
+async def stop_tracemalloc(user=Depends(require_admin)):
+    """Stop the tracemalloc tracing started by a memory report, and its overhead."""
+    if not memory_service.stop_tracing():
+        raise HTTPException(status_code=404, detail="Allocation tracing is not running")
+    return {"message": "Allocation tracing stopped"}
+
+
+@admin_router.post("/profile", response_class=PlainTextResponse, summary="Profile the server or a training job")
+async def capture_profile(
+    seconds: float = Query(10, gt=0, le=300),
+    mode: str = Query("cprofile", pattern="^(cprofile|sampling)$"),
+    env_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=1000),
+    user=Depends(require_admin)
+):
+    """
+    Capture a profile for `seconds` seconds, of the training job for
+    `env_name` when given, otherwise of the whole server.
+    `cprofile` returns a pstats report (top `limit` functions by cumulative
+    time); `sampling` returns collapsed stacks for flamegraph tools.
+    Only admins can capture profiles.
+    """
+    try:
+        return await profiler_service.profile(seconds, mode=mode, env_name=env_name, limit=limit)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
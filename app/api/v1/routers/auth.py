@@ -13,10 +13,11 @@ from app.utils.response import success_response
 from app.exceptions.custom_error import InvalidTokenError
 from app.core.logging import get_logger
 from app.schemas.response import APIResponse
+from app.middleware.timing import TimedRoute
 
 logger = get_logger(__name__)
 
-auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
+auth_router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedRoute)
 
 
 @auth_router.post("/register", status_code=status.HTTP_201_CREATED, response_model=APIResponse[UserResponse])
@@ -140,9 +141,7 @@ async def logout(
 ):
     refresh_token = request.cookies.get("refresh_token")
     if refresh_token:
-        security.redis_client.setex(
-            f"blacklisted_token:{refresh_token}", int(timedelta(days=30).total_seconds()), "blacklisted"
-        )
+        security.blacklist_token(Token(token=refresh_token), expires=timedelta(days=30))
         logger.info(f"Refresh token for user {current_user.id} blacklisted")
 
     response.delete_cookie(
@@ -1,16 +1,19 @@
 # app/api/v1/routers/environment.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession as Session
 
 from app.dependencies.permissions import require_admin, require_authenticated, require_superadmin
 from app.models.user import User
 from app.schemas.environment import EnvironmentCreate, EnvironmentStep, EnvironmentResponse
-from app.services.environment import EnvironmentService
-from app.db.session import get_db_session
+from app.services.environment import env_service
+from app.core.config import Config
+from app.db.session import get_db_session, get_read_db_session
+from app.middleware.timing import TimedRoute
 
-env_router = APIRouter(prefix="/environments", tags=["Environments"])
-env_service = EnvironmentService()
+env_router = APIRouter(prefix="/environments", tags=["Environments"], route_class=TimedRoute)
 
 
 @env_router.post("", response_model=EnvironmentResponse, summary="Create a new environment")
@@ -34,6 +37,7 @@ async def create_environment(
 async def step_environment(
     name: str,
     step: EnvironmentStep,
+    db: Session = Depends(get_read_db_session),
     user: User = Depends(require_authenticated)
 ):
     """
@@ -41,7 +45,7 @@ async def step_environment(
     Any authenticated user can perform steps.
     """
     try:
-        return await env_service.step_environment(name, step.action)
+        return await env_service.step_environment(name, step.action, db)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -49,7 +53,7 @@ async def step_environment(
 @env_router.post("/{name}/reset", summary="Reset an environment")
 async def reset_environment(
     name: str,
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
     user: User = Depends(require_admin)
 ):
     """
@@ -62,6 +66,91 @@ async def reset_environment(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@env_router.get("/{name}/snapshots", summary="List snapshots of an environment")
+async def list_snapshots(
+    name: str,
+    user: User = Depends(require_authenticated)
+):
+    """
+    List the saved snapshots of an environment.
+    Any authenticated user can list snapshots.
+    """
+    return env_service.list_snapshots(name)
+
+
+@env_router.post("/{name}/snapshots/{label}", summary="Snapshot an environment")
+async def save_snapshot(
+    name: str,
+    label: str,
+    db: Session = Depends(get_read_db_session),
+    user: User = Depends(require_admin)
+):
+    """
+    Save the exact internal state of the environment under `label`,
+    replacing an existing snapshot with the same label.
+    Only admins can save snapshots.
+    """
+    try:
+        return await env_service.save_snapshot(name, label, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@env_router.post("/{name}/snapshots/{label}/restore", summary="Restore an environment snapshot")
+async def restore_snapshot(
+    name: str,
+    label: str,
+    db: Session = Depends(get_read_db_session),
+    user: User = Depends(require_admin)
+):
+    """
+    Put the environment back to the state saved in snapshot `label`.
+    Only admins can restore snapshots.
+    """
+    try:
+        return await env_service.restore_snapshot(name, label, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@env_router.post("/{name}/snapshots/{label}/fork", summary="Fork environments from a snapshot")
+async def fork_snapshot(
+    name: str,
+    label: str,
+    count: int = Query(1, ge=1, le=Config.ENV_MAX_FORKS),
+    seed: Optional[int] = None,
+    db: Session = Depends(get_read_db_session),
+    user: User = Depends(require_admin)
+):
+    """
+    Create `count` in-memory environments starting from snapshot `label`.
+    Forks are named `<name>-<label>-<i>`, are not persisted, and disappear
+    when deleted or evicted. Pass `seed` to reseed each fork differently.
+    Only admins can fork environments.
+    """
+    try:
+        return {"forks": await env_service.fork_snapshot(name, label, count, db, seed=seed)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@env_router.delete("/{name}/snapshots/{label}", summary="Delete an environment snapshot")
+async def delete_snapshot(
+    name: str,
+    label: str,
+    user: User = Depends(require_admin)
+):
+    """
+    Delete snapshot `label` of the environment.
+    Only admins can delete snapshots.
+    """
+    try:
+        env_service.delete_snapshot(name, label)
+        return {"message": f"Snapshot '{label}' deleted successfully."}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @env_router.delete("/{name}", summary="Delete an environment")
 async def delete_environment(
     name: str,
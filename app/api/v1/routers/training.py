@@ -1,32 +1,53 @@
 # app/api/v1/routers/training.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.dependencies.permissions import require_admin, require_authenticated
-from app.db.session import get_db_session
-from app.services.training import TrainingManager
+from app.db.session import get_db_session, get_read_db_session, get_replica_db_session
+from app.services.training import training_manager
+from app.services.evaluation import evaluation_service
+from app.services.sweeps import sweep_service
+from app.services.parallel_training import parallel_trainer
+from app.schemas.evaluation import EvaluationResponse
+from app.schemas.sweep import SweepCreate, SweepResponse
+from app.core.config import Config
+from app.services.analytics import training_analytics
 from app.models.environment import Environment
 from app.models.training import TrainingSession
+from app.middleware.timing import TimedRoute
 
-training_router = APIRouter(prefix="/training", tags=["training"])
-
-training_manager = TrainingManager()
+training_router = APIRouter(prefix="/training", tags=["training"], route_class=TimedRoute)
 
 
 @training_router.post("/{env_name}/start")
 async def start_training(
     env_name: str,
     max_steps: int | None = None,
+    priority: int = Query(0, ge=0, le=9),
+    resume: bool = False,
     db: AsyncSession = Depends(get_db_session),
     user=Depends(require_admin)
 ):
+    """
+    Start training, or queue it when the concurrency limit is reached.
+    Higher `priority` jobs start first; users take turns within a priority.
+    Returns 429 when the backlog is full. `resume` continues the episode
+    from its latest checkpoint.
+    """
     try:
-        await training_manager.start_training(env_name, db, max_steps)
-        return {"message": f"Training started for '{env_name}'."}
+        state = await training_manager.start_training(
+            env_name, db, max_steps, user_id=user.id, priority=priority, resume=resume
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if state == "queued":
+        return {"message": f"Training queued for '{env_name}'.", **(await training_manager.status(env_name))}
+    return {"message": f"Training started for '{env_name}'."}
 
 
 @training_router.post("/{env_name}/stop")
@@ -43,13 +64,125 @@ async def stop_training(
 
 @training_router.get("/{env_name}/status")
 async def training_status(env_name: str, user=Depends(require_authenticated)):
-    return {"env_name": env_name, "is_training": training_manager.is_training(env_name)}
+    return await training_manager.status(env_name)
+
+
+@training_router.get("/{env_name}/stream")
+async def training_stream(env_name: str, user=Depends(require_authenticated)):
+    """
+    Server-Sent Events with the progress of a queued or running job: steps,
+    reward so far, steps/sec and epsilon, at most every
+    TRAINING_STREAM_INTERVAL_SECONDS. A client that falls behind misses
+    events (counted in "dropped"). The stream ends with an "end" event.
+    """
+    if (await training_manager.status(env_name))["state"] == "idle":
+        raise HTTPException(status_code=404, detail=f"No active training for '{env_name}'")
+
+    async def events():
+        async for event in training_manager.watch(env_name):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@training_router.post("/{env_name}/parallel")
+async def start_parallel_training(
+    env_name: str,
+    workers: int = Query(min(4, parallel_trainer.max_workers), ge=1, le=parallel_trainer.max_workers),
+    episodes: int = Query(1000, ge=1, le=Config.PARALLEL_MAX_EPISODES),
+    locked: bool = False,
+    db: AsyncSession = Depends(get_db_session),
+    user=Depends(require_admin)
+):
+    """
+    Train with `workers` processes running `episodes` episodes in total
+    against one shared Q-table, Hogwild-style (`locked` serialises updates
+    per lock stripe). The result is saved as the environment's agent.
+    `workers` is bounded by PARALLEL_MAX_WORKERS, or the CPU count if unset.
+    """
+    try:
+        return await parallel_trainer.start(env_name, db, workers, episodes, locked)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@training_router.post("/{env_name}/evaluate", response_model=EvaluationResponse)
+async def evaluate_agent(
+    env_name: str,
+    episodes: int = Query(10, ge=1, le=Config.EVAL_MAX_EPISODES),
+    seed: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db_session),
+    user=Depends(require_admin)
+):
+    """
+    Run `episodes` greedy episodes (no exploration, no learning) with seeds
+    `seed`, `seed + 1`, ... and record mean/std/percentile returns. Safe to
+    run while the environment is training.
+    """
+    try:
+        return await evaluation_service.evaluate(env_name, db, episodes, seed)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@training_router.post("/{env_name}/sweeps", response_model=SweepResponse)
+async def start_sweep(
+    env_name: str,
+    request: SweepCreate,
+    db: AsyncSession = Depends(get_db_session),
+    user=Depends(require_admin)
+):
+    """
+    Start a hyperparameter sweep (grid or random search, optional successive
+    halving) in the background. Poll it with GET .../sweeps/{sweep_id}.
+    """
+    try:
+        return await sweep_service.start(env_name, request, db, user_id=user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@training_router.get("/{env_name}/sweeps/{sweep_id}", response_model=SweepResponse)
+async def sweep_status(
+    env_name: str,
+    sweep_id: str,
+    # Polled right after the sweep is created and as it is updated: replica lag would 404 or go stale
+    db: AsyncSession = Depends(get_read_db_session),
+    user=Depends(require_authenticated)
+):
+    """Status, per-trial scores and the best configuration so far."""
+    try:
+        return await sweep_service.get(sweep_id, env_name, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@training_router.post("/{env_name}/sweeps/{sweep_id}/cancel")
+async def cancel_sweep(
+    env_name: str,
+    sweep_id: str,
+    db: AsyncSession = Depends(get_read_db_session),
+    user=Depends(require_admin)
+):
+    try:
+        await sweep_service.get(sweep_id, env_name, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not await sweep_service.cancel(sweep_id):
+        raise HTTPException(status_code=404, detail=f"No running sweep '{sweep_id}'")
+    return {"message": f"Sweep '{sweep_id}' cancelled"}
 
 
 @training_router.get("/{env_name}/history")
 async def training_history(
     env_name: str,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_replica_db_session),
     user=Depends(require_authenticated)
 ):
     # First, ensure the environment exists
@@ -59,7 +192,29 @@ async def training_history(
         raise HTTPException(status_code=404, detail=f"Environment '{env_name}' not found.")
 
     # Query training sessions for that environment
-    result = await db.execute(select(TrainingSession).filter_by(environment_id=env_obj.id))
+    result = await db.execute(
+        select(TrainingSession)
+        .filter_by(environment_id=env_obj.id)
+        .order_by(TrainingSession.started_at)
+    )
     sessions = result.scalars().all()
 
     return {"environment": env_name, "training_sessions": sessions}
+
+
+@training_router.get("/{env_name}/curves")
+async def training_curves(
+    env_name: str,
+    points: int = Query(200, ge=3, le=5000),
+    window: int = Query(20, ge=1, le=1000),
+    db: AsyncSession = Depends(get_replica_db_session),
+    user=Depends(require_authenticated)
+):
+    """
+    Learning curves aggregated on the server: per-session totals, rolling
+    mean and percentile bands, downsampled to at most `points` points.
+    """
+    try:
+        return await training_analytics.reward_curves(env_name, db, points=points, window=window)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
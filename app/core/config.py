@@ -1,3 +1,5 @@
+from typing import Any, Dict, Optional
+
 from pydantic_settings import BaseSettings
 from app.core.enums import EnvironmentEnum
 
@@ -21,6 +23,8 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
     DB_TYPE: str = "postgresql+asyncpg"
+    DB_READ_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_RETRY_SECONDS: int = 30
 
     # Security
     ALGORITHM: str = "HS256"
@@ -40,6 +44,85 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Training: "local" runs episodes in the API process, "celery" on workers
+    TRAINING_BACKEND: str = "local"
+    TRAINING_PROGRESS_INTERVAL_SECONDS: float = 1.0
+    # Local backend admission control
+    TRAINING_MAX_CONCURRENT: int = 4
+    TRAINING_MAX_BACKLOG: int = 100
+    # Registry of running jobs shared by all workers: "redis", or "memory" for a single process / tests
+    TRAINING_REGISTRY_BACKEND: str = "redis"
+    TRAINING_LEASE_SECONDS: float = 30
+    TRAINING_HEARTBEAT_SECONDS: float = 10
+    # Lease of a Celery job until a worker picks it up
+    TRAINING_QUEUED_LEASE_SECONDS: float = 3600
+    TRAINING_REAPER_INTERVAL_SECONDS: float = 60
+    # Live progress stream: at most one event per interval, per-client buffer size
+    TRAINING_STREAM_INTERVAL_SECONDS: float = 0.5
+    TRAINING_STREAM_QUEUE_SIZE: int = 32
+    # Mid-episode checkpoints, whichever comes first; 0 disables either trigger
+    TRAINING_CHECKPOINT_EVERY_STEPS: int = 1000
+    TRAINING_CHECKPOINT_EVERY_SECONDS: float = 60
+    # Experience replay: a minibatch of past transitions every N steps; capacity 0 disables it
+    TRAINING_REPLAY_CAPACITY: int = 0
+    TRAINING_REPLAY_BATCH_SIZE: int = 32
+    TRAINING_REPLAY_EVERY_STEPS: int = 1
+    # Prioritized replay samples by |TD error| ** alpha, corrected by importance weights ** beta
+    TRAINING_REPLAY_PRIORITIZED: bool = False
+    TRAINING_REPLAY_ALPHA: float = 0.6
+    TRAINING_REPLAY_BETA: float = 0.4
+
+    # Greedy evaluation rollouts, in a process pool
+    EVAL_MAX_WORKERS: int = 4
+    EVAL_MAX_EPISODES: int = 1000
+    EVAL_MAX_EPISODE_STEPS: int = 10000
+    # Hyperparameter sweeps; 0 workers means one per CPU
+    SWEEP_MAX_WORKERS: int = 0
+    SWEEP_MAX_TRIALS: int = 256
+    SWEEP_MAX_EPISODES: int = 10000
+    # Hogwild training: worker processes sharing one Q-table; 0 workers means one per CPU
+    PARALLEL_MAX_WORKERS: int = 0
+    PARALLEL_MAX_EPISODES: int = 100000
+    PARALLEL_Q_TABLE_CAPACITY: int = 1 << 20
+    # Default to REDIS_URL; use e.g. "memory://" or "filesystem://" for local tests
+    CELERY_BROKER_URL: Optional[str] = None
+    CELERY_RESULT_BACKEND: Optional[str] = None
+    CELERY_BROKER_TRANSPORT_OPTIONS: Dict[str, Any] = {}
+
+    # Monitoring
+    SLOW_REQUEST_THRESHOLD_MS: float = 500
+
+    # Live environments; 0 disables the TTL / cap
+    ENV_IDLE_TTL_SECONDS: int = 900
+    ENV_MAX_LIVE_INSTANCES: int = 100
+    ENV_SWEEP_INTERVAL_SECONDS: int = 60
+    ENV_ACTOR_MAX_BATCH: int = 64
+    ENV_MAX_SNAPSHOTS: int = 16
+    ENV_MAX_FORKS: int = 32
+    # How env.step() runs per env_id: "inline" on the event loop or "thread" in a pool.
+    # Use "thread" for envs whose step is heavy native code that releases the GIL.
+    ENV_EXECUTION_POLICY: Dict[str, str] = {
+        "LunarLander-v3": "thread",
+        "BipedalWalker-v3": "thread",
+        "CarRacing-v3": "thread",
+    }
+    ENV_DEFAULT_EXECUTION: str = "inline"
+    ENV_THREAD_POOL_SIZE: int = 4
+    # Write-behind of Environment.state
+    ENV_STATE_FLUSH_INTERVAL_SECONDS: float = 5
+    ENV_STATE_FLUSH_CHUNK_SIZE: int = 500
+
+    # Trajectory retention
+    TRAJECTORY_RETENTION_ENABLED: bool = True
+    TRAJECTORY_RETENTION_DAYS: int = 30
+    TRAJECTORY_RETENTION_MODE: str = "downsample"  # "downsample" or "summary"
+    TRAJECTORY_RETENTION_POINTS: int = 100
+    TRAJECTORY_RETENTION_BATCH_SIZE: int = 200
+    TRAJECTORY_RETENTION_INTERVAL_SECONDS: int = 3600
+    # Monthly training_sessions partitions, when the table is partitioned
+    TRAINING_PARTITIONS_MONTHS_AHEAD: int = 3
+    TRAINING_PARTITIONS_INTERVAL_SECONDS: int = 86400
+
     @property
     def database_url(self) -> str:
         return f"{self.DB_TYPE}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
@@ -9,6 +9,8 @@ from app.core.enums import TokenType
 from app.exceptions.custom_error import InvalidTokenError
 from app.schemas.token import Token, TokenCreate, TokenData, TokenDetails
 from app.utils.time import utcnow
+from app.core.metrics import registry
+from app.middleware.timing import timed_phase
 
 
 from .config import Config
@@ -20,6 +22,10 @@ from .config import Config
 # )
 oauth2_schema = HTTPBearer()
 
+REDIS_COMMAND_SECONDS = registry.histogram(
+    "rlforge_redis_command_duration_seconds", "Latency of Redis commands", ["command"]
+)
+
 
 class Security:
     """Security class for handling password hashing and JWT token creation."""
@@ -68,7 +74,8 @@ class Security:
         """Decodes a JWT token and validates it."""
         secret_key = self.access_secret_key if data.token_type == TokenType.ACCESS else self.refresh_secret_key
         try:
-            payload = jwt.decode(data.token, secret_key, algorithms=[Config.ALGORITHM])
+            with timed_phase("auth"):
+                payload = jwt.decode(data.token, secret_key, algorithms=[Config.ALGORITHM])
             return payload
         except ExpiredSignatureError:
             raise InvalidTokenError("Token has expired.")
@@ -86,8 +93,14 @@ class Security:
         Returns:
             bool: True if token is active
         """
-        blacklisted = self.redis_client.get(f"blacklisted_token:{token.token}")
+        with REDIS_COMMAND_SECONDS.labels("get").time():
+            blacklisted = self.redis_client.get(f"blacklisted_token:{token.token}")
         return blacklisted is None
+
+    def blacklist_token(self, token: Token, expires: timedelta):
+        """Blacklist a refresh token until it would have expired anyway."""
+        with REDIS_COMMAND_SECONDS.labels("setex").time():
+            self.redis_client.setex(f"blacklisted_token:{token.token}", int(expires.total_seconds()), "blacklisted")
     
     def refresh_access_token(self, current_refresh_token: Token)->tuple[str, str]:
         """Generate new access and refresh tokens.
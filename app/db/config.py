@@ -12,3 +12,5 @@ class DatabaseConfig:
         self.pool_timeout = 30
         self.pool_recycle = 3600
         self.pool_pre_ping = True
+        self.read_replica_url = Config.DB_READ_REPLICA_URL
+        self.replica_retry_after = Config.DB_REPLICA_RETRY_SECONDS
@@ -16,6 +16,6 @@ class DatabaseLifecycle:
 
     @staticmethod
     async def shutdown():
-        if database._engine:
-            await database._engine.dispose()
+        if database._engine or database._read_engine:
+            await database.dispose()
             logger.info("Database connections closed")
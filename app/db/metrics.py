@@ -0,0 +1,118 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram, render_histogram
+
+
+# Pool waits and holds are usually sub-millisecond, so start the buckets lower
+POOL_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class PoolMetrics:
+    """Connection pool instrumentation fed by pool events."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.wait_time = Histogram(POOL_BUCKETS)
+        self.hold_time = Histogram(POOL_BUCKETS)
+        # Overflow connections in use at each checkout
+        self.overflow = Histogram((0, 1, 2, 5, 10, 20, 30, 50, 100))
+
+    def on_connect(self):
+        self.connects += 1
+
+    def on_checkout(self, connection_record, overflow: int):
+        self.checkouts += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.overflow.observe(max(overflow, 0))
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def on_checkin(self, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.in_flight -= 1
+            self.hold_time.observe(time.perf_counter() - checked_out_at)
+
+    def snapshot(self, pool=None) -> dict:
+        data = {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "wait_time_seconds": self.wait_time.snapshot(),
+            "hold_time_seconds": self.hold_time.snapshot(),
+            "overflow": self.overflow.snapshot(),
+        }
+        if pool is not None and hasattr(pool, "size"):
+            data["pool"] = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        return data
+
+
+def render_pool_metrics(pools) -> list[str]:
+    """
+    Prometheus exposition lines for one or more pools.
+
+    `pools` is a sequence of (engine label, PoolMetrics, pool or None); series
+    of the same metric are grouped together as the text format requires.
+    """
+    lines = []
+    for name, kind, documentation, value in (
+        ("rlforge_db_pool_checkouts_in_flight", "gauge", "Connections currently checked out", lambda m, p: m.in_flight),
+        ("rlforge_db_pool_checkouts_total", "counter", "Connection checkouts", lambda m, p: m.checkouts),
+        ("rlforge_db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection", lambda m, p: m.timeouts),
+        ("rlforge_db_pool_connects_total", "counter", "New DBAPI connections opened", lambda m, p: m.connects),
+        ("rlforge_db_pool_overflow", "gauge", "Overflow connections currently open",
+         lambda m, p: max(p.overflow(), 0) if p is not None and hasattr(p, "overflow") else 0),
+    ):
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        for engine, metrics, pool in pools:
+            lines.append(f'{name}{{engine="{engine}"}} {value(metrics, pool)}')
+
+    for name, documentation, attr in (
+        ("rlforge_db_pool_wait_seconds", "Time spent waiting for a pooled connection", "wait_time"),
+        ("rlforge_db_pool_hold_seconds", "Time a connection stayed checked out", "hold_time"),
+    ):
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} histogram"]
+        for engine, metrics, _ in pools:
+            lines += render_histogram(name, {"engine": engine}, getattr(metrics, attr))
+    return lines
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times how long callers wait for a connection
+    and counts checkout timeouts. The pool has no "before checkout" event, so
+    this is the only place the wait can be measured.
+    """
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.wait_time.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
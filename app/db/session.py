@@ -1,6 +1,8 @@
-from typing import Optional, AsyncGenerator
+import functools
+import time
+from typing import Callable, Optional, AsyncGenerator
 from contextlib import asynccontextmanager
-from sqlalchemy import event
+from sqlalchemy import event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import (
     create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine
@@ -8,36 +10,136 @@ from sqlalchemy.ext.asyncio import (
 
 
 from app.db.config import DatabaseConfig
+from app.db.metrics import InstrumentedAsyncAdaptedQueuePool, PoolMetrics, render_pool_metrics
 from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.middleware.timing import record_phase
 
 
 logger = get_logger(__name__)
 
 Base = declarative_base()
 
+DB_QUERY_SECONDS = registry.histogram(
+    "rlforge_db_query_duration_seconds", "Time spent executing SQL statements", ["engine"]
+)
+
+
+class LazySession:
+    """
+    Drop-in stand-in for AsyncSession that defers creating the real session,
+    and therefore checking out a pooled connection, until it is first used.
+
+    In read-only mode the session is closed right after every read call
+    (execute/scalar/scalars/get), handing the connection straight back to the
+    pool. Loaded objects stay usable (expire_on_commit=False) but are detached:
+    attributes loaded by the query can be read, while lazy relationships and
+    deferred columns raise DetachedInstanceError. Eager-load what the caller
+    needs (selectinload/joinedload), or use a regular session.
+
+    A read-only session may be given a `fallback` factory: if a read fails
+    because the database cannot be reached, `on_fallback` is called and the
+    read is retried once against the fallback. Only connection failures
+    count: failing to connect, or the connection dropping mid-statement.
+    Errors of the statement itself are raised as usual.
+    """
+
+    _READ_METHODS = frozenset({"execute", "scalar", "scalars", "get", "get_one"})
+    _CONNECTION_ERRORS = (exc.OperationalError, exc.InterfaceError, exc.TimeoutError, OSError)
+
+    def __init__(
+        self,
+        factory: async_sessionmaker[AsyncSession],
+        read_only: bool = False,
+        fallback: Optional[async_sessionmaker[AsyncSession]] = None,
+        on_fallback: Optional[Callable[[Exception], None]] = None,
+    ):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+        self.read_only = read_only
+        self._fallback = fallback
+        self._on_fallback = on_fallback
+
+    @property
+    def materialized(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name):
+        attr = getattr(self.session, name)
+        if self.read_only and name in self._READ_METHODS:
+            return self._release_after(name, attr)
+        return attr
+
+    def _release_after(self, name, method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            try:
+                if self._fallback is None:
+                    return await method(*args, **kwargs)
+                connected = False
+                try:
+                    # Connecting first tells an unreachable database apart from a failing statement
+                    await self.session.connection()
+                    connected = True
+                    return await method(*args, **kwargs)
+                except self._CONNECTION_ERRORS as e:
+                    if connected and not self._is_disconnect(e):
+                        raise
+                    await self._switch_to_fallback(e)
+                return await getattr(self.session, name)(*args, **kwargs)
+            finally:
+                if self._session is not None:
+                    await self._session.close()
+        return wrapper
+
+    @staticmethod
+    def _is_disconnect(error: Exception) -> bool:
+        if isinstance(error, exc.DBAPIError):
+            return error.connection_invalidated
+        return isinstance(error, OSError)
+
+    async def _switch_to_fallback(self, error: Exception):
+        await self._session.close()
+        if self._on_fallback:
+            self._on_fallback(error)
+        self._factory, self._fallback = self._fallback, None
+        self._session = None
+
+
 class AsyncDatabase:
     """
     Async database utilities built on SQLAlchemy.
 
     - Centralizes engine and session configuration via app.db.config.DatabaseConfig.
     - Creates a cached AsyncEngine with pool tuning (size, overflow, timeouts, recycle, pre-ping) and echo support.
-    - Registers DBAPI connection event listeners (connect/checkout/checkin) that log via app.core.logging.get_logger.
+    - Registers DBAPI connection event listeners (connect/checkout/checkin) that feed PoolMetrics (in-flight checkouts, wait/hold time histograms, overflow, timeouts).
     - Provides an async session factory (expire_on_commit=False, autoflush=True).
-    - Exposes get_session(), an async context manager that yields an AsyncSession, auto-commits when there are changes, rolls back on error, and always closes.
-    - Includes a FastAPI dependency (get_db_session) that yields managed sessions.
+    - Exposes get_session(), an async context manager that yields a LazySession (an AsyncSession created on first use), auto-commits when there are changes, rolls back on error, and always closes.
+    - get_session(read_only=True) releases the connection after every statement and skips commit bookkeeping.
+    - Optionally manages a read-replica engine with its own pool; get_session(use_replica=True) routes reads
+      to it and falls back to the primary while the replica is unreachable.
+    - Includes FastAPI dependencies (get_db_session, get_read_db_session, get_replica_db_session) that yield managed sessions.
     - Exports Base for ORM models.
     """
     def __init__(self, config: DatabaseConfig):
         self.config = config
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._read_engine: Optional[AsyncEngine] = None
+        self._read_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._replica_down_until = 0.0
+        self.pool_metrics = PoolMetrics()
+        self.replica_pool_metrics = PoolMetrics()
 
-    def create_engine(self) -> AsyncEngine:
-        if self._engine is not None:
-            return self._engine
-
-        self._engine = create_async_engine(
-            url=self.config.database_url,
+    def _build_engine(self, url: str, metrics: PoolMetrics, name: str) -> AsyncEngine:
+        engine = create_async_engine(
+            url=url,
             echo=self.config.echo,
             future=True,
             pool_size=self.config.pool_size,
@@ -45,25 +147,94 @@ class AsyncDatabase:
             pool_timeout=self.config.pool_timeout,
             pool_recycle=self.config.pool_recycle,
             pool_pre_ping=self.config.pool_pre_ping,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
         )
-        self._setup_event_listeners()
+        engine.pool.metrics = metrics
+        self._setup_event_listeners(engine, metrics, name)
+        return engine
+
+    def create_engine(self) -> AsyncEngine:
+        if self._engine is not None:
+            return self._engine
+
+        self._engine = self._build_engine(self.config.database_url, self.pool_metrics, "primary")
         return self._engine
 
-    def _setup_event_listeners(self):
-        if not self._engine:
-            return
+    def create_read_engine(self) -> Optional[AsyncEngine]:
+        """Engine for the read replica, or None when no replica is configured."""
+        if self._read_engine is not None or not self.config.read_replica_url:
+            return self._read_engine
+
+        self._read_engine = self._build_engine(self.config.read_replica_url, self.replica_pool_metrics, "replica")
+        return self._read_engine
+
+    def _setup_event_listeners(self, async_engine: AsyncEngine, metrics: PoolMetrics, name: str):
+        engine = async_engine.sync_engine
+        query_seconds = DB_QUERY_SECONDS.labels(name)
 
-        @event.listens_for(self._engine.sync_engine, "connect")
+        # The start time lives on the statement's execution context, so a failed
+        # statement (no after_cursor_execute) leaves nothing behind on the connection
+        @event.listens_for(engine, "before_cursor_execute")
+        def receive_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context.query_started_at = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def receive_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "query_started_at", None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            query_seconds.observe(elapsed)
+            record_phase("db", elapsed)
+
+        @event.listens_for(engine, "connect")
         def receive_connect(dbapi_connection, connection_record):
-            logger.debug("New DBAPI connection established")
+            metrics.on_connect()
 
-        @event.listens_for(self._engine.sync_engine, "checkout")
+        @event.listens_for(engine, "checkout")
         def receive_checkout(dbapi_connection, connection_record, connection_proxy):
-            logger.debug("Connection checked out from pool")
+            metrics.on_checkout(connection_record, engine.pool.overflow())
 
-        @event.listens_for(self._engine.sync_engine, "checkin")
+        @event.listens_for(engine, "checkin")
         def receive_checkin(dbapi_connection, connection_record):
-            logger.debug("Connection returned to pool")
+            metrics.on_checkin(connection_record)
+
+    def pool_stats(self) -> dict:
+        """Pool instrumentation snapshot, used to size pool_size/max_overflow."""
+        stats = {
+            "config": {
+                "pool_size": self.config.pool_size,
+                "max_overflow": self.config.max_overflow,
+                "pool_timeout": self.config.pool_timeout,
+            },
+            **self.pool_metrics.snapshot(self._engine.pool if self._engine else None),
+        }
+        if self.config.read_replica_url:
+            stats["replica"] = {
+                "available": self.replica_available,
+                **self.replica_pool_metrics.snapshot(self._read_engine.pool if self._read_engine else None),
+            }
+        return stats
+
+    def render_pool_metrics(self) -> list[str]:
+        """Prometheus exposition lines for the connection pools."""
+        pools = [("primary", self.pool_metrics, self._engine.pool if self._engine else None)]
+        if self.config.read_replica_url:
+            pools.append(("replica", self.replica_pool_metrics, self._read_engine.pool if self._read_engine else None))
+        return render_pool_metrics(pools)
+
+    @property
+    def replica_available(self) -> bool:
+        return bool(self.config.read_replica_url) and time.monotonic() >= self._replica_down_until
+
+    def mark_replica_down(self, error: Exception):
+        """Route replica reads to the primary for the configured retry period."""
+        self._replica_down_until = time.monotonic() + self.config.replica_retry_after
+        logger.warning(
+            f"Read replica unavailable, falling back to primary for "
+            f"{self.config.replica_retry_after}s: {error}"
+        )
 
     def create_session_factory(self) -> async_sessionmaker[AsyncSession]:
         if self._session_factory is not None:
@@ -80,26 +251,78 @@ class AsyncDatabase:
         )
         return self._session_factory
 
+    def create_read_session_factory(self) -> Optional[async_sessionmaker[AsyncSession]]:
+        if self._read_session_factory is not None:
+            return self._read_session_factory
+
+        engine = self.create_read_engine()
+        if engine is None:
+            return None
+
+        self._read_session_factory = async_sessionmaker(
+            bind=engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        return self._read_session_factory
+
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def get_session(
+        self, read_only: bool = False, use_replica: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
         if self._session_factory is None:
             self.create_session_factory()
-            
-        session = self._session_factory()
+
+        if use_replica and self.replica_available and self.create_read_session_factory():
+            session = LazySession(
+                self._read_session_factory,
+                read_only=True,
+                fallback=self._session_factory,
+                on_fallback=self.mark_replica_down,
+            )
+        else:
+            session = LazySession(self._session_factory, read_only=read_only or use_replica)
         try:
             yield session
-            if session.dirty or session.new or session.deleted:
+            if not session.read_only and session.materialized and (session.dirty or session.new or session.deleted):
                 await session.commit()
         except Exception:
-            await session.rollback()
+            if session.materialized:
+                await session.rollback()
             raise
         finally:
-            await session.close()
+            if session.materialized:
+                await session.close()
+
+    async def dispose(self):
+        """
+        Close both pools and forget the engines, so the next session builds
+        fresh ones. Worker tasks rely on this to get a pool bound to their own
+        event loop on every asyncio.run().
+        """
+        for engine in (self._engine, self._read_engine):
+            if engine is not None:
+                await engine.dispose()
+        self._engine = self._read_engine = None
+        self._session_factory = self._read_session_factory = None
 
 
 database = AsyncDatabase(DatabaseConfig())
+registry.register_collector(database.render_pool_metrics)
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with database.get_session() as session:
         yield session
+
+
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with database.get_session(read_only=True) as session:
+        yield session
+
+
+async def get_replica_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session on the read replica (primary when none is configured or it is down)."""
+    async with database.get_session(use_replica=True) as session:
+        yield session
@@ -28,3 +28,9 @@ class ServerError(BaseAppException):
     """Exception raised for server failure."""
     def __init__(self, message: str = "Server Error", errors: Optional[Dict[str, Any]] = None):
         super().__init__(message, errors)
+
+
+class TrainingBacklogFullError(BaseAppException):
+    """Exception raised when the training queue cannot take more jobs."""
+    def __init__(self, message: str = "Training backlog is full", errors: Optional[Dict[str, Any]] = None):
+        super().__init__(message, errors)
@@ -1,4 +1,6 @@
-from fastapi import FastAPI, status
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
@@ -6,10 +8,82 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from app.core.config import Config
 from app.api.v1.routers import router
-from app.exceptions.custom_error import InvalidCredentialsError, InvalidTokenError, UserAlreadyExistsError, ServerError
+from app.exceptions.custom_error import (
+    InvalidCredentialsError, InvalidTokenError, UserAlreadyExistsError, ServerError, TrainingBacklogFullError
+)
 from app.exceptions.exception_handler import create_exception_handler
+from app.db.lifecycle import DatabaseLifecycle
+from app.tasks.periodic import PeriodicTask
+from app.tasks.partitions import training_session_partitions
+from app.tasks.retention import trajectory_retention
+from app.services.environment import env_service
+from app.services.evaluation import evaluation_service
+from app.services.execution import execution_policy
+from app.services.parallel_training import parallel_trainer
+from app.services.state_persister import state_persister
+from app.services.sweeps import sweep_service
+from app.services.job_registry import job_registry
+from app.services.training import training_manager
+from app.core.metrics import registry
+from app.middleware.metrics import PrometheusMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+
+
+background_tasks: list[PeriodicTask] = []
+
+if Config.TRAJECTORY_RETENTION_ENABLED:
+    background_tasks.append(PeriodicTask(
+        "trajectory-retention",
+        Config.TRAJECTORY_RETENTION_INTERVAL_SECONDS,
+        trajectory_retention.run_once,
+    ))
+
+background_tasks.append(PeriodicTask(
+    "training-session-partitions",
+    Config.TRAINING_PARTITIONS_INTERVAL_SECONDS,
+    training_session_partitions.run_once,
+    run_on_start=True,
+))
+
+if Config.ENV_IDLE_TTL_SECONDS:
+    background_tasks.append(PeriodicTask(
+        "env-eviction",
+        Config.ENV_SWEEP_INTERVAL_SECONDS,
+        env_service.evict_idle,
+    ))
+
+background_tasks.append(PeriodicTask(
+    "env-state-flush",
+    Config.ENV_STATE_FLUSH_INTERVAL_SECONDS,
+    state_persister.flush,
+))
+
+background_tasks.append(PeriodicTask(
+    "training-reaper",
+    Config.TRAINING_REAPER_INTERVAL_SECONDS,
+    training_manager.reap_stale,
+))
+
 
-app = FastAPI(title=Config.APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for task in background_tasks:
+        task.start()
+    yield
+    for task in background_tasks:
+        await task.stop()
+    await sweep_service.shutdown()
+    await parallel_trainer.shutdown()
+    await training_manager.shutdown()
+    await env_service.close_all()
+    execution_policy.shutdown()
+    evaluation_service.shutdown()
+    await state_persister.flush()
+    await job_registry.close()
+    await DatabaseLifecycle.shutdown()
+
+
+app = FastAPI(title=Config.APP_NAME, lifespan=lifespan)
 
 @app.get("/config")
 def read_config():
@@ -20,8 +94,15 @@ def read_config():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=registry.render(), media_type=registry.CONTENT_TYPE)
+
+
 app.include_router(router, prefix="/api")
 app.add_middleware(SessionMiddleware, secret_key=Config.SECRET_KEY)
+app.add_middleware(PrometheusMiddleware)
+app.add_middleware(ServerTimingMiddleware)
 
 app.add_exception_handler(
     exc_class_or_status_code=InvalidCredentialsError,
@@ -55,6 +136,14 @@ app.add_exception_handler(
     ),
 )
 
+app.add_exception_handler(
+    exc_class_or_status_code=TrainingBacklogFullError,
+    handler=create_exception_handler(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        default_message="Training backlog is full."
+    ),
+)
+
 origins = []
 
 app.add_middleware(
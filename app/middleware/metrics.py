@@ -0,0 +1,40 @@
+import time
+
+from app.core.metrics import registry
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "rlforge_http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware recording request latency per route template
+    (e.g. /api/v1/environments/{name}/step), so path parameters do not
+    explode label cardinality.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            ).observe(time.perf_counter() - started)
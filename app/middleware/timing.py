@@ -0,0 +1,165 @@
+import asyncio
+import functools
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+
+from app.core.config import Config
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestTimings:
+    """Time spent per phase (auth, user, db, env, handler, serialize) within one request."""
+
+    __slots__ = ("phases", "endpoint_ended")
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.endpoint_ended: Optional[float] = None
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_phase(name: str, seconds: float):
+    """Add time to a phase of the current request; a no-op outside requests."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def timed_phase(name: str):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that splits route time into the endpoint body ("handler") and
+    what FastAPI does after it returns, validating and encoding the
+    response ("serialize").
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, self._timed_endpoint(endpoint), **kwargs)
+
+    @staticmethod
+    def _timed_endpoint(endpoint):
+        # include_router() rebuilds routes from route.endpoint, so only wrap once
+        if getattr(endpoint, "_timed", False):
+            return endpoint
+
+        def finish(started: float):
+            timings = _current.get()
+            if timings is not None:
+                timings.endpoint_ended = time.perf_counter()
+                timings.add("handler", timings.endpoint_ended - started)
+
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    finish(started)
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return endpoint(*args, **kwargs)
+                finally:
+                    finish(started)
+        wrapper._timed = True
+        return wrapper
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timings = _current.get()
+            if timings is not None and timings.endpoint_ended is not None:
+                timings.add("serialize", time.perf_counter() - timings.endpoint_ended)
+            return response
+
+        return timed_handler
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects per-phase timings for each request and
+    returns them in a Server-Timing header. Requests slower than
+    SLOW_REQUEST_THRESHOLD_MS are also logged as a single JSON line, except
+    event streams, which stay open for as long as the client listens.
+    """
+
+    def __init__(self, app, slow_threshold_ms: float = Config.SLOW_REQUEST_THRESHOLD_MS):
+        self.app = app
+        self.slow_threshold = slow_threshold_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                streaming = any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in headers
+                )
+                headers.append(
+                    (b"server-timing", timings.server_timing(time.perf_counter() - started).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            total = time.perf_counter() - started
+            if total >= self.slow_threshold and not streaming:
+                route = scope.get("route")
+                logger.warning(json.dumps({
+                    "event": "slow_request",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "status": status_code,
+                    "total_ms": round(total * 1000, 2),
+                    "phases_ms": {name: round(s * 1000, 2) for name, s in timings.phases.items()},
+                }))
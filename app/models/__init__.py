@@ -1,3 +1,5 @@
 from .environment import Environment
 from .user import User
 from .training import TrainingSession
+from .evaluation import EvaluationRecord
+from .sweep import SweepRecord
@@ -16,6 +16,8 @@ class Environment(BaseModel):
     owner = relationship("User", back_populates="environments")
 
     training_sessions = relationship("TrainingSession", back_populates="environment", cascade="all, delete-orphan")
+    evaluations = relationship("EvaluationRecord", back_populates="environment", cascade="all, delete-orphan")
+    sweeps = relationship("SweepRecord", back_populates="environment", cascade="all, delete-orphan")
     
     def __repr__(self):
         return (
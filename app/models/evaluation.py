@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, JSON, ForeignKey, Integer, Float, Index
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+
+
+class EvaluationRecord(BaseModel):
+    """Returns of greedy rollouts of an agent, run with fixed seeds."""
+    __tablename__ = "evaluation_records"
+    __table_args__ = (
+        Index("ix_evaluation_records_environment_id_created_at", "environment_id", "created_at"),
+    )
+
+    environment_id = Column(String, ForeignKey("environments.id"), nullable=False)
+    episodes = Column(Integer, nullable=False)
+    seed = Column(Integer, nullable=False)
+
+    mean_return = Column(Float, nullable=False)
+    std_return = Column(Float, nullable=False)
+    min_return = Column(Float, nullable=False)
+    max_return = Column(Float, nullable=False)
+    # {"p5": ..., "p25": ..., "p50": ..., "p75": ..., "p95": ...}
+    percentiles = Column(JSON, nullable=False)
+    mean_length = Column(Float, nullable=False)
+    returns = Column(JSON, nullable=True)
+
+    # Agent that was evaluated
+    q_table_states = Column(Integer, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+
+    environment = relationship("Environment", back_populates="evaluations")
+
+    def __repr__(self):
+        return f"<EvaluationRecord(id={self.id}, env_id={self.environment_id}, mean_return={self.mean_return})>"
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Float, Index
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+
+
+class SweepRecord(BaseModel):
+    """A hyperparameter sweep: its search spec, every trial's score and the best configuration."""
+    __tablename__ = "sweeps"
+    __table_args__ = (
+        Index("ix_sweeps_environment_id_created_at", "environment_id", "created_at"),
+    )
+
+    environment_id = Column(String, ForeignKey("environments.id"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), nullable=True)
+    # running, finished, cancelled or failed
+    status = Column(String, nullable=False, default="running")
+    spec = Column(JSON, nullable=False)
+    trials = Column(JSON, nullable=True)
+
+    best_params = Column(JSON, nullable=True)
+    best_score = Column(Float, nullable=True)
+    error = Column(String, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    environment = relationship("Environment", back_populates="sweeps")
+
+    def __repr__(self):
+        return f"<SweepRecord(id={self.id}, env_id={self.environment_id}, status={self.status})>"
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Float, func
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Float, Index, func
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
 
 class TrainingSession(BaseModel):
     __tablename__ = "training_sessions"
+    __table_args__ = (
+        Index("ix_training_sessions_environment_id_started_at", "environment_id", "started_at"),
+    )
 
     environment_id = Column(String, ForeignKey("environments.id"), nullable=False)
     started_at = Column(DateTime(timezone=True), nullable=False)
@@ -16,6 +19,18 @@ class TrainingSession(BaseModel):
 
     total_reward = Column(Float, nullable=True)
 
+    # Per-episode summary statistics, accumulated while training
+    reward_mean = Column(Float, nullable=True)
+    reward_std = Column(Float, nullable=True)
+    reward_min = Column(Float, nullable=True)
+    reward_max = Column(Float, nullable=True)
+    td_error_mean = Column(Float, nullable=True)
+    td_error_max = Column(Float, nullable=True)
+    epsilon = Column(Float, nullable=True)
+
+    # Set once old trajectories have been downsampled or dropped by retention
+    compacted_at = Column(DateTime(timezone=True), nullable=True)
+
     environment = relationship("Environment", back_populates="training_sessions")
 
     def __repr__(self):
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class EvaluationResponse(BaseModel):
+    """Greedy evaluation of an agent, as recorded in EvaluationRecord."""
+    id: str
+    environment_id: str
+    episodes: int
+    seed: int
+    mean_return: float
+    std_return: float
+    min_return: float
+    max_return: float
+    percentiles: Dict[str, float]
+    mean_length: float
+    returns: Optional[List[float]] = None
+    q_table_states: Optional[int] = None
+    duration_seconds: Optional[float] = None
+    created_at: Optional[datetime] = None
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+# QAgent constructor arguments a sweep can search over
+HYPERPARAMETERS = ("learning_rate", "discount_factor", "epsilon", "epsilon_decay", "epsilon_min")
+
+
+class ParamRange(BaseModel):
+    """Continuous range for random search; `log` samples log-uniformly."""
+    low: float
+    high: float
+    log: bool = False
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        if self.low > self.high or (self.log and self.low <= 0):
+            raise ValueError("Range needs low <= high, and low > 0 when log is set.")
+        return self
+
+
+class SweepCreate(BaseModel):
+    """
+    Hyperparameter sweep over QAgent settings.
+
+    Grid search tries every combination of the listed values; random search
+    draws `trials` configurations, where ranges are sampled and lists are
+    picked from. Every configuration is trained once per seed and scored by
+    the mean greedy return over `eval_episodes` episodes.
+
+    With `min_episodes` set, successive halving runs all configurations for
+    `min_episodes` episodes, keeps the best 1/`eta`, multiplies the budget by
+    `eta`, and repeats until `episodes` is reached.
+    """
+    strategy: Literal["grid", "random"] = "grid"
+    space: Dict[str, Union[List[float], ParamRange]]
+    trials: int = Field(16, ge=1)
+    seeds: List[int] = Field(default_factory=lambda: [0], min_length=1, max_length=16)
+    episodes: int = Field(50, ge=1)
+    min_episodes: Optional[int] = Field(None, ge=1)
+    eta: int = Field(3, ge=2)
+    eval_episodes: int = Field(5, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def check_space(self):
+        unknown = set(self.space) - set(HYPERPARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown hyperparameters {sorted(unknown)}; expected some of {HYPERPARAMETERS}.")
+        for name, values in self.space.items():
+            if isinstance(values, list) and not values:
+                raise ValueError(f"No values given for '{name}'.")
+            if self.strategy == "grid" and not isinstance(values, list):
+                raise ValueError(f"Grid search needs a list of values for '{name}'.")
+        if self.min_episodes is not None and self.min_episodes > self.episodes:
+            raise ValueError("min_episodes cannot exceed episodes.")
+        return self
+
+
+class SweepResponse(BaseModel):
+    """A sweep's status, per-trial scores and best configuration so far."""
+    id: str
+    environment_id: str
+    user_id: Optional[str] = None
+    status: str
+    spec: Dict[str, Any]
+    trials: Optional[List[Dict[str, Any]]] = None
+    best_params: Optional[Dict[str, float]] = None
+    best_score: Optional[float] = None
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
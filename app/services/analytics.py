@@ -0,0 +1,94 @@
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.environment import Environment
+from app.models.training import TrainingSession
+from app.utils.downsample import lttb_indices
+
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class TrainingAnalytics:
+    """Server-side aggregation of training history for dashboards."""
+
+    async def reward_curves(
+        self, env_name: str, db: AsyncSession, points: int = 200, window: int = 20
+    ) -> dict:
+        """
+        Build downsampled learning curves for an environment.
+
+        Only the scalar `started_at`, `total_reward` and `steps` columns are read,
+        so the size of stored trajectories never affects this query.
+        """
+        result = await db.execute(select(Environment.id).filter_by(name=env_name))
+        env_id = result.scalar_one_or_none()
+        if env_id is None:
+            raise ValueError(f"Environment '{env_name}' not found.")
+
+        result = await db.execute(
+            select(TrainingSession.started_at, TrainingSession.total_reward, TrainingSession.steps)
+            .filter_by(environment_id=env_id)
+            .order_by(TrainingSession.started_at)
+        )
+        rows = result.all()
+
+        if not rows:
+            return {"environment": env_name, "sessions": 0, "window": window, "percentiles": {}, "points": []}
+
+        rewards = np.array([r.total_reward or 0.0 for r in rows], dtype=float)
+        steps = np.array([r.steps or 0 for r in rows], dtype=float)
+        episodes = np.arange(len(rows))
+
+        rolling_mean = self._rolling_mean(rewards, window)
+        rolling_low, rolling_high = self._rolling_band(rewards, window)
+
+        keep = lttb_indices(episodes, rewards, points)
+
+        return {
+            "environment": env_name,
+            "sessions": len(rows),
+            "window": window,
+            "percentiles": {
+                f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(rewards, PERCENTILES))
+            },
+            "points": [
+                {
+                    "episode": int(i),
+                    "started_at": rows[i].started_at,
+                    "total_reward": float(rewards[i]),
+                    "steps": int(steps[i]),
+                    "rolling_mean": float(rolling_mean[i]),
+                    "rolling_p5": float(rolling_low[i]),
+                    "rolling_p95": float(rolling_high[i]),
+                }
+                for i in keep
+            ],
+        }
+
+    @staticmethod
+    def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """Trailing mean over up to `window` previous episodes."""
+        cumsum = np.cumsum(np.insert(values, 0, 0.0))
+        idx = np.arange(1, len(values) + 1)
+        start = np.maximum(idx - window, 0)
+        return (cumsum[idx] - cumsum[start]) / (idx - start)
+
+    @staticmethod
+    def _rolling_band(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+        """Trailing 5th/95th percentile over up to `window` previous episodes."""
+        if len(values) >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(values, window)
+            low, high = np.percentile(windows, [5, 95], axis=1)
+        else:
+            low, high = np.empty(0), np.empty(0)
+
+        # The first window-1 episodes only have a partial history
+        head = min(window - 1, len(values))
+        head_low = [np.percentile(values[: i + 1], 5) for i in range(head)]
+        head_high = [np.percentile(values[: i + 1], 95) for i in range(head)]
+        return np.concatenate([head_low, low]), np.concatenate([head_high, high])
+
+
+training_analytics = TrainingAnalytics()
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.agents.q_agent import QAgent
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.services.snapshots import EnvSnapshot
+from app.utils.stats import EpisodeStats
+from app.utils.time import utcnow
+
+logger = get_logger(__name__)
+
+# Shared with Celery workers, like the saved agents: either side may resume
+CHECKPOINT_DIR = "agents/checkpoints"
+
+CHECKPOINT_WRITE_SECONDS = registry.histogram(
+    "rlforge_training_checkpoint_write_seconds", "Time taken to write a training checkpoint to disk"
+)
+CHECKPOINTS_SKIPPED = registry.counter(
+    "rlforge_training_checkpoints_skipped_total", "Checkpoints skipped because the previous write was still running"
+)
+
+
+@dataclass
+class Checkpoint:
+    """
+    An episode in progress: the agent, the trajectory and counters so far,
+    and the exact env state to continue from. `snapshot` is None for envs
+    that can't be snapshotted; resuming those keeps what the agent learned
+    but starts a new episode.
+    """
+    env_name: str
+    agent: QAgent
+    observation: Any
+    states: list
+    rewards: list
+    stats: EpisodeStats
+    snapshot: Optional[EnvSnapshot]
+    started_at: datetime
+    # TrainingSession row written when the episode was interrupted
+    session_id: Optional[str] = None
+    created_at: datetime = field(default_factory=utcnow)
+
+    @property
+    def steps(self) -> int:
+        return len(self.rewards)
+
+
+class CheckpointStore:
+    """
+    One checkpoint file per environment, replaced atomically.
+
+    `save()` pickles in the caller, so the checkpoint is a consistent copy of
+    the episode at that step, and writes the file in a thread. The episode
+    loop never waits on disk: if the previous write for the env is still
+    running, the new checkpoint is skipped.
+    """
+
+    def __init__(self, directory: str = CHECKPOINT_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._writes: Dict[str, asyncio.Future] = {}
+
+    def path(self, env_name: str) -> str:
+        return os.path.join(self.directory, f"{env_name}.ckpt")
+
+    def exists(self, env_name: str) -> bool:
+        return os.path.exists(self.path(env_name))
+
+    def load(self, env_name: str) -> Optional[Checkpoint]:
+        try:
+            with open(self.path(env_name), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, checkpoint: Checkpoint) -> Optional[asyncio.Future]:
+        env_name = checkpoint.env_name
+        pending = self._writes.get(env_name)
+        if pending is not None and not pending.done():
+            CHECKPOINTS_SKIPPED.inc()
+            return None
+        payload = pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+        write = asyncio.get_running_loop().run_in_executor(None, self._write, self.path(env_name), payload)
+        write.add_done_callback(lambda f: self._written(env_name, f))
+        self._writes[env_name] = write
+        return write
+
+    def _written(self, env_name: str, write: asyncio.Future):
+        if self._writes.get(env_name) is write:
+            del self._writes[env_name]
+        if not write.cancelled() and write.exception() is not None:
+            logger.error(f"Writing the checkpoint of '{env_name}' failed: {write.exception()}")
+
+    @staticmethod
+    def _write(path: str, payload: bytes):
+        started = time.perf_counter()
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers see the old checkpoint or the new one, never a partial file
+        os.replace(tmp, path)
+        CHECKPOINT_WRITE_SECONDS.observe(time.perf_counter() - started)
+
+    async def flush(self, env_name: str):
+        """Wait for the in-flight write of `env_name`, if any."""
+        pending = self._writes.get(env_name)
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+
+    async def delete(self, env_name: str):
+        await self.flush(env_name)
+        try:
+            os.remove(self.path(env_name))
+        except FileNotFoundError:
+            pass
+
+
+checkpoint_store = CheckpointStore()
+
+
+def checkpoint_due(steps_since: int, seconds_since: float) -> bool:
+    every_steps = Config.TRAINING_CHECKPOINT_EVERY_STEPS
+    every_seconds = Config.TRAINING_CHECKPOINT_EVERY_SECONDS
+    return bool(every_steps and steps_since >= every_steps) or bool(every_seconds and seconds_since >= every_seconds)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+import gymnasium as gym
+
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.services.execution import execution_policy
+
+logger = get_logger(__name__)
+
+ENV_QUEUE_WAIT_SECONDS = registry.histogram(
+    "rlforge_env_queue_wait_seconds", "Time a command waited in an environment's queue before running", ["env_id"],
+    buckets=(0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+ENV_BATCH_SIZE = registry.histogram(
+    "rlforge_env_batch_size", "Commands drained from an environment's queue per wakeup",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+ENV_QUEUE_DEPTH = registry.gauge(
+    "rlforge_env_queue_depth", "Commands waiting in an environment's queue", ["env_name"]
+)
+
+_STOP = object()
+
+
+class EnvActor:
+    """
+    Owns one live gym.Env. Commands are callables taking the env; a single
+    consumer task runs them in submission order, so concurrent requests never
+    interleave on the same env. Each wakeup drains up to `max_batch` pending
+    commands and runs them back to back, inline on the event loop or in the
+    thread pool chosen by the execution policy for the env_id. If the
+    consumer dies, e.g. because the pool was shut down, the actor closes and
+    fails every pending command instead of leaving it waiting.
+    """
+
+    def __init__(
+        self, name: str, env: gym.Env, max_batch: int = Config.ENV_ACTOR_MAX_BATCH,
+        executor: Optional[Executor] = None
+    ):
+        self.name = name
+        self.env = env
+        self.env_id = env.spec.id if env.spec else name
+        self.max_batch = max_batch
+        self.executor = executor if executor is not None else execution_policy.executor_for(self.env_id)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+        self._on_close: Optional[Callable[[gym.Env], Any]] = None
+        self._wait_time = ENV_QUEUE_WAIT_SECONDS.labels(self.env_id)
+        self._task = asyncio.create_task(self._run(), name=f"env-actor:{name}")
+        # However the task ends, even cancelled before it started, nothing will run what is queued
+        self._task.add_done_callback(self._ended)
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def submit(self, command: Callable[[gym.Env], Any]) -> asyncio.Future:
+        """Queue `command(env)`; the returned future resolves to its result."""
+        if self.closed:
+            raise RuntimeError(f"Environment '{self.name}' is closing.")
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((command, future, time.perf_counter()))
+        return future
+
+    def stop(self, on_close: Optional[Callable[[gym.Env], Any]] = None):
+        """
+        Stop accepting commands. Already queued ones still run, then
+        `on_close(env)` is called and the env is closed.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._on_close = on_close
+        self.queue.put_nowait(_STOP)
+
+    async def wait_closed(self):
+        await asyncio.shield(self._task)
+
+    def _run_commands(self, commands) -> list:
+        """Run commands against the env, returning (future, result, error) for each."""
+        outcomes = []
+        for command, future, enqueued in commands:
+            self._wait_time.observe(time.perf_counter() - enqueued)
+            if future.cancelled():
+                continue
+            try:
+                outcomes.append((future, command(self.env), None))
+            except Exception as e:
+                outcomes.append((future, None, e))
+        return outcomes
+
+    def _shutdown(self):
+        try:
+            if self._on_close is not None:
+                self._on_close(self.env)
+            self.env.close()
+        except Exception as e:
+            logger.warning(f"Error closing environment '{self.name}': {e}")
+
+    def _fail_pending(self, commands, error: BaseException):
+        for item in commands:
+            if item is _STOP:
+                continue
+            future = item[1]
+            if not future.done():
+                future.set_exception(error)
+
+    def _ended(self, task: asyncio.Task):
+        self.closed = True
+        queued = []
+        while not self.queue.empty():
+            queued.append(self.queue.get_nowait())
+        self._fail_pending(queued, RuntimeError(f"Environment '{self.name}' is closed."))
+
+    async def _run(self):
+        try:
+            await self._consume()
+        except Exception as e:
+            logger.error(f"Environment actor '{self.name}' failed: {e}")
+            self._shutdown()
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            ENV_BATCH_SIZE.observe(len(batch))
+
+            # Nothing can be queued after the stop marker
+            stopping = batch[-1] is _STOP
+            commands = batch[:-1] if stopping else batch
+
+            if commands:
+                if self.executor is None:
+                    outcomes = self._run_commands(commands)
+                else:
+                    try:
+                        # One hop to the pool per batch, not per command
+                        outcomes = await loop.run_in_executor(self.executor, self._run_commands, commands)
+                    except BaseException as e:
+                        # Cancelled, or the pool is gone: this batch won't run either
+                        self._fail_pending(commands, e if isinstance(e, Exception) else RuntimeError(
+                            f"Environment '{self.name}' is closed."
+                        ))
+                        raise
+                # Futures belong to the loop, so they are only resolved here
+                for future, result, error in outcomes:
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+
+            if stopping:
+                self._shutdown()
+                return
@@ -1,24 +1,214 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
 import gymnasium as gym
-from typing import Dict
+import numpy as np
 from app.models.environment import Environment
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.models.user import User
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.middleware.timing import timed_phase
+from app.services.env_actor import ENV_QUEUE_DEPTH, EnvActor
+from app.services.state_persister import StatePersister, state_persister
+from app.services.snapshots import EnvSnapshot, restore_snapshot, take_snapshot
+
+logger = get_logger(__name__)
+
+STEP_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+ENV_STEP_SECONDS = registry.histogram(
+    "rlforge_env_step_duration_seconds", "Time spent in env.step()", ["env_id"], buckets=STEP_BUCKETS
+)
+ENV_STEPS = registry.counter(
+    "rlforge_env_steps_total", "Environment steps executed", ["env_id", "source"]
+)
+LIVE_ENVIRONMENTS = registry.gauge(
+    "rlforge_live_environments", "Environment instances held in memory by the API"
+)
+ENV_EVICTIONS = registry.counter(
+    "rlforge_env_evictions_total", "Live environment instances closed and evicted from memory", ["reason"]
+)
+ENV_RESTORES = registry.counter(
+    "rlforge_env_restores_total", "Evicted environments recreated on demand"
+)
+
+
+def _has_reset(env: gym.Env) -> bool:
+    # The flag lives on the OrderEnforcing wrapper; outer wrappers don't forward private attributes
+    try:
+        return bool(env.get_wrapper_attr("_has_reset"))
+    except AttributeError:
+        return False
+
+
+def _capture_state(env: gym.Env) -> Optional[list]:
+    state = getattr(env.unwrapped, "state", None)
+    if state is None:
+        return None
+    return state.tolist() if hasattr(state, "tolist") else state
+
+
+def _restore_state(env: gym.Env, state: Any):
+    """
+    Put a recreated env back where it left off. Only envs exposing their
+    simulator state as `unwrapped.state` (the classic-control family) can be
+    restored; the others come back freshly reset.
+    """
+    current = getattr(env.unwrapped, "state", None)
+    if state is None or current is None:
+        return
+    if isinstance(current, np.ndarray):
+        state = np.asarray(state, dtype=current.dtype)
+        if state.shape != current.shape:
+            return
+    env.unwrapped.state = state
 
 
 class EnvironmentService:
-    
-    def __init__(self):
-        self.environments: Dict[str, gym.Env] = {}
+    """
+    Holds the live gym.Env instances behind the environments API.
+
+    Instances are kept in least-recently-used order. Idle ones are closed
+    after ENV_IDLE_TTL_SECONDS by `evict_idle()`, and the least recently used
+    is closed whenever more than ENV_MAX_LIVE_INSTANCES are live. An evicted
+    env is recreated from its DB row on next use, restored to the state it
+    was evicted in (or the last state saved to the DB).
+    """
+
+    def __init__(
+        self, persister: StatePersister, idle_ttl: float = Config.ENV_IDLE_TTL_SECONDS,
+        max_live: int = Config.ENV_MAX_LIVE_INSTANCES
+    ):
+        self.persister = persister
+        self.idle_ttl = idle_ttl
+        self.max_live = max_live
+        self.environments: "OrderedDict[str, gym.Env]" = OrderedDict()
+        self.actors: Dict[str, EnvActor] = {}
+        self.last_used: Dict[str, float] = {}
+        # Simulator state of evicted envs, newer than what the DB row holds
+        self._evicted_states: Dict[str, Any] = {}
+        # Actors still draining their queue after eviction
+        self._closing: Dict[str, EnvActor] = {}
+        self.snapshots: Dict[str, Dict[str, EnvSnapshot]] = {}
+        # Forked envs have no DB row, so they are gone once evicted
+        self.forks: set = set()
+
+    def _add(self, name: str, env: gym.Env) -> EnvActor:
+        actor = EnvActor(name, env)
+        self.environments[name] = env
+        self.actors[name] = actor
+        self.last_used[name] = time.monotonic()
+        self._evicted_states.pop(name, None)
+        self._enforce_limit()
+        return actor
+
+    def _touch(self, name: str):
+        self.environments.move_to_end(name)
+        self.last_used[name] = time.monotonic()
+
+    def _close(self, name: str, on_close=None) -> Optional[EnvActor]:
+        """Stop the env's actor; the env is closed once its queued commands have run."""
+        self.environments.pop(name, None)
+        self.last_used.pop(name, None)
+        actor = self.actors.pop(name, None)
+        if actor is None:
+            return None
+
+        def closed(env):
+            if on_close is not None:
+                on_close(env)
+            if self._closing.get(name) is actor:
+                del self._closing[name]
+
+        self._closing[name] = actor
+        actor.stop(closed)
+        return actor
+
+    def evict(self, name: str, reason: str = "manual") -> bool:
+        if name not in self.actors:
+            return False
+
+        def stash_state(env):
+            if _has_reset(env):
+                self._evicted_states[name] = _capture_state(env)
+
+        if name in self.forks:
+            # Nothing to recreate a fork from
+            self.forks.discard(name)
+            self.snapshots.pop(name, None)
+            self._close(name)
+        else:
+            self._close(name, on_close=stash_state)
+        ENV_EVICTIONS.labels(reason).inc()
+        logger.info(f"Evicted environment '{name}' ({reason})")
+        return True
+
+    def _enforce_limit(self):
+        while self.max_live and len(self.environments) > self.max_live:
+            oldest = next(iter(self.environments))
+            self.evict(oldest, reason="capacity")
+
+    async def evict_idle(self) -> int:
+        """Close every env unused for longer than the idle TTL. Returns how many were evicted."""
+        if not self.idle_ttl:
+            return 0
+        cutoff = time.monotonic() - self.idle_ttl
+        # LRU order means the idle ones are all at the front
+        idle = []
+        for name in self.environments:
+            if self.last_used.get(name, 0) > cutoff:
+                break
+            if not self.actors[name].depth:
+                idle.append(name)
+        for name in idle:
+            self.evict(name, reason="idle")
+        return len(idle)
+
+    async def get_actor(self, name: str, db: AsyncSession) -> EnvActor:
+        """Return the actor owning `name`, recreating the env from the DB if it was evicted."""
+        actor = self.actors.get(name)
+        if actor is not None:
+            self._touch(name)
+            return actor
+
+        closing = self._closing.get(name)
+        if closing is not None:
+            await closing.wait_closed()
+
+        result = await db.execute(select(Environment).filter(Environment.name == name))
+        env_db = result.scalars().first()
+        if not env_db:
+            raise ValueError(f"Environment '{name}' not found.")
+
+        # Another request may have recreated it while we were waiting
+        actor = self.actors.get(name)
+        if actor is not None:
+            self._touch(name)
+            return actor
+
+        env = gym.make(env_db.env_id)
+        env.reset()
+        saved = self.persister.pending_state(name, env_db.state)
+        _restore_state(env, self._evicted_states.get(name, saved))
+        ENV_RESTORES.inc()
+        logger.info(f"Recreated environment '{name}' ({env_db.env_id})")
+        return self._add(name, env)
 
     async def create_environment(
         self, name: str, env_id: str, db: AsyncSession, owner: User
     ):
         if name in self.environments:
             raise ValueError(f"Environment '{name}' already exists.")
+        existing = await db.execute(select(Environment.id).filter(Environment.name == name))
+        if existing.first() is not None:
+            raise ValueError(f"Environment '{name}' already exists.")
 
         env = gym.make(env_id)
-        self.environments[name] = env
 
         db_env = Environment(
             name=name,
@@ -29,17 +219,20 @@ class EnvironmentService:
         db.add(db_env)
         await db.commit()
         await db.refresh(db_env)
+        self._add(name, env)
         return db_env
 
-    async def step_environment(self, name: str, action: int):
-        env = self.environments.get(name)
-        if not env:
-            raise ValueError(f"Environment '{name}' not found.")
-        
-        if not getattr(env, "_has_reset", False):
+    @staticmethod
+    def _step(env: gym.Env, action: int) -> dict:
+        if not _has_reset(env):
             env.reset()
 
+        env_id = env.spec.id if env.spec else "unknown"
+        started = time.perf_counter()
         observation, reward, terminated, truncated, info = env.step(action)
+        ENV_STEP_SECONDS.labels(env_id).observe(time.perf_counter() - started)
+        ENV_STEPS.labels(env_id, "api").inc()
+
         return {
             "observation": observation.tolist() if hasattr(observation, "tolist") else observation,
             "reward": reward,
@@ -48,32 +241,113 @@ class EnvironmentService:
             "info": info
         }
 
-    async def reset_environment(self, name: str, db: AsyncSession):
-        env = self.environments.get(name)
-        if not env:
-            raise ValueError(f"Environment '{name}' not found.")
+    async def step_environment(self, name: str, action: int, db: AsyncSession):
+        actor = await self.get_actor(name, db)
+        # Includes time queued behind other commands for the same env
+        with timed_phase("env"):
+            return await actor.submit(lambda env: self._step(env, action))
 
-        observation, info = env.reset()
+    async def reset_environment(self, name: str, db: AsyncSession):
+        """
+        Reset the env. The new state is handed to the write-behind persister,
+        so the database is only touched if the env has to be recreated.
+        """
+        actor = await self.get_actor(name, db)
+        with timed_phase("env"):
+            observation, info = await actor.submit(lambda env: env.reset())
 
-        result = await db.execute(select(Environment).filter(Environment.name == name))
-        env_db = result.scalars().first()
-        if env_db:
-            env_db.state = observation.tolist() if hasattr(observation, "tolist") else observation
-            await db.commit()
+        observation = observation.tolist() if hasattr(observation, "tolist") else observation
+        self.persister.record(name, observation)
 
         return {
-            "observation": observation.tolist() if hasattr(observation, "tolist") else observation,
+            "observation": observation,
             "info": info
         }
 
     async def delete_environment(self, name: str, db: AsyncSession):
-        if name not in self.environments:
-            raise ValueError(f"Environment '{name}' not found in memory.")
-
-        del self.environments[name]
+        closed = self._close(name) is not None
+        self._evicted_states.pop(name, None)
+        self.persister.discard(name)
+        self.snapshots.pop(name, None)
+        self.forks.discard(name)
 
         result = await db.execute(select(Environment).filter(Environment.name == name))
         env_db = result.scalars().first()
         if env_db:
             await db.delete(env_db)
             await db.commit()
+        elif not closed:
+            raise ValueError(f"Environment '{name}' not found.")
+
+    async def save_snapshot(self, name: str, label: str, db: AsyncSession) -> dict:
+        actor = await self.get_actor(name, db)
+        snapshots = self.snapshots.setdefault(name, {})
+        if label not in snapshots and len(snapshots) >= Config.ENV_MAX_SNAPSHOTS:
+            raise ValueError(f"Environment '{name}' already has {len(snapshots)} snapshots; delete one first.")
+
+        snapshot = await actor.submit(self._take_snapshot)
+        snapshots[label] = snapshot
+        return snapshot.describe(label)
+
+    @staticmethod
+    def _take_snapshot(env: gym.Env) -> EnvSnapshot:
+        # Like step, start from a reset so the simulator state exists
+        if not _has_reset(env):
+            env.reset()
+        return take_snapshot(env)
+
+    def _snapshot(self, name: str, label: str) -> EnvSnapshot:
+        snapshot = self.snapshots.get(name, {}).get(label)
+        if snapshot is None:
+            raise ValueError(f"Snapshot '{label}' of environment '{name}' not found.")
+        return snapshot
+
+    def list_snapshots(self, name: str) -> list:
+        return [snapshot.describe(label) for label, snapshot in self.snapshots.get(name, {}).items()]
+
+    def delete_snapshot(self, name: str, label: str):
+        self._snapshot(name, label)
+        del self.snapshots[name][label]
+
+    async def restore_snapshot(self, name: str, label: str, db: AsyncSession) -> dict:
+        snapshot = self._snapshot(name, label)
+        actor = await self.get_actor(name, db)
+        await actor.submit(lambda env: restore_snapshot(env, snapshot))
+        return snapshot.describe(label)
+
+    async def fork_snapshot(
+        self, name: str, label: str, count: int, db: AsyncSession, seed: Optional[int] = None
+    ) -> List[str]:
+        """
+        Start `count` new live envs from a snapshot, named `<name>-<label>-<i>`.
+        Forks are in-memory only: they can be stepped, reset and snapshotted
+        like any env, but are gone once deleted or evicted. With `seed`, fork
+        i is reseeded with `seed + i` so stochastic envs diverge.
+        """
+        snapshot = self._snapshot(name, label)
+        names = [f"{name}-{label}-{i}" for i in range(count)]
+        taken = [n for n in names if n in self.actors]
+        if not taken:
+            result = await db.execute(select(Environment.name).filter(Environment.name.in_(names)))
+            taken = list(result.scalars())
+        if taken:
+            raise ValueError(f"Environments {taken} already exist.")
+
+        for i, fork_name in enumerate(names):
+            env = gym.make(snapshot.env_id)
+            env.reset()
+            restore_snapshot(env, snapshot, seed=None if seed is None else seed + i)
+            self.forks.add(fork_name)
+            self._add(fork_name, env)
+        logger.info(f"Forked {count} environments from snapshot '{label}' of '{name}'")
+        return names
+
+    async def close_all(self):
+        for name in list(self.actors):
+            self._close(name)
+        await asyncio.gather(*(actor.wait_closed() for actor in list(self._closing.values())))
+
+
+env_service = EnvironmentService(state_persister)
+LIVE_ENVIRONMENTS.set_function(lambda: len(env_service.environments))
+ENV_QUEUE_DEPTH.set_function(lambda: {name: actor.depth for name, actor in list(env_service.actors.items())})
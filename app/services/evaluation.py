@@ -0,0 +1,141 @@
+import asyncio
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import gymnasium as gym
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.agent_manager import AgentManager
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.models.environment import Environment
+from app.models.evaluation import EvaluationRecord
+from app.services.training import training_manager
+
+logger = get_logger(__name__)
+
+EVALUATION_SECONDS = registry.histogram(
+    "rlforge_evaluation_duration_seconds", "Wall-clock duration of greedy evaluations",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def run_greedy_episodes(env_id: str, agent_payload: bytes, seeds: Sequence[int], max_steps: int) -> List[Tuple[float, int]]:
+    """
+    Worker process entry point: (return, length) of one greedy episode per
+    seed. The agent is unpickled here, so the caller's agent is never touched.
+    """
+    agent = pickle.loads(agent_payload)
+    env = gym.make(env_id)
+    results = []
+    try:
+        for seed in seeds:
+            observation, _ = env.reset(seed=seed)
+            total, steps, done = 0.0, 0, False
+            while not done and steps < max_steps:
+                observation, reward, terminated, truncated, _ = env.step(agent.greedy_action(observation))
+                total += float(reward)
+                steps += 1
+                done = terminated or truncated
+            results.append((total, steps))
+    finally:
+        env.close()
+    return results
+
+
+def summarize(returns: Sequence[float], lengths: Sequence[int]) -> dict:
+    values = np.asarray(returns, dtype=float)
+    return {
+        "mean_return": float(values.mean()),
+        "std_return": float(values.std()),
+        "min_return": float(values.min()),
+        "max_return": float(values.max()),
+        "percentiles": {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        "mean_length": float(np.mean(lengths)),
+    }
+
+
+class EvaluationService:
+    """
+    Measures a trained agent without training it: K greedy episodes with
+    seeds `seed`..`seed + K - 1`, split across a process pool.
+
+    The agent is pickled once in the event loop, which freezes a consistent
+    copy even while an episode is training it, and the rollouts only read
+    that copy. The same seed and agent always give the same returns.
+    """
+
+    def __init__(self, max_workers: int = Config.EVAL_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process with running threads (DB driver, executors) is unsafe
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def evaluate(self, env_name: str, db: AsyncSession, episodes: int, seed: int = 0, agent=None) -> EvaluationRecord:
+        """
+        Evaluate `agent` and record the result. By default that is the agent
+        of the episode training in this process, else the saved one.
+        """
+        result = await db.execute(select(Environment).filter_by(name=env_name))
+        env_obj = result.scalars().first()
+        if not env_obj:
+            raise ValueError(f"Environment '{env_name}' not found.")
+        if agent is None:
+            job = training_manager.jobs.get(env_name)
+            agent = job.agent if job is not None else AgentManager.load(env_name)
+        if agent is None:
+            raise ValueError(f"No trained agent for '{env_name}'.")
+
+        payload = pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL)
+        seeds = list(range(seed, seed + episodes))
+        chunks = [seeds[i::self.max_workers] for i in range(min(self.max_workers, episodes))]
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(self.pool(), run_greedy_episodes, env_obj.env_id, payload, chunk,
+                                 Config.EVAL_MAX_EPISODE_STEPS)
+            for chunk in chunks
+        ))
+        duration = time.perf_counter() - started
+        EVALUATION_SECONDS.observe(duration)
+
+        # Back into seed order
+        by_seed = {s: r for chunk, part in zip(chunks, parts) for s, r in zip(chunk, part)}
+        returns = [by_seed[s][0] for s in seeds]
+        lengths = [by_seed[s][1] for s in seeds]
+
+        record = EvaluationRecord(
+            environment_id=env_obj.id,
+            episodes=episodes,
+            seed=seed,
+            returns=returns,
+            q_table_states=len(agent.q_table),
+            duration_seconds=duration,
+            **summarize(returns, lengths),
+        )
+        db.add(record)
+        await db.commit()
+        await db.refresh(record)
+        logger.info(f"Evaluated '{env_name}' over {episodes} episodes: mean return {record.mean_return:.2f}")
+        return record
+
+
+evaluation_service = EvaluationService()
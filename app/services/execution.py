@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app.core.config import Config
+
+EXECUTION_MODES = ("inline", "thread")
+
+
+class ExecutionPolicy:
+    """
+    Decides per env_id where env.step() runs.
+
+    - "inline" calls it directly on the event loop thread. This has no
+      overhead and suits cheap pure-Python envs such as CartPole.
+    - "thread" hands it to a shared thread pool. Envs whose step is heavy
+      native code that releases the GIL (Box2D, MuJoCo, rendering) then stop
+      blocking every other request for the duration of the step.
+
+    scripts/bench_env_execution.py shows the step cost where "thread"
+    starts to pay off.
+    """
+
+    def __init__(self, policy: Dict[str, str], default: str = "inline", pool_size: int = 4):
+        for env_id, mode in {**policy, "<default>": default}.items():
+            if mode not in EXECUTION_MODES:
+                raise ValueError(f"Unknown execution mode '{mode}' for '{env_id}', expected one of {EXECUTION_MODES}.")
+        self.policy = dict(policy)
+        self.default = default
+        self.pool_size = pool_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def mode(self, env_id: str) -> str:
+        return self.policy.get(env_id, self.default)
+
+    def executor_for(self, env_id: str) -> Optional[ThreadPoolExecutor]:
+        """The pool to run `env_id` steps in, or None to run them inline."""
+        if self.mode(env_id) != "thread":
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="env-step")
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+execution_policy = ExecutionPolicy(
+    Config.ENV_EXECUTION_POLICY, Config.ENV_DEFAULT_EXECUTION, Config.ENV_THREAD_POOL_SIZE
+)
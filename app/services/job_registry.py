@@ -0,0 +1,231 @@
+import json
+import os
+import socket
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from app.core.config import Config
+
+REGISTRY_BACKENDS = ("redis", "memory")
+KEY_PREFIX = "rlforge:training:job:"
+
+
+def worker_id() -> str:
+    """Identifies this process as the owner of the jobs it runs."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class JobLease:
+    """A running (or, for Celery, dispatched) training job as seen by every worker."""
+    env_name: str
+    owner: str
+    started_at: float
+    heartbeat_at: float
+    progress: Optional[dict] = None
+    stop_requested: bool = False
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class JobRegistry(ABC):
+    """
+    Which training jobs are running, and where, shared by all API and
+    Celery workers.
+
+    The process running a job holds a lease on its env_name and renews it
+    with `heartbeat()`. A lease that is not renewed within its TTL expires,
+    so jobs of crashed processes disappear on their own. Stop requests are a
+    flag on the lease, which the owner sees on its next heartbeat.
+    """
+
+    @abstractmethod
+    async def register(self, env_name: str, owner: str, lease_seconds: float) -> bool:
+        """Take the lease on `env_name`. Fails if another owner holds it; the same owner renews it."""
+
+    @abstractmethod
+    async def heartbeat(
+        self, env_name: str, owner: str, lease_seconds: float, progress: Optional[dict] = None
+    ) -> Optional[bool]:
+        """
+        Renew the lease and publish progress. Returns whether a stop was
+        requested, or None if `owner` no longer holds the lease.
+        """
+
+    @abstractmethod
+    async def release(self, env_name: str, owner: Optional[str] = None) -> bool:
+        """Drop the lease; only if `owner` holds it, unless owner is None."""
+
+    @abstractmethod
+    async def request_stop(self, env_name: str) -> bool:
+        """Flag the job for stopping. Returns False if no job holds the lease."""
+
+    @abstractmethod
+    async def get(self, env_name: str) -> Optional[JobLease]:
+        """The job holding the lease on `env_name`, or None."""
+
+    async def close(self):
+        pass
+
+
+class InMemoryJobRegistry(JobRegistry):
+    """Registry local to this process, for tests and single-worker deployments."""
+
+    def __init__(self):
+        self._leases: Dict[str, Tuple[JobLease, float]] = {}
+
+    def _live(self, env_name: str) -> Optional[JobLease]:
+        entry = self._leases.get(env_name)
+        if entry is None:
+            return None
+        lease, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._leases[env_name]
+            return None
+        return lease
+
+    async def register(self, env_name: str, owner: str, lease_seconds: float) -> bool:
+        lease = self._live(env_name)
+        now = time.time()
+        if lease is None:
+            lease = JobLease(env_name=env_name, owner=owner, started_at=now, heartbeat_at=now)
+        elif lease.owner != owner:
+            return False
+        lease.heartbeat_at = now
+        self._leases[env_name] = (lease, time.monotonic() + lease_seconds)
+        return True
+
+    async def heartbeat(
+        self, env_name: str, owner: str, lease_seconds: float, progress: Optional[dict] = None
+    ) -> Optional[bool]:
+        lease = self._live(env_name)
+        if lease is None or lease.owner != owner:
+            return None
+        lease.heartbeat_at = time.time()
+        lease.progress = progress
+        self._leases[env_name] = (lease, time.monotonic() + lease_seconds)
+        return lease.stop_requested
+
+    async def release(self, env_name: str, owner: Optional[str] = None) -> bool:
+        lease = self._live(env_name)
+        if lease is None or (owner is not None and lease.owner != owner):
+            return False
+        del self._leases[env_name]
+        return True
+
+    async def request_stop(self, env_name: str) -> bool:
+        lease = self._live(env_name)
+        if lease is None:
+            return False
+        lease.stop_requested = True
+        return True
+
+    async def get(self, env_name: str) -> Optional[JobLease]:
+        return self._live(env_name)
+
+    def __len__(self) -> int:
+        return len([name for name in list(self._leases) if self._live(name) is not None])
+
+
+# Each lease is a hash with a TTL; the scripts keep check-and-set atomic
+_REGISTER = """
+local owner = redis.call('HGET', KEYS[1], 'owner')
+if owner and owner ~= ARGV[1] then return 0 end
+redis.call('HSET', KEYS[1], 'owner', ARGV[1], 'heartbeat_at', ARGV[2])
+redis.call('HSETNX', KEYS[1], 'started_at', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+_HEARTBEAT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[1] then return -1 end
+redis.call('HSET', KEYS[1], 'heartbeat_at', ARGV[2], 'progress', ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return redis.call('HEXISTS', KEYS[1], 'stop')
+"""
+_RELEASE = """
+if ARGV[1] == '' or redis.call('HGET', KEYS[1], 'owner') == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_REQUEST_STOP = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+redis.call('HSET', KEYS[1], 'stop', ARGV[1])
+return 1
+"""
+
+
+class RedisJobRegistry(JobRegistry):
+    """Registry in Redis (`Config.REDIS_URL`), shared by every worker."""
+
+    def __init__(self, url: str = Config.REDIS_URL):
+        self.url = url
+        self._client: Optional[aioredis.Redis] = None
+        self._scripts = {}
+
+    def _redis(self) -> aioredis.Redis:
+        # Created lazily: connections belong to the event loop that opened them
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(self.url, decode_responses=True)
+            self._scripts = {
+                name: self._client.register_script(source)
+                for name, source in (
+                    ("register", _REGISTER), ("heartbeat", _HEARTBEAT),
+                    ("release", _RELEASE), ("request_stop", _REQUEST_STOP),
+                )
+            }
+        return self._client
+
+    async def _call(self, script: str, env_name: str, *args):
+        self._redis()
+        return await self._scripts[script](keys=[KEY_PREFIX + env_name], args=list(args))
+
+    async def register(self, env_name: str, owner: str, lease_seconds: float) -> bool:
+        return bool(await self._call("register", env_name, owner, time.time(), int(lease_seconds * 1000)))
+
+    async def heartbeat(
+        self, env_name: str, owner: str, lease_seconds: float, progress: Optional[dict] = None
+    ) -> Optional[bool]:
+        result = await self._call(
+            "heartbeat", env_name, owner, time.time(), int(lease_seconds * 1000),
+            json.dumps(progress, default=str),
+        )
+        return None if result < 0 else bool(result)
+
+    async def release(self, env_name: str, owner: Optional[str] = None) -> bool:
+        return bool(await self._call("release", env_name, owner or ""))
+
+    async def request_stop(self, env_name: str) -> bool:
+        return bool(await self._call("request_stop", env_name, time.time()))
+
+    async def get(self, env_name: str) -> Optional[JobLease]:
+        fields = await self._redis().hgetall(KEY_PREFIX + env_name)
+        if not fields.get("owner"):
+            return None
+        return JobLease(
+            env_name=env_name,
+            owner=fields["owner"],
+            started_at=float(fields.get("started_at", 0)),
+            heartbeat_at=float(fields.get("heartbeat_at", 0)),
+            progress=json.loads(fields["progress"]) if fields.get("progress") else None,
+            stop_requested="stop" in fields,
+        )
+
+    async def close(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+
+def create_job_registry(backend: str = Config.TRAINING_REGISTRY_BACKEND) -> JobRegistry:
+    if backend not in REGISTRY_BACKENDS:
+        raise ValueError(f"Unknown training registry backend '{backend}', expected one of {REGISTRY_BACKENDS}.")
+    return RedisJobRegistry() if backend == "redis" else InMemoryJobRegistry()
+
+
+job_registry = create_job_registry()
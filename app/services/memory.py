@@ -0,0 +1,144 @@
+import gc
+import itertools
+import sys
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from app.services.environment import EnvironmentService, env_service
+from app.services.training import TrainingManager, training_manager
+
+# Number of entries measured per container; the rest is extrapolated
+SAMPLE_SIZE = 1000
+
+
+def _sampled_bytes(items, count: int, measure) -> int:
+    """Measure up to SAMPLE_SIZE items and extrapolate to `count`."""
+    if not count:
+        return 0
+    sample = list(itertools.islice(items, SAMPLE_SIZE))
+    measured = sum(measure(item) for item in sample)
+    return int(measured * count / len(sample))
+
+
+def _q_entry_bytes(entry) -> int:
+    key, values = entry
+    key_bytes = sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key) if isinstance(key, tuple) else sys.getsizeof(key)
+    return key_bytes + sys.getsizeof(values)
+
+
+def q_table_bytes(q_table: dict) -> int:
+    """Approximate memory held by a Q-table: dict slots, keys and per-state arrays."""
+    return sys.getsizeof(q_table) + _sampled_bytes(iter(q_table.items()), len(q_table), _q_entry_bytes)
+
+
+def buffer_bytes(buffer: list) -> int:
+    return sys.getsizeof(buffer) + _sampled_bytes(iter(buffer), len(buffer), sys.getsizeof)
+
+
+class MemoryService:
+    """Estimates where the server's memory goes: agents, live envs and training buffers."""
+
+    def __init__(self, environments: EnvironmentService, manager: TrainingManager):
+        self.environments = environments
+        self.manager = manager
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def report(self, trace: bool = False, top: int = 20) -> dict:
+        report = {
+            "process": self._process(),
+            "q_tables": self._q_tables(),
+            "environments": self._environments(),
+            "training_buffers": self._training_buffers(),
+        }
+        if trace:
+            report["tracemalloc"] = self._tracemalloc_diff(top)
+        return report
+
+    @staticmethod
+    def _process() -> dict:
+        data = {"gc_objects": len(gc.get_objects())}
+        if psutil is not None:
+            info = psutil.Process().memory_info()
+            data.update(rss_bytes=info.rss, vms_bytes=info.vms)
+        return data
+
+    def _q_tables(self) -> list:
+        return [
+            {
+                "env_name": name,
+                "states": len(job.agent.q_table),
+                "actions": job.agent.action_size,
+                "estimated_bytes": q_table_bytes(job.agent.q_table),
+            }
+            for name, job in list(self.manager.jobs.items())
+        ]
+
+    def _environments(self) -> dict:
+        by_env_id = Counter(
+            env.spec.id if env.spec else "unknown" for env in list(self.environments.environments.values())
+        )
+        return {"live": sum(by_env_id.values()), "by_env_id": dict(by_env_id)}
+
+    def _training_buffers(self) -> list:
+        return [
+            {
+                "env_name": name,
+                "observations": len(job.states),
+                "rewards": len(job.rewards),
+                "replay_transitions": len(job.replay) if job.replay is not None else 0,
+                "estimated_bytes": buffer_bytes(job.states) + buffer_bytes(job.rewards)
+                + (job.replay.nbytes if job.replay is not None else 0),
+            }
+            for name, job in list(self.manager.jobs.items())
+        ]
+
+    def _tracemalloc_diff(self, top: int) -> dict:
+        """
+        Top allocation sites by growth since the previous call. The first call
+        starts tracing and only records a baseline; tracing stays on, with its
+        overhead, until stop_tracing().
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._snapshot = tracemalloc.take_snapshot()
+            return {
+                "status": "started",
+                "message": "Tracing started; request again to get a diff, DELETE /admin/memory/tracemalloc to stop.",
+            }
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        diff = snapshot.compare_to(self._snapshot, "lineno") if self._snapshot else []
+        self._snapshot = snapshot
+
+        return {
+            "status": "diff",
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "top": [
+                {
+                    "location": str(stat.traceback),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in diff[:top]
+            ],
+        }
+
+    def stop_tracing(self) -> bool:
+        """Stop tracing allocations; False if it wasn't on."""
+        self._snapshot = None
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.stop()
+        return True
+
+
+memory_service = MemoryService(env_service, training_manager)
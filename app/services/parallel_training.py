@@ -0,0 +1,295 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import random
+import time
+from typing import Dict, List, Optional
+
+import gymnasium as gym
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.agent_manager import AgentManager
+from app.agents.q_agent import QAgent
+from app.agents.shared_q_table import HogwildQAgent, QTableFullError, SharedQTable
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.db.session import database
+from app.models.environment import Environment
+from app.services.job_registry import job_registry, worker_id
+from app.services.progress import progress_broadcaster
+from app.services.training import training_manager
+
+logger = get_logger(__name__)
+
+PARALLEL_EPISODES = registry.counter(
+    "rlforge_parallel_training_episodes_total", "Episodes finished by Hogwild training workers"
+)
+RUNNING_PARALLEL = registry.gauge(
+    "rlforge_running_parallel_trainings", "Hogwild training runs currently running in this process"
+)
+
+SEED_STRIDE = 1_000_003
+POLL_SECONDS = 0.2
+JOIN_SECONDS = 10
+
+
+def hogwild_worker(
+    table: SharedQTable, env_id: str, params: dict, episodes: int, seed: int,
+    max_steps: int, results, stop_event,
+):
+    """
+    Worker process entry point: run up to `episodes` episodes against the
+    shared Q-table, reporting ("episode", seed, return, steps, epsilon)
+    after each, or ("error", seed, message) if it fails, e.g. because the
+    table filled up. Stops between episodes once `stop_event` is set.
+    """
+    env = None
+    try:
+        agent = HogwildQAgent(table, **params)
+        env = gym.make(env_id)
+        random.seed(seed)
+        for episode in range(episodes):
+            if stop_event.is_set():
+                break
+            observation, _ = env.reset(seed=seed * SEED_STRIDE + episode)
+            total, steps, done = 0.0, 0, False
+            while not done and steps < max_steps:
+                action = agent.choose_action(observation)
+                next_obs, reward, terminated, truncated, _ = env.step(action)
+                agent.learn(observation, action, reward, next_obs, terminated)
+                observation = next_obs
+                total += float(reward)
+                steps += 1
+                done = terminated or truncated
+            results.put(("episode", seed, total, steps, agent.epsilon))
+    except QTableFullError as e:
+        results.put(("error", seed, str(e)))
+    except Exception as e:
+        # A worker that dies silently would look like a finished run
+        results.put(("error", seed, f"{type(e).__name__}: {e}"))
+    finally:
+        if env is not None:
+            env.close()
+        table.close()
+
+
+class ParallelRun:
+    """Counters of a Hogwild run, as reported by its workers."""
+
+    def __init__(self, env_name: str, workers: int, episodes: int, locked: bool):
+        self.env_name = env_name
+        self.workers = workers
+        self.episodes = episodes
+        self.locked = locked
+        self.finished = 0
+        self.steps = 0
+        self.returns: List[float] = []
+        self.epsilons: Dict[int, float] = {}
+        self.error: Optional[str] = None
+        self.started = time.perf_counter()
+        self.q_table_states = 0
+
+    def record(self, seed: int, total: float, steps: int, epsilon: float):
+        self.finished += 1
+        self.steps += steps
+        self.returns.append(total)
+        self.epsilons[seed] = epsilon
+
+    def record_error(self, seed: int, message: str):
+        self.error = f"worker {seed}: {message}"
+
+    def progress(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        recent = self.returns[-100:]
+        return {
+            "env_name": self.env_name,
+            "mode": "hogwild",
+            "workers": self.workers,
+            "locked": self.locked,
+            "episodes": self.finished,
+            "target_episodes": self.episodes,
+            "steps": self.steps,
+            "steps_per_second": round(self.steps / elapsed, 2) if elapsed > 0 else 0.0,
+            "mean_return": sum(recent) / len(recent) if recent else None,
+            "q_table_states": self.q_table_states,
+        }
+
+
+class ParallelTrainer:
+    """
+    Hogwild training: several worker processes run episodes of the same
+    environment and update one SharedQTable concurrently, without locks
+    unless `locked` is set.
+
+    The table is seeded from the saved agent and, when the run ends or is
+    stopped, copied back into it and saved through AgentManager. The run
+    holds the environment's lease in the job registry like any training
+    job, so status, stream and stop work as usual; a stop lets every worker
+    finish its current episode.
+    """
+
+    def __init__(self, max_workers: int = Config.PARALLEL_MAX_WORKERS):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.running: Dict[str, asyncio.Task] = {}
+        self.runs: Dict[str, ParallelRun] = {}
+
+    async def start(self, env_name: str, db: AsyncSession, workers: int, episodes: int, locked: bool = False) -> dict:
+        if workers > self.max_workers:
+            raise ValueError(f"At most {self.max_workers} workers.")
+        if episodes > Config.PARALLEL_MAX_EPISODES:
+            raise ValueError(f"At most {Config.PARALLEL_MAX_EPISODES} episodes.")
+        if training_manager.scheduler.is_queued(env_name) or await training_manager.is_training(env_name):
+            raise ValueError(f"Environment '{env_name}' is already training.")
+        result = await db.execute(select(Environment).filter_by(name=env_name))
+        env_obj = result.scalars().first()
+        if not env_obj:
+            raise ValueError(f"Environment '{env_name}' not found.")
+
+        owner = worker_id()
+        if not await job_registry.register(env_name, owner, Config.TRAINING_LEASE_SECONDS):
+            raise ValueError(f"Environment '{env_name}' is already training.")
+        env_obj.is_training = True
+        await db.commit()
+
+        run = self.runs[env_name] = ParallelRun(env_name, workers, episodes, locked)
+        self.running[env_name] = asyncio.create_task(self._run(run, env_obj.env_id, owner))
+        logger.info(f"Started Hogwild training of '{env_name}': {workers} workers, {episodes} episodes, locked={locked}")
+        return run.progress()
+
+    async def _run(self, run: ParallelRun, env_id: str, owner: str):
+        env_name = run.env_name
+        # spawn: forking a process with running threads (DB driver, executors) is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        table = None
+        processes: List[multiprocessing.Process] = []
+        outcome = "failed"
+        try:
+            env = gym.make(env_id)
+            state_size, action_size = env.observation_space.shape[0], env.action_space.n
+            env.close()
+            agent = AgentManager.load(env_name) or QAgent(state_size=state_size, action_size=action_size)
+            params = {
+                "learning_rate": agent.lr, "discount_factor": agent.gamma, "epsilon": agent.epsilon,
+                "epsilon_decay": agent.epsilon_decay, "epsilon_min": agent.epsilon_min,
+            }
+            table = SharedQTable.create(
+                ctx, state_size, action_size, Config.PARALLEL_Q_TABLE_CAPACITY, lock_updates=run.locked
+            )
+            table.update(agent.q_table)
+
+            results, stop_event = ctx.Queue(), ctx.Event()
+            for i in range(run.workers):
+                share = run.episodes // run.workers + (i < run.episodes % run.workers)
+                process = ctx.Process(
+                    target=hogwild_worker, daemon=True,
+                    args=(table, env_id, params, share, i, Config.EVAL_MAX_EPISODE_STEPS, results, stop_event),
+                )
+                process.start()
+                processes.append(process)
+
+            try:
+                outcome = await self._supervise(run, processes, results, stop_event, owner)
+            finally:
+                # Also when cancelled: keep what the workers learned
+                self._publish(run, table, agent)
+            if run.error:
+                outcome = "failed"
+                logger.error(f"Hogwild training of '{env_name}': {run.error}")
+            logger.info(f"Hogwild training of '{env_name}' {outcome}: {run.progress()}")
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception(f"Hogwild training of '{env_name}' failed: {e}")
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            if table is not None:
+                table.close()
+            await job_registry.release(env_name, owner)
+            await self._finish(env_name)
+            self.running.pop(env_name, None)
+            self.runs.pop(env_name, None)
+            progress_broadcaster.close(env_name, {"event": "end", "outcome": outcome, **run.progress()})
+
+    @staticmethod
+    def _publish(run: ParallelRun, table: SharedQTable, agent: QAgent):
+        # Exploration continues from the most explored worker
+        if run.epsilons:
+            agent.epsilon = min(run.epsilons.values())
+        AgentManager.save_shared(run.env_name, table, agent)
+        run.q_table_states = len(agent.q_table)
+
+    async def _supervise(self, run: ParallelRun, processes, results, stop_event, owner: str) -> str:
+        """Collect results until every worker exits, heartbeating the lease meanwhile."""
+        env_name = run.env_name
+        outcome = "finished"
+        last_heartbeat, last_event = float("-inf"), time.perf_counter()
+        try:
+            while True:
+                alive = any(p.is_alive() for p in processes)
+                self._drain(run, results)
+                if not alive:
+                    break
+                now = time.perf_counter()
+                if now - last_heartbeat >= Config.TRAINING_HEARTBEAT_SECONDS:
+                    last_heartbeat = now
+                    try:
+                        stop = await job_registry.heartbeat(env_name, owner, Config.TRAINING_LEASE_SECONDS, run.progress())
+                    except Exception as e:
+                        logger.warning(f"Heartbeat for '{env_name}' failed: {e}")
+                        stop = False
+                    if (stop is None or stop) and not stop_event.is_set():
+                        logger.info(f"Stopping Hogwild training of '{env_name}'")
+                        outcome = "stopped"
+                        stop_event.set()
+                if progress_broadcaster.has_subscribers(env_name) and now - last_event >= Config.TRAINING_STREAM_INTERVAL_SECONDS:
+                    last_event = now
+                    progress_broadcaster.publish(env_name, {"event": "progress", **run.progress()})
+                await asyncio.sleep(POLL_SECONDS)
+        except asyncio.CancelledError:
+            # Let workers finish their episode so the table is left consistent
+            stop_event.set()
+            deadline = time.perf_counter() + JOIN_SECONDS
+            while any(p.is_alive() for p in processes) and time.perf_counter() < deadline:
+                self._drain(run, results)
+                await asyncio.sleep(POLL_SECONDS)
+            raise
+        return outcome
+
+    @staticmethod
+    def _drain(run: ParallelRun, results):
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                return
+            kind, *fields = item
+            if kind == "error":
+                run.record_error(*fields)
+            else:
+                run.record(*fields)
+                PARALLEL_EPISODES.inc()
+
+    @staticmethod
+    async def _finish(env_name: str):
+        async with database.get_session() as db:
+            await db.execute(update(Environment).where(Environment.name == env_name).values(is_training=False))
+            await db.commit()
+
+    async def shutdown(self):
+        for task in list(self.running.values()):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+parallel_trainer = ParallelTrainer()
+RUNNING_PARALLEL.set_function(lambda: len(parallel_trainer.running))
@@ -0,0 +1,150 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from app.core.logging import get_logger
+from app.services.training import TrainingManager, training_manager
+
+logger = get_logger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the call stack of one thread at a fixed interval from a background
+    thread and aggregates the samples as collapsed stacks (flamegraph input).
+
+    With `job_name` set, only samples taken while that training job's episode
+    loop is on the stack are kept.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005, job_name: Optional[str] = None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.job_name = job_name
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _belongs_to_job(self, stack) -> bool:
+        episode_code = TrainingManager._run_episode.__code__
+        return any(
+            frame.f_code is episode_code and frame.f_locals.get("env_name") == self.job_name
+            for frame in stack
+        )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            if not stack:
+                continue
+            if self.job_name is not None and not self._belongs_to_job(stack):
+                continue
+            self.samples[";".join(_frame_label(f) for f in reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class ProfilerService:
+    """
+    On-demand profiling of the running server or of a single training job.
+
+    - "cprofile" returns a pstats report. For a training job the profiler is
+      only enabled around that job's own steps, so other requests do not
+      pollute it.
+    - "sampling" returns collapsed stacks, one line per unique stack, ready
+      for flamegraph.pl or speedscope.
+
+    Only one profile can run at a time since the interpreter supports a single
+    active profiler per thread.
+    """
+
+    def __init__(self, manager: TrainingManager):
+        self.manager = manager
+        self._lock = asyncio.Lock()
+
+    async def profile(
+        self, seconds: float, mode: str = "cprofile", env_name: Optional[str] = None, limit: int = 50
+    ) -> str:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}.")
+        if env_name is not None and env_name not in self.manager.jobs:
+            raise LookupError(f"No active training for '{env_name}'.")
+        if self._lock.locked():
+            raise RuntimeError("A profile is already being captured.")
+
+        async with self._lock:
+            target = f"training job '{env_name}'" if env_name else "server"
+            logger.info(f"Capturing {mode} profile of {target} for {seconds}s")
+            started = time.perf_counter()
+
+            if mode == "sampling":
+                report = await self._sample(seconds, env_name)
+            else:
+                report = await self._cprofile(seconds, env_name, limit)
+
+            header = f"# {mode} profile of {target}, {time.perf_counter() - started:.2f}s\n"
+            return header + report
+
+    async def _cprofile(self, seconds: float, env_name: Optional[str], limit: int) -> str:
+        profiler = cProfile.Profile()
+
+        if env_name is None:
+            profiler.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.disable()
+        else:
+            job = self.manager.jobs[env_name]
+            job.profiler = profiler
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                job.profiler = None
+                profiler.disable()
+
+        out = io.StringIO()
+        try:
+            stats = pstats.Stats(profiler, stream=out)
+        except TypeError:
+            return "No samples collected (the job may have finished before profiling started).\n"
+        stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    async def _sample(self, seconds: float, env_name: Optional[str]) -> str:
+        sampler = StackSampler(threading.get_ident(), job_name=env_name)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+        return sampler.collapsed() + "\n"
+
+
+profiler_service = ProfilerService(training_manager)
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from app.core.config import Config
+from app.core.metrics import registry
+
+PROGRESS_SUBSCRIBERS = registry.gauge(
+    "rlforge_training_progress_subscribers", "Clients streaming training progress"
+)
+PROGRESS_EVENTS_DROPPED = registry.counter(
+    "rlforge_training_progress_events_dropped_total", "Progress events dropped because a subscriber fell behind"
+)
+
+
+class Subscription:
+    """One client's bounded buffer of progress events for a job."""
+
+    def __init__(self, env_name: str, size: int):
+        self.env_name = env_name
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        # Events dropped since the last one this subscriber received
+        self.dropped = 0
+
+    def put(self, event: dict):
+        if self.queue.full():
+            # Drop the oldest event: the newest progress is the one worth showing
+            self.queue.get_nowait()
+            self.dropped += 1
+            PROGRESS_EVENTS_DROPPED.inc()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """The next event, with the number dropped before it; None on timeout."""
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.dropped:
+            event = {**event, "dropped": self.dropped}
+            self.dropped = 0
+        return event
+
+
+class ProgressBroadcaster:
+    """
+    Per-job fan-out of training progress events.
+
+    The training loop publishes without ever waiting: each subscriber has a
+    queue of at most `queue_size` events, and a subscriber that falls behind
+    loses its oldest events instead of slowing the episode down.
+    """
+
+    def __init__(self, queue_size: int = Config.TRAINING_STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, env_name: str) -> Subscription:
+        subscription = Subscription(env_name, self.queue_size)
+        self._channels.setdefault(env_name, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._channels.get(subscription.env_name)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._channels[subscription.env_name]
+
+    def has_subscribers(self, env_name: str) -> bool:
+        return env_name in self._channels
+
+    def publish(self, env_name: str, event: dict):
+        for subscription in self._channels.get(env_name, ()):
+            subscription.put(event)
+
+    def close(self, env_name: str, event: dict):
+        """Send the final event of a job; subscribers stop after it."""
+        for subscription in self._channels.pop(env_name, ()):
+            subscription.put(event)
+
+    def __len__(self) -> int:
+        return sum(len(subscribers) for subscribers in self._channels.values())
+
+
+progress_broadcaster = ProgressBroadcaster()
+PROGRESS_SUBSCRIBERS.set_function(lambda: len(progress_broadcaster))
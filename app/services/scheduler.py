@@ -0,0 +1,176 @@
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.exceptions.custom_error import TrainingBacklogFullError
+
+logger = get_logger(__name__)
+
+QUEUED_TRAININGS = registry.gauge(
+    "rlforge_queued_trainings", "Training jobs waiting for a free slot"
+)
+TRAINING_QUEUE_WAIT_SECONDS = registry.histogram(
+    "rlforge_training_queue_wait_seconds", "Time training jobs spent queued before starting",
+    buckets=(0.1, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+TRAINING_REJECTIONS = registry.counter(
+    "rlforge_training_rejections_total", "Training jobs rejected because the backlog was full"
+)
+
+
+@dataclass
+class QueuedJob:
+    env_name: str
+    user_id: Optional[str]
+    priority: int = 0
+    max_steps: Optional[int] = None
+    resume: bool = False
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+
+class TrainingScheduler:
+    """
+    Admission control for training jobs.
+
+    At most `max_concurrent` jobs run at once. The rest wait in the queue,
+    and new jobs are rejected once `max_backlog` are waiting. Among waiting
+    jobs, a higher priority always goes first. Within one priority, users
+    take turns (round-robin), so one user's burst can't starve everyone
+    else. Each user's own jobs run in submission order.
+
+    `launch` is called with each job as it is admitted, and `release()` must
+    be called when a job finishes to free its slot.
+    """
+
+    def __init__(
+        self,
+        launch: Callable[[QueuedJob], None],
+        max_concurrent: int = Config.TRAINING_MAX_CONCURRENT,
+        max_backlog: int = Config.TRAINING_MAX_BACKLOG,
+    ):
+        self.launch = launch
+        self.max_concurrent = max_concurrent
+        self.max_backlog = max_backlog
+        self.running: Dict[str, QueuedJob] = {}
+        # priority -> user -> that user's jobs, users in round-robin order
+        self._queues: Dict[int, "OrderedDict[Optional[str], deque]"] = {}
+        self._queued: Dict[str, QueuedJob] = {}
+        # Moving average of job run time, for wait estimates
+        self._avg_duration: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def is_queued(self, env_name: str) -> bool:
+        return env_name in self._queued
+
+    def submit(self, job: QueuedJob) -> bool:
+        """Start `job` now if a slot is free, otherwise queue it. Returns True if it started."""
+        if len(self.running) < self.max_concurrent and not self._queued:
+            self._start(job)
+            return True
+
+        if len(self._queued) >= self.max_backlog:
+            TRAINING_REJECTIONS.inc()
+            raise TrainingBacklogFullError(
+                f"Training backlog is full ({self.max_backlog} jobs waiting); try again later.",
+                errors={"queued": len(self._queued), "running": len(self.running)},
+            )
+
+        users = self._queues.setdefault(job.priority, OrderedDict())
+        users.setdefault(job.user_id, deque()).append(job)
+        self._queued[job.env_name] = job
+        logger.info(f"Queued training for '{job.env_name}' (priority {job.priority}, {len(self._queued)} waiting)")
+        return False
+
+    def cancel(self, env_name: str) -> bool:
+        job = self._queued.pop(env_name, None)
+        if job is None:
+            return False
+        users = self._queues[job.priority]
+        users[job.user_id].remove(job)
+        if not users[job.user_id]:
+            del users[job.user_id]
+        if not users:
+            del self._queues[job.priority]
+        return True
+
+    def release(self, env_name: str):
+        job = self.running.pop(env_name, None)
+        if job is not None and job.started_at is not None:
+            duration = time.monotonic() - job.started_at
+            self._avg_duration = duration if self._avg_duration is None else 0.8 * self._avg_duration + 0.2 * duration
+        self._dispatch()
+
+    def _start(self, job: QueuedJob):
+        job.started_at = time.monotonic()
+        self.running[job.env_name] = job
+        TRAINING_QUEUE_WAIT_SECONDS.observe(job.started_at - job.enqueued_at)
+        try:
+            self.launch(job)
+        except Exception:
+            self.running.pop(job.env_name, None)
+            raise
+
+    def _next(self) -> Optional[QueuedJob]:
+        if not self._queues:
+            return None
+        priority = max(self._queues)
+        users = self._queues[priority]
+        user_id, jobs = next(iter(users.items()))
+        job = jobs.popleft()
+        # The user goes to the back of the line for this priority
+        del users[user_id]
+        if jobs:
+            users[user_id] = jobs
+        if not users:
+            del self._queues[priority]
+        del self._queued[job.env_name]
+        return job
+
+    def _dispatch(self):
+        while len(self.running) < self.max_concurrent:
+            job = self._next()
+            if job is None:
+                return
+            try:
+                self._start(job)
+            except Exception as e:
+                logger.exception(f"Failed to start queued training for '{job.env_name}': {e}")
+
+    def order(self) -> List[QueuedJob]:
+        """Waiting jobs in the order they will start."""
+        order = []
+        queues = {p: OrderedDict((u, list(jobs)) for u, jobs in users.items()) for p, users in self._queues.items()}
+        for priority in sorted(queues, reverse=True):
+            users = queues[priority]
+            while users:
+                user_id, jobs = next(iter(users.items()))
+                order.append(jobs.pop(0))
+                del users[user_id]
+                if jobs:
+                    users[user_id] = jobs
+        return order
+
+    def status(self, env_name: str) -> Optional[dict]:
+        """Queue position (1 = next) and expected wait of a queued job, or None."""
+        if env_name not in self._queued:
+            return None
+        position = next(i for i, job in enumerate(self.order(), 1) if job.env_name == env_name)
+        job = self._queued[env_name]
+        expected_wait = None
+        if self._avg_duration is not None:
+            # Jobs ahead drain max_concurrent at a time
+            expected_wait = math.ceil(position / self.max_concurrent) * self._avg_duration
+        return {
+            "queue_position": position,
+            "queued_for_seconds": round(time.monotonic() - job.enqueued_at, 3),
+            "expected_wait_seconds": round(expected_wait, 3) if expected_wait is not None else None,
+            "priority": job.priority,
+        }
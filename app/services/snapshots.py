@@ -0,0 +1,93 @@
+import copy
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import gymnasium as gym
+from gymnasium.utils import seeding
+
+from app.utils.time import utcnow
+
+# Attributes that hold the whole simulator state of the built-in envs
+# (classic control keeps `state`, toy text keeps `s`/`lastaction`)
+STATE_ATTRS = ("state", "s", "lastaction", "steps_beyond_terminated")
+# Never copied: rendering handles and what is captured separately
+SKIP_ATTRS = ("screen", "clock", "viewer", "window", "surf", "_np_random", "_np_random_seed", "spec")
+# Per-wrapper bookkeeping that affects what the next step does
+WRAPPER_ATTRS = ("_elapsed_steps", "_has_reset")
+
+SNAPSHOT_KINDS = ("state", "copy")
+
+
+@dataclass
+class EnvSnapshot:
+    """
+    Everything needed to put an env back to an exact point: the unwrapped
+    env's internal state, its RNG state and the state of the wrappers around
+    it (TimeLimit step count, OrderEnforcing reset flag).
+
+    "state" snapshots copy only the known state attributes. "copy" snapshots
+    are the fallback for envs without them and deep-copy the unwrapped env's
+    attributes.
+    """
+    env_id: str
+    kind: str
+    attrs: Dict[str, Any]
+    rng_state: Optional[dict]
+    wrappers: List[Dict[str, Any]]
+    created_at: datetime = field(default_factory=utcnow)
+
+    def describe(self, label: str) -> dict:
+        return {"label": label, "env_id": self.env_id, "kind": self.kind, "created_at": self.created_at}
+
+
+def _wrappers(env: gym.Env):
+    while isinstance(env, gym.Wrapper):
+        yield env
+        env = env.env
+
+
+def take_snapshot(env: gym.Env) -> EnvSnapshot:
+    unwrapped = env.unwrapped
+    attrs = {name: copy.deepcopy(getattr(unwrapped, name)) for name in STATE_ATTRS if hasattr(unwrapped, name)}
+    kind = "state"
+    if "state" not in attrs and "s" not in attrs:
+        kind = "copy"
+        try:
+            attrs = copy.deepcopy({k: v for k, v in vars(unwrapped).items() if k not in SKIP_ATTRS})
+        except Exception as e:
+            raise ValueError(f"Environment '{env.spec.id if env.spec else unwrapped}' does not support snapshots: {e}")
+
+    return EnvSnapshot(
+        env_id=env.spec.id if env.spec else type(unwrapped).__name__,
+        kind=kind,
+        attrs=attrs,
+        rng_state=copy.deepcopy(unwrapped.np_random.bit_generator.state),
+        wrappers=[
+            {name: getattr(wrapper, name) for name in WRAPPER_ATTRS if name in vars(wrapper)}
+            for wrapper in _wrappers(env)
+        ],
+    )
+
+
+def restore_snapshot(env: gym.Env, snapshot: EnvSnapshot, seed: Optional[int] = None):
+    """
+    Restore `snapshot` into `env`, which must be the same env_id. With `seed`
+    the RNG is reseeded instead of restored, so forks can diverge.
+    """
+    env_id = env.spec.id if env.spec else type(env.unwrapped).__name__
+    if env_id != snapshot.env_id:
+        raise ValueError(f"Snapshot of '{snapshot.env_id}' cannot be restored into '{env_id}'.")
+
+    unwrapped = env.unwrapped
+    for name, value in copy.deepcopy(snapshot.attrs).items():
+        setattr(unwrapped, name, value)
+
+    if seed is not None:
+        unwrapped.np_random, _ = seeding.np_random(seed)
+    elif snapshot.rng_state is not None:
+        unwrapped.np_random.bit_generator.state = copy.deepcopy(snapshot.rng_state)
+
+    for wrapper, state in zip(_wrappers(env), snapshot.wrappers):
+        for name, value in state.items():
+            setattr(wrapper, name, value)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from sqlalchemy import JSON, String, bindparam, column, update, values
+
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.db.session import database
+from app.models.environment import Environment
+
+logger = get_logger(__name__)
+
+PENDING_STATES = registry.gauge(
+    "rlforge_env_state_pending", "Environment states recorded but not yet written to the database"
+)
+STATE_FLUSH_SECONDS = registry.histogram(
+    "rlforge_env_state_flush_duration_seconds", "Time taken to write a batch of environment states"
+)
+STATES_WRITTEN = registry.counter(
+    "rlforge_env_state_writes_total", "Environment states written to the database"
+)
+
+_MISSING = object()
+
+
+class StatePersister:
+    """
+    Write-behind store for `Environment.state`.
+
+    Requests only record the latest state per environment in memory; later
+    writes for the same env replace earlier ones. `flush()` writes everything
+    pending in one statement per chunk. On Postgres this is
+    UPDATE ... FROM (VALUES ...); other databases get an executemany UPDATE.
+    It runs on a timer and once more at shutdown.
+    """
+
+    def __init__(self, chunk_size: int = Config.ENV_STATE_FLUSH_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._pending: Dict[str, Any] = {}
+        self._flush_lock = asyncio.Lock()
+
+    def record(self, name: str, state: Any):
+        self._pending[name] = state
+
+    def discard(self, name: str):
+        self._pending.pop(name, None)
+
+    def pending_state(self, name: str, default: Any = None) -> Any:
+        """The unflushed state for `name`, which is newer than the DB row."""
+        state = self._pending.get(name, _MISSING)
+        return default if state is _MISSING else state
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """Write all pending states. Returns the number of environments updated."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            started = time.perf_counter()
+            try:
+                await self._write(list(batch.items()))
+            except Exception:
+                # Keep what failed, unless a newer state was recorded meanwhile
+                for name, state in batch.items():
+                    self._pending.setdefault(name, state)
+                raise
+            STATE_FLUSH_SECONDS.observe(time.perf_counter() - started)
+            STATES_WRITTEN.inc(len(batch))
+            logger.debug(f"Flushed {len(batch)} environment states")
+            return len(batch)
+
+    async def _write(self, items: list):
+        table = Environment.__table__
+        async with database.get_session() as db:
+            postgres = db.bind.dialect.name == "postgresql"
+            for offset in range(0, len(items), self.chunk_size):
+                chunk = items[offset:offset + self.chunk_size]
+                if postgres:
+                    rows = values(column("name", String), column("state", JSON), name="v").data(chunk)
+                    await db.execute(
+                        update(table)
+                        .where(table.c.name == rows.c.name)
+                        .values(state=rows.c.state)
+                    )
+                else:
+                    await db.execute(
+                        update(table)
+                        .where(table.c.name == bindparam("env_name"))
+                        .values(state=bindparam("env_state", type_=JSON)),
+                        [{"env_name": name, "env_state": state} for name, state in chunk],
+                    )
+            await db.commit()
+
+
+state_persister = StatePersister()
+PENDING_STATES.set_function(lambda: len(state_persister))
@@ -0,0 +1,287 @@
+import asyncio
+import itertools
+import math
+import multiprocessing
+import os
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import gymnasium as gym
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.q_agent import QAgent
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.db.session import database
+from app.models.environment import Environment
+from app.models.sweep import SweepRecord
+from app.schemas.sweep import SweepCreate
+from app.services.evaluation import run_greedy_episodes
+from app.utils.time import utcnow
+
+logger = get_logger(__name__)
+
+SWEEP_TRIALS = registry.counter(
+    "rlforge_sweep_trial_runs_total", "Trial runs (configuration x seed x rung) completed by sweeps"
+)
+RUNNING_SWEEPS = registry.gauge(
+    "rlforge_running_sweeps", "Hyperparameter sweeps currently running"
+)
+
+# Greedy scoring uses its own seeds, disjoint from the training episodes'
+EVAL_SEED_OFFSET = 1_000_000
+SEED_STRIDE = 1_000_003
+
+
+def _sample(values, rng: random.Random) -> float:
+    if isinstance(values, list):
+        return rng.choice(values)
+    if values.log:
+        return math.exp(rng.uniform(math.log(values.low), math.log(values.high)))
+    return rng.uniform(values.low, values.high)
+
+
+def expand_space(request: SweepCreate) -> List[dict]:
+    """The configurations to try, in trial order."""
+    names = sorted(request.space)
+    if request.strategy == "grid":
+        return [dict(zip(names, values)) for values in itertools.product(*(request.space[n] for n in names))]
+    rng = random.Random(request.seeds[0])
+    return [{name: _sample(request.space[name], rng) for name in names} for _ in range(request.trials)]
+
+
+def halving_budgets(min_episodes: Optional[int], episodes: int, eta: int) -> List[int]:
+    """Cumulative episode budget of each successive-halving rung."""
+    if min_episodes is None:
+        return [episodes]
+    budgets = []
+    budget = min_episodes
+    while budget < episodes:
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(episodes)
+    return budgets
+
+
+def run_trial(
+    env_id: str, params: dict, seed: int, agent_payload: Optional[bytes],
+    start_episode: int, episodes: int, eval_seeds: List[int], max_steps: int, stop=None,
+) -> Optional[Tuple[bytes, float]]:
+    """
+    Worker process entry point: train a trial's agent for `episodes` more
+    episodes, then score it by its mean greedy return. Returns the pickled
+    agent, so the next rung can continue from it, and the score; or None if
+    the `stop` event was set, which is checked between episodes.
+    """
+    env = gym.make(env_id)
+    try:
+        if agent_payload is None:
+            agent = QAgent(state_size=env.observation_space.shape[0], action_size=env.action_space.n, **params)
+        else:
+            agent = pickle.loads(agent_payload)
+        for episode in range(start_episode, start_episode + episodes):
+            if stop is not None and stop.is_set():
+                return None
+            # Exploration and env randomness depend only on (seed, episode)
+            episode_seed = seed * SEED_STRIDE + episode
+            random.seed(episode_seed)
+            observation, _ = env.reset(seed=episode_seed)
+            done, steps = False, 0
+            while not done and steps < max_steps:
+                action = agent.choose_action(observation)
+                next_obs, reward, terminated, truncated, _ = env.step(action)
+                agent.learn(observation, action, reward, next_obs, terminated)
+                observation = next_obs
+                steps += 1
+                done = terminated or truncated
+    finally:
+        env.close()
+
+    payload = pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL)
+    returns = [total for total, _ in run_greedy_episodes(env_id, payload, eval_seeds, max_steps)]
+    return payload, float(np.mean(returns))
+
+
+def best_trial(trials: List[dict]) -> Optional[dict]:
+    """Best score among the trials that got the full budget."""
+    scored = [t for t in trials if t["score"] is not None]
+    if not scored:
+        return None
+    most = max(t["episodes"] for t in scored)
+    return max((t for t in scored if t["episodes"] == most), key=lambda t: t["score"])
+
+
+class SweepService:
+    """
+    Runs hyperparameter sweeps in the background over a process pool.
+
+    Each rung submits every surviving (configuration, seed) pair as one
+    task. A task trains for the rung's extra episodes and is then scored.
+    Agents travel between rungs pickled, so later rungs continue training
+    instead of starting over. Trial scores and the best configuration are
+    written to the SweepRecord after every rung.
+
+    Cancelling sets the sweep's stop event, a Manager proxy that pool tasks
+    can receive as an argument, so trials already running in the pool stop
+    at their next episode instead of holding workers until they finish.
+    """
+
+    def __init__(self, max_workers: int = Config.SWEEP_MAX_WORKERS):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self.running: Dict[str, asyncio.Task] = {}
+        self._stops: Dict[str, object] = {}
+
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process with running threads (DB driver, executors) is unsafe
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def manager(self):
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    async def start(self, env_name: str, request: SweepCreate, db: AsyncSession, user_id: Optional[str] = None) -> SweepRecord:
+        result = await db.execute(select(Environment).filter_by(name=env_name))
+        env_obj = result.scalars().first()
+        if not env_obj:
+            raise ValueError(f"Environment '{env_name}' not found.")
+        configs = expand_space(request)
+        runs = len(configs) * len(request.seeds)
+        if runs > Config.SWEEP_MAX_TRIALS:
+            raise ValueError(f"Sweep has {runs} trial runs (configurations x seeds); the limit is {Config.SWEEP_MAX_TRIALS}.")
+        if request.episodes > Config.SWEEP_MAX_EPISODES:
+            raise ValueError(f"At most {Config.SWEEP_MAX_EPISODES} episodes per trial.")
+
+        # Starting the manager process blocks; the first sweep pays for it
+        stop = await asyncio.to_thread(lambda: self.manager().Event())
+
+        record = SweepRecord(
+            environment_id=env_obj.id,
+            user_id=user_id,
+            status="running",
+            spec=request.model_dump(),
+            trials=[],
+            started_at=utcnow(),
+        )
+        db.add(record)
+        await db.commit()
+        await db.refresh(record)
+
+        self._stops[record.id] = stop
+        self.running[record.id] = asyncio.create_task(self._run(record.id, env_obj.env_id, configs, request, stop))
+        logger.info(f"Started sweep {record.id} on '{env_name}': {len(configs)} configurations x {len(request.seeds)} seeds")
+        return record
+
+    async def _run(self, sweep_id: str, env_id: str, configs: List[dict], request: SweepCreate, stop):
+        trials = [
+            {"trial": i, "params": params, "episodes": 0, "rung": None, "score": None, "scores": None}
+            for i, params in enumerate(configs)
+        ]
+        agents: Dict[Tuple[int, int], bytes] = {}
+        alive = list(range(len(configs)))
+        budgets = halving_budgets(request.min_episodes, request.episodes, request.eta)
+        eval_seeds = list(range(EVAL_SEED_OFFSET, EVAL_SEED_OFFSET + request.eval_episodes))
+        loop = asyncio.get_running_loop()
+        trained = 0
+        try:
+            for rung, budget in enumerate(budgets):
+                keys = [(i, seed) for i in alive for seed in request.seeds]
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(
+                        self.pool(), run_trial, env_id, configs[i], seed, agents.get((i, seed)),
+                        trained, budget - trained, eval_seeds, Config.EVAL_MAX_EPISODE_STEPS, stop,
+                    )
+                    for i, seed in keys
+                ))
+                SWEEP_TRIALS.inc(len(keys))
+                scores: Dict[int, List[float]] = {}
+                for (i, seed), (payload, score) in zip(keys, results):
+                    agents[(i, seed)] = payload
+                    scores.setdefault(i, []).append(score)
+                for i in alive:
+                    trials[i].update(episodes=budget, rung=rung, scores=scores[i], score=float(np.mean(scores[i])))
+                trained = budget
+
+                if rung < len(budgets) - 1:
+                    alive.sort(key=lambda i: trials[i]["score"], reverse=True)
+                    keep = max(1, math.ceil(len(alive) / request.eta))
+                    for i in alive[keep:]:
+                        for seed in request.seeds:
+                            agents.pop((i, seed), None)
+                    alive = alive[:keep]
+                await self._save(sweep_id, trials, "running")
+            await self._save(sweep_id, trials, "finished")
+            logger.info(f"Sweep {sweep_id} finished, best: {best_trial(trials)}")
+        except asyncio.CancelledError:
+            await self._save(sweep_id, trials, "cancelled")
+            raise
+        except Exception as e:
+            logger.exception(f"Sweep {sweep_id} failed: {e}")
+            await self._save(sweep_id, trials, "failed", error=str(e))
+        finally:
+            self.running.pop(sweep_id, None)
+            self._stops.pop(sweep_id, None)
+
+    @staticmethod
+    async def _save(sweep_id: str, trials: List[dict], status: str, error: Optional[str] = None):
+        best = best_trial(trials)
+        async with database.get_session() as db:
+            await db.execute(
+                update(SweepRecord).where(SweepRecord.id == sweep_id).values(
+                    status=status,
+                    trials=[dict(t) for t in trials],
+                    best_params=best["params"] if best else None,
+                    best_score=best["score"] if best else None,
+                    error=error,
+                    finished_at=None if status == "running" else utcnow(),
+                )
+            )
+            await db.commit()
+
+    async def get(self, sweep_id: str, env_name: str, db: AsyncSession) -> SweepRecord:
+        """The sweep `sweep_id` of environment `env_name`."""
+        result = await db.execute(
+            select(SweepRecord).join(Environment, SweepRecord.environment_id == Environment.id)
+            .where(SweepRecord.id == sweep_id, Environment.name == env_name)
+        )
+        record = result.scalars().first()
+        if record is None:
+            raise ValueError(f"Sweep '{sweep_id}' not found for '{env_name}'.")
+        return record
+
+    async def cancel(self, sweep_id: str) -> bool:
+        task = self.running.get(sweep_id)
+        if task is None:
+            return False
+        stop = self._stops.get(sweep_id)
+        if stop is not None:
+            stop.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    async def shutdown(self):
+        for sweep_id in list(self.running):
+            await self.cancel(sweep_id)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+sweep_service = SweepService()
+RUNNING_SWEEPS.set_function(lambda: len(sweep_service.running))
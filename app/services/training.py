@@ -1,5 +1,9 @@
 import asyncio
-from typing import Dict, Optional
+import cProfile
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Optional
+from uuid import uuid4
 
 import gymnasium as gym
 from sqlalchemy import select, update
@@ -8,111 +12,538 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.environment import Environment
 from app.models.training import TrainingSession
 from app.utils.json import make_json_safe
+from app.utils.stats import EpisodeStats
 from app.utils.time import to_naive_utc, utcnow
+from app.core.config import Config
 from app.core.logging import get_logger
 from app.agents.agent_manager import AgentManager
 from app.agents.q_agent import QAgent
+from app.agents.replay_buffer import ReplayBuffer
 from app.db.session import database
+from app.tasks.celery_app import celery_app, request_stop
+from app.core.metrics import registry
+from app.services.environment import ENV_STEP_SECONDS, ENV_STEPS
+from app.services.checkpoints import Checkpoint, checkpoint_due, checkpoint_store
+from app.services.execution import execution_policy
+from app.services.job_registry import InMemoryJobRegistry, JobRegistry, job_registry, worker_id
+from app.services.progress import progress_broadcaster
+from app.services.scheduler import QUEUED_TRAININGS, QueuedJob, TrainingScheduler
+from app.services.snapshots import restore_snapshot, take_snapshot
+from app.services.state_persister import state_persister
 
 logger = get_logger("[TrainingManager]")
 
+ACTIVE_TRAININGS = registry.gauge(
+    "rlforge_active_trainings", "Training jobs currently running in this process"
+)
+EPISODE_SECONDS = registry.histogram(
+    "rlforge_training_episode_duration_seconds", "Wall-clock duration of training episodes", ["env_name"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+EPISODE_STEPS_PER_SECOND = registry.gauge(
+    "rlforge_training_steps_per_second", "Environment steps per second in the last finished episode", ["env_name"]
+)
+REPLAYED_TRANSITIONS = registry.counter(
+    "rlforge_training_replayed_transitions_total", "Transitions replayed from experience replay buffers"
+)
+
+
+TRAINING_BACKENDS = ("local", "celery")
+TRAIN_TASK = "rlforge.training.train"
+
+
+class TrainingStopped(Exception):
+    """Raised by an `on_step` hook to stop the episode, keeping what was learned like a cancel does."""
+
+
+@dataclass
+class TrainingJob:
+    """In-memory state of a running training episode."""
+    env_name: str
+    agent: QAgent
+    states: list = field(default_factory=list)
+    rewards: list = field(default_factory=list)
+    stats: EpisodeStats = field(default_factory=EpisodeStats)
+    # Set by the profiling service; enabled only around this job's own work
+    profiler: Optional[cProfile.Profile] = None
+    # Called after every step; raises TrainingStopped to stop the episode
+    on_step: Optional[Callable[["TrainingJob"], None]] = None
+    # perf_counter() and step count when the episode loop (re)started
+    started: Optional[float] = None
+    start_step: int = 0
+    # Set when continuing an interrupted episode
+    resume_from: Optional[Checkpoint] = None
+    # TrainingSession row already written for this episode, if any
+    session_id: Optional[str] = None
+    # Past transitions replayed between env steps; None when replay is disabled
+    replay: Optional[ReplayBuffer] = None
+
+    def progress(self) -> dict:
+        steps = self.stats.reward.count
+        elapsed = time.perf_counter() - self.started if self.started is not None else 0.0
+        return {
+            "env_name": self.env_name,
+            "steps": steps,
+            "total_reward": self.stats.reward.total,
+            "steps_per_second": round((steps - self.start_step) / elapsed, 2) if elapsed > 0 else 0.0,
+            "epsilon": self.agent.epsilon,
+        }
+
+
+def build_job(env_name: str, env_id: str, resume: bool = False):
+    """
+    Create the env and load (or initialise) the agent for a training episode.
+    With `resume`, continue from the env's latest checkpoint instead.
+    """
+    env = gym.make(env_id)
+    if resume:
+        checkpoint = checkpoint_store.load(env_name)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint to resume training of '{env_name}' from.")
+        if checkpoint.snapshot is None:
+            # The env couldn't be snapshotted: keep the agent, start a new episode
+            job = TrainingJob(env_name=env_name, agent=checkpoint.agent)
+        else:
+            job = TrainingJob(
+                env_name=env_name,
+                agent=checkpoint.agent,
+                states=checkpoint.states,
+                rewards=checkpoint.rewards,
+                stats=checkpoint.stats,
+                resume_from=checkpoint,
+                session_id=checkpoint.session_id,
+            )
+    else:
+        agent = AgentManager.load(env_name) or QAgent(state_size=env.observation_space.shape[0],
+                                                       action_size=env.action_space.n)
+        job = TrainingJob(env_name=env_name, agent=agent)
+    if Config.TRAINING_REPLAY_CAPACITY:
+        job.replay = ReplayBuffer(
+            Config.TRAINING_REPLAY_CAPACITY, job.agent.state_size,
+            prioritized=Config.TRAINING_REPLAY_PRIORITIZED,
+            alpha=Config.TRAINING_REPLAY_ALPHA, beta=Config.TRAINING_REPLAY_BETA,
+        )
+    return job, env
+
 
 class TrainingManager:
-    def __init__(self):
+    """
+    Starts, stops and reports on training episodes.
+
+    With the "local" backend episodes run as tasks in this process. With
+    "celery" they are sent to workers (app.tasks.training), which run the
+    same episode loop and write the TrainingSession row and agent
+    checkpoint.
+
+    Whichever process runs an episode holds its lease in the job registry
+    and heartbeats progress into it, so status, progress and stop work from
+    any API worker. A stop request is a flag on the lease that the owner
+    picks up on its next heartbeat.
+    """
+
+    def __init__(self, backend: str = Config.TRAINING_BACKEND, registry: JobRegistry = job_registry):
+        if backend not in TRAINING_BACKENDS:
+            raise ValueError(f"Unknown training backend '{backend}', expected one of {TRAINING_BACKENDS}.")
+        self.backend = backend
+        self.registry = registry
+        if backend == "celery" and isinstance(registry, InMemoryJobRegistry):
+            logger.warning("The celery backend needs a shared job registry; status and stop won't see workers' jobs")
         self.active_trainings: Dict[str, asyncio.Task] = {}
+        self.jobs: Dict[str, TrainingJob] = {}
+        # Admission control for the local backend; Celery workers bound their own concurrency
+        self.scheduler = TrainingScheduler(self._launch)
 
-    async def start_training(self, env_name: str, db: AsyncSession, max_steps: int = None):
-        if env_name in self.active_trainings:
+    async def start_training(
+        self, env_name: str, db: AsyncSession, max_steps: int = None,
+        user_id: Optional[str] = None, priority: int = 0, resume: bool = False
+    ) -> str:
+        """
+        Start training, or queue it when all slots are busy. Returns "running"
+        or "queued". Raises TrainingBacklogFullError when the queue is full.
+        With `resume` the episode continues from the latest checkpoint; on
+        the celery backend the worker looks for it, and fails the task if
+        there is none.
+        """
+        if self.scheduler.is_queued(env_name) or await self.is_training(env_name):
             raise ValueError(f"Environment '{env_name}' is already training.")
+        # Only the process that resumes can tell whether it sees a checkpoint
+        if resume and self.backend == "local" and not checkpoint_store.exists(env_name):
+            raise ValueError(f"No checkpoint to resume training of '{env_name}' from.")
 
         result = await db.execute(select(Environment).filter_by(name=env_name))
         env_obj = result.scalars().first()
         if not env_obj:
             raise ValueError(f"Environment '{env_name}' not found.")
 
-        env = gym.make(env_obj.env_id)
-        agent = AgentManager.load(env_name) or QAgent(state_size=env.observation_space.shape[0],
-                                                       action_size=env.action_space.n)
+        if self.backend == "celery":
+            # The lease is taken before sending so no other API worker can start it too
+            task_id = str(uuid4())
+            owner = celery_owner(task_id)
+            if not await self.registry.register(env_name, owner, Config.TRAINING_QUEUED_LEASE_SECONDS):
+                raise ValueError(f"Environment '{env_name}' is already training.")
+            try:
+                env_obj.is_training = True
+                await db.commit()
+                # Broker round-trip: keep it off the event loop
+                await asyncio.to_thread(
+                    celery_app.send_task, TRAIN_TASK, args=[env_name, max_steps, resume], task_id=task_id
+                )
+            except Exception:
+                await self.registry.release(env_name, owner)
+                raise
+            logger.info(f"Queued training for '{env_name}' as task {task_id}")
+            return "queued"
 
-        env_obj.is_training = True
-        await db.commit()
+        started = self.scheduler.submit(
+            QueuedJob(env_name=env_name, user_id=user_id, priority=priority, max_steps=max_steps, resume=resume)
+        )
+        return "running" if started else "queued"
+
+    def _launch(self, queued: QueuedJob):
+        """Scheduler callback: start an admitted job."""
+        task = asyncio.create_task(self._run_admitted(queued))
+        self.active_trainings[queued.env_name] = task
+
+    async def _run_admitted(self, queued: QueuedJob):
+        env_name = queued.env_name
+        owner = worker_id()
+        try:
+            if not await self.registry.register(env_name, owner, Config.TRAINING_LEASE_SECONDS):
+                logger.warning(f"Training of '{env_name}' was started by another worker meanwhile")
+                return
+            try:
+                async with database.get_session() as db:
+                    result = await db.execute(select(Environment).filter_by(name=env_name))
+                    env_obj = result.scalars().first()
+                    if not env_obj:
+                        logger.warning(f"Environment '{env_name}' was deleted before its training started")
+                        return
+                    job, env = build_job(env_name, env_obj.env_id, queued.resume)
+                    env_obj.is_training = True
+                    await db.commit()
+
+                self.jobs[env_name] = job
+                await self._train(job, env, owner, queued.max_steps)
+            finally:
+                await self.registry.release(env_name, owner)
+        finally:
+            self.active_trainings.pop(env_name, None)
+            self.jobs.pop(env_name, None)
+            self.scheduler.release(env_name)
 
-        task = asyncio.create_task(self._train(env_name, env, agent, db, max_steps))
-        self.active_trainings[env_name] = task
+    async def run_job(
+        self, env_name: str, max_steps: int = None,
+        on_step: Optional[Callable[[TrainingJob], None]] = None, owner: Optional[str] = None,
+        resume: bool = False
+    ) -> dict:
+        """Run one episode in this process and wait for it to finish; the Celery worker entry point."""
+        owner = owner or worker_id()
+        # Renews the lease the API took when it sent the task
+        if not await self.registry.register(env_name, owner, Config.TRAINING_LEASE_SECONDS):
+            raise ValueError(f"Environment '{env_name}' is already training elsewhere.")
+        try:
+            async with database.get_session(read_only=True) as db:
+                result = await db.execute(select(Environment.env_id).filter_by(name=env_name))
+                env_id = result.scalar()
+            if env_id is None:
+                raise ValueError(f"Environment '{env_name}' not found.")
 
-    async def _train(self, env_name, env, agent: QAgent, db: AsyncSession, max_steps: int = None):
+            job, env = build_job(env_name, env_id, resume)
+            job.on_step = on_step
+            self.jobs[env_name] = job
+            try:
+                await self._train(job, env, owner, max_steps)
+            finally:
+                self.jobs.pop(env_name, None)
+                env.close()
+        finally:
+            await self.registry.release(env_name, owner)
+        return job.progress()
+
+    async def _train(self, job: TrainingJob, env, owner: str, max_steps: int = None):
         """
         Internal asynchronous training loop.
         Records all observations, rewards, steps, and updates environment metadata.
+        Summary statistics are accumulated per step so they never need to be
+        recomputed from the stored trajectories.
         Supports optional maximum steps limit.
+
+        The episode runs alongside a heartbeat that keeps `owner`'s lease
+        alive; a stop request or a lost lease cancels the episode.
         """
-        observation, _ = env.reset()
+        episode = asyncio.create_task(self._run_episode(job, env, max_steps))
+        heartbeat = asyncio.create_task(self._heartbeat(job, owner, episode))
+        outcome = "failed"
+        try:
+            await episode
+            outcome = "finished"
+        except (asyncio.CancelledError, TrainingStopped):
+            outcome = "stopped"
+            raise
+        finally:
+            episode.cancel()
+            heartbeat.cancel()
+            progress_broadcaster.close(job.env_name, {"event": "end", "outcome": outcome, **job.progress()})
+
+    async def _heartbeat(self, job: TrainingJob, owner: str, episode: asyncio.Task):
+        env_name = job.env_name
+        while True:
+            await asyncio.sleep(Config.TRAINING_HEARTBEAT_SECONDS)
+            try:
+                stop = await self.registry.heartbeat(env_name, owner, Config.TRAINING_LEASE_SECONDS, job.progress())
+            except Exception as e:
+                # Keep training through a registry outage; the lease may lapse meanwhile
+                logger.warning(f"Heartbeat for '{env_name}' failed: {e}")
+                continue
+            if stop is None:
+                logger.warning(f"Lost the lease on '{env_name}'; abandoning the episode")
+            elif stop:
+                logger.info(f"Stop requested for '{env_name}'")
+            else:
+                continue
+            episode.cancel()
+            return
+
+    async def _run_episode(self, job: TrainingJob, env, max_steps: int = None):
+        env_name, agent = job.env_name, job.agent
+        states, rewards, stats = job.states, job.rewards, job.stats
+        resume = job.resume_from
+        if resume is not None and resume.snapshot is not None:
+            # Continue the interrupted episode exactly where it stopped
+            env.reset()
+            restore_snapshot(env, resume.snapshot)
+            observation = resume.observation
+            started_at = resume.started_at
+        else:
+            observation, _ = env.reset()
+            states.append(observation)
+            started_at = utcnow()
         done = False
-        steps = 0
-        states = [observation]
-        rewards = []
-        started_at = utcnow()
+        steps = job.start_step = len(rewards)
+        env_id = env.spec.id if env.spec else env_name
+        step_seconds = ENV_STEP_SECONDS.labels(env_id)
+        step_count = ENV_STEPS.labels(env_id, "training")
+        executor = execution_policy.executor_for(env_id)
+        loop = asyncio.get_running_loop()
+        stream_interval = Config.TRAINING_STREAM_INTERVAL_SECONDS
+        replay = job.replay
+        replay_batch, replay_every = Config.TRAINING_REPLAY_BATCH_SIZE, Config.TRAINING_REPLAY_EVERY_STEPS
+        episode_started = job.started = last_event = last_checkpoint_at = time.perf_counter()
+        last_checkpoint_step = steps
 
-        while not done:
-            action = agent.choose_action(observation)
-            next_obs, reward, terminated, truncated, _ = env.step(action)
+        try:
+            while not done:
+                profiler = job.profiler
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    action = agent.choose_action(observation)
+                    step_started = time.perf_counter()
+                    if executor is None:
+                        next_obs, reward, terminated, truncated, _ = env.step(action)
+                    else:
+                        # Other coroutines run during the await; keep them out of this job's profile
+                        if profiler is not None:
+                            profiler.disable()
+                        try:
+                            next_obs, reward, terminated, truncated, _ = await loop.run_in_executor(executor, env.step, action)
+                        finally:
+                            if profiler is not None:
+                                profiler.enable()
+                    step_seconds.observe(time.perf_counter() - step_started)
+                    step_count.inc()
 
-            agent.learn(observation, action, reward, next_obs, terminated)
-            observation = next_obs
+                    td_error = agent.learn(observation, action, reward, next_obs, terminated)
+                    stats.update(reward, td_error, agent.epsilon)
+                    if replay is not None:
+                        replay.add(agent.get_state_key(observation), action, reward, agent.get_state_key(next_obs), terminated)
+                        if len(replay) >= replay_batch and (steps + 1) % replay_every == 0:
+                            agent.replay(replay, replay_batch)
+                            REPLAYED_TRANSITIONS.inc(replay_batch)
+                    observation = next_obs
 
-            states.append(observation)
-            rewards.append(reward)
-            steps += 1
+                    states.append(observation)
+                    rewards.append(reward)
+                    steps += 1
+
+                    done = terminated or truncated
+                    if max_steps and steps >= max_steps:
+                        done = True
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+
+                if job.on_step is not None:
+                    job.on_step(job)
 
-            done = terminated or truncated
-            if max_steps and steps >= max_steps:
-                done = True
+                now = time.perf_counter()
+                if not done and checkpoint_due(steps - last_checkpoint_step, now - last_checkpoint_at):
+                    last_checkpoint_step, last_checkpoint_at = steps, now
+                    self._checkpoint(job, env, observation, started_at)
 
-            logger.info(f"[TRAIN] {env_name} Step={steps}, Reward={reward}, Done={done}")
-            await asyncio.sleep(0)
+                if progress_broadcaster.has_subscribers(env_name) and now - last_event >= stream_interval:
+                    last_event = now
+                    progress_broadcaster.publish(env_name, {"event": "progress", **job.progress()})
+
+                logger.info(f"[TRAIN] {env_name} Step={steps}, Reward={reward}, Done={done}")
+                await asyncio.sleep(0)
+        except (asyncio.CancelledError, TrainingStopped):
+            # Keep what was learned: a partial session, the agent and a checkpoint to resume from
+            logger.info(f"[TRAIN] {env_name} interrupted at step {steps}")
+            await self._save_session(job, started_at, utcnow(), final=False)
+            AgentManager.save(env_name, agent)
+            await checkpoint_store.flush(env_name)
+            write = self._checkpoint(job, env, observation, started_at)
+            if write is not None:
+                await write
+            raise
 
         ended_at = utcnow()
+        duration = time.perf_counter() - episode_started
+        EPISODE_SECONDS.labels(env_name).observe(duration)
+        EPISODE_STEPS_PER_SECOND.labels(env_name).set((steps - job.start_step) / duration if duration > 0 else 0.0)
         logger.info(f"[TRAIN] ended at: {ended_at}")
+        await self._save_session(job, started_at, ended_at, final=True)
+        AgentManager.save(env_name, agent)
+        await checkpoint_store.delete(env_name)
+
+    @staticmethod
+    def _checkpoint(job: TrainingJob, env, observation, started_at) -> Optional[asyncio.Future]:
+        try:
+            snapshot = take_snapshot(env)
+        except ValueError:
+            snapshot = None
+        return checkpoint_store.save(Checkpoint(
+            env_name=job.env_name,
+            agent=job.agent,
+            observation=observation,
+            states=job.states,
+            rewards=job.rewards,
+            stats=job.stats,
+            snapshot=snapshot,
+            started_at=started_at,
+            session_id=job.session_id,
+        ))
+
+    @staticmethod
+    async def _save_session(job: TrainingJob, started_at, ended_at, final: bool):
+        """
+        Write the episode's TrainingSession. An interrupted episode gets a
+        partial row, which is completed in place if the episode is resumed.
+        """
+        env_name, states = job.env_name, job.states
         async with database.get_session() as db:
             try:
-                logger.info(f"[TRAIN][DB] Saving TrainingSession with {steps} steps, total reward={sum(rewards)}")
+                summary = job.stats.as_columns()
+                logger.info(f"[TRAIN][DB] Saving TrainingSession with {summary['steps']} steps, total reward={summary['total_reward']}")
 
                 result = await db.execute(select(Environment).filter_by(name=env_name))
                 env_obj = result.scalars().first()
-                env_obj.is_training = False
+                if final:
+                    env_obj.is_training = False
                 env_obj.last_trained_at = make_json_safe(ended_at)
                 env_obj.state = make_json_safe(states[-1]) if states else None
+                # Don't let an older pending reset state overwrite this one
+                state_persister.discard(env_name)
 
-                session = TrainingSession(
-                    environment_id=env_obj.id,
-                    started_at=to_naive_utc(started_at),
-                    ended_at=to_naive_utc(ended_at),
-                    observations=make_json_safe(states),
-                    rewards=make_json_safe(rewards),
-                    steps=int(steps),
-                    total_reward=float(sum(rewards))
-                )
-
+                session = await db.get(TrainingSession, job.session_id) if job.session_id else None
+                if session is None:
+                    session = TrainingSession(environment_id=env_obj.id)
+                    db.add(session)
+                session.started_at = to_naive_utc(started_at)
+                session.ended_at = to_naive_utc(ended_at)
+                session.observations = make_json_safe(states)
+                session.rewards = make_json_safe(job.rewards)
+                for column, value in summary.items():
+                    setattr(session, column, value)
 
-                db.add(session)
                 logger.debug(f"[DB] Committing session with dirty={db.dirty}, new={db.new}")
                 await db.commit()
+                job.session_id = session.id
             except Exception as e:
                 logger.exception(f"[TRAIN][DB] Error saving TrainingSession: {e}")
                 await db.rollback()
 
-        AgentManager.save(env_name, agent)
-        self.active_trainings.pop(env_name, None)
+    async def is_training(self, env_name: str) -> bool:
+        return env_name in self.active_trainings or await self.registry.get(env_name) is not None
 
-    def is_training(self, env_name: str) -> bool:
-        return env_name in self.active_trainings
+    async def status(self, env_name: str) -> dict:
+        queued = self.scheduler.status(env_name)
+        lease = await self.registry.get(env_name)
+        if queued is not None:
+            state = "queued"
+        elif lease is None and env_name not in self.active_trainings:
+            state = "idle"
+        elif lease is not None and lease.stop_requested:
+            state = "stopping"
+        elif lease is not None and is_celery_owner(lease.owner) and lease.progress is None:
+            # Sent to Celery but no worker has reported yet
+            state = "queued"
+        else:
+            state = "running"
+        return {
+            "env_name": env_name,
+            "state": state,
+            "is_training": state in ("running", "stopping"),
+            "queue": queued,
+            "worker": lease.owner if lease is not None else None,
+            "progress": self._progress(env_name, lease),
+        }
 
+    async def progress(self, env_name: str) -> Optional[dict]:
+        """Steps and reward so far of a running episode, or None."""
+        return self._progress(env_name, await self.registry.get(env_name))
+
+    def _progress(self, env_name: str, lease) -> Optional[dict]:
+        job = self.jobs.get(env_name)
+        if job is not None:
+            return job.progress()
+        # Running elsewhere: as of its last heartbeat
+        return lease.progress if lease is not None else None
+
+    async def watch(self, env_name: str) -> AsyncIterator[Optional[dict]]:
+        """
+        Progress events for `env_name` until its job ends, the last one being
+        an "end" event. Jobs in this process stream through the broadcaster;
+        jobs on other workers are followed through their heartbeats. Yields
+        None while there is nothing new, so callers can send keep-alives.
+        """
+        subscription = progress_broadcaster.subscribe(env_name)
+        last_heartbeat = None
+        try:
+            while True:
+                event = await subscription.get(timeout=Config.TRAINING_HEARTBEAT_SECONDS)
+                if event is not None:
+                    yield event
+                    if event["event"] == "end":
+                        return
+                    continue
+                if env_name in self.active_trainings or self.scheduler.is_queued(env_name):
+                    yield None
+                    continue
+                lease = await self.registry.get(env_name)
+                if lease is None:
+                    # Ended before we subscribed, or on a worker that has since gone
+                    yield {"event": "end", "env_name": env_name, "outcome": "ended"}
+                    return
+                if lease.progress is not None and lease.heartbeat_at != last_heartbeat:
+                    last_heartbeat = lease.heartbeat_at
+                    yield {"event": "progress", **lease.progress}
+                else:
+                    yield None
+        finally:
+            progress_broadcaster.unsubscribe(subscription)
 
     async def stop_training(self, env_name: str, db: AsyncSession):
         """
         Stop training early for a given environment.
         Cancels the associated task and updates environment state.
+        Jobs running on other workers are flagged and stop on their next heartbeat.
         """
+        if self.scheduler.cancel(env_name):
+            progress_broadcaster.close(env_name, {"event": "end", "env_name": env_name, "outcome": "cancelled"})
+            return {"message": f"Queued training for '{env_name}' cancelled"}
+
         task = self.active_trainings.get(env_name)
         if task:
             task.cancel()
@@ -120,9 +551,65 @@ class TrainingManager:
                 await task
             except asyncio.CancelledError:
                 logger.info(f"Training task for '{env_name}' cancelled successfully.")
-            # Mark environment as not training
-            await db.execute(update(Environment).where(Environment.name == env_name)
-                             .values(is_training=False))
-            await db.commit()
+        else:
+            lease = await self.registry.get(env_name)
+            if lease is None:
+                return {"error": f"No active training for '{env_name}'"}
+            await self.registry.request_stop(env_name)
+            if is_celery_owner(lease.owner):
+                # The worker also polls the result backend flag, and the revoke keeps
+                # a task still in the broker from starting. The lease stays until the
+                # worker stops and releases it, or it expires: a new job could
+                # otherwise start while this one still writes the agent.
+                await asyncio.to_thread(request_stop, lease.owner.split(":", 1)[1])
+        # Mark environment as not training
+        await db.execute(update(Environment).where(Environment.name == env_name)
+                         .values(is_training=False))
+        await db.commit()
+        if task:
             return {"message": f"Training stopped for '{env_name}'"}
-        return {"error": f"No active training for '{env_name}'"}
+        return {"message": f"Stop requested for '{env_name}'", "worker": lease.owner}
+
+    async def shutdown(self):
+        """
+        Stop the episodes running in this process before their executors and
+        the database go away; each saves a partial session and a checkpoint.
+        Queued jobs are dropped first so none is started in their place.
+        """
+        for queued in self.scheduler.order():
+            self.scheduler.cancel(queued.env_name)
+        tasks = list(self.active_trainings.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def reap_stale(self) -> int:
+        """
+        Clear `Environment.is_training` for environments with no live lease,
+        e.g. after the worker running them crashed. Returns how many were reset.
+        """
+        async with database.get_session() as db:
+            result = await db.execute(select(Environment.name).where(Environment.is_training.is_(True)))
+            stale = [
+                name for name in result.scalars().all()
+                if name not in self.active_trainings and await self.registry.get(name) is None
+            ]
+            if not stale:
+                return 0
+            await db.execute(update(Environment).where(Environment.name.in_(stale)).values(is_training=False))
+            await db.commit()
+        logger.warning(f"Reset is_training for {len(stale)} environments without a live job: {stale}")
+        return len(stale)
+
+
+def celery_owner(task_id: str) -> str:
+    return f"celery:{task_id}"
+
+
+def is_celery_owner(owner: str) -> bool:
+    return owner.startswith("celery:")
+
+
+training_manager = TrainingManager()
+ACTIVE_TRAININGS.set_function(lambda: len(training_manager.active_trainings))
+QUEUED_TRAININGS.set_function(lambda: len(training_manager.scheduler))
@@ -7,12 +7,13 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from app.core.enums import TokenType, UserRole
-from app.db.session import get_db_session
+from app.db.session import get_read_db_session
 from app.exceptions.custom_error import InvalidCredentialsError, InvalidTokenError, UserAlreadyExistsError
 from app.models.user import User
 from app.core.security import security, oauth2_schema
 from app.schemas.token import TokenDetails
 from app.schemas.user import UserCreate, UserLogin
+from app.middleware.timing import timed_phase
 
 
 class UserService:
@@ -64,7 +65,7 @@ class UserService:
 
     async def get_current_user(
         self,
-        session: AsyncSession = Depends(get_db_session),
+        session: AsyncSession = Depends(get_read_db_session),
         token: HTTPAuthorizationCredentials = Depends(oauth2_schema)
     ) -> User:
         """
@@ -77,7 +78,8 @@ class UserService:
         user_id = payload.get("sub")
         if not user_id:
             raise InvalidTokenError("Invalid token payload.")
-        user = await self.get_user_by_id(UUID(user_id), session)
+        with timed_phase("user"):
+            user = await self.get_user_by_id(UUID(user_id), session)
         if not user:
             raise InvalidTokenError("User not found for the provided token.")
         print(user)
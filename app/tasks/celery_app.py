@@ -0,0 +1,40 @@
+from celery import Celery
+
+from app.core.config import Config
+
+celery_app = Celery(
+    "rlforge",
+    broker=Config.CELERY_BROKER_URL or Config.REDIS_URL,
+    backend=Config.CELERY_RESULT_BACKEND or Config.REDIS_URL,
+    include=["app.tasks.training"],
+)
+celery_app.conf.update(
+    broker_transport_options=Config.CELERY_BROKER_TRANSPORT_OPTIONS,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    # Episodes are long; don't let one worker reserve several of them
+    worker_prefetch_multiplier=1,
+)
+
+
+def _stop_key(task_id: str) -> bytes:
+    return f"rlforge-training-stop-{task_id}".encode()
+
+
+def request_stop(task_id: str):
+    """
+    Ask a training task to stop. The revoke keeps it from starting if it is
+    still queued; a running task polls the flag in the result backend, since
+    revokes never reach the pool process that is executing it.
+
+    Both are blocking broker/backend round-trips; async callers run this in
+    a thread.
+    """
+    celery_app.control.revoke(task_id)
+    celery_app.backend.set(_stop_key(task_id), "1")
+
+
+def stop_requested(task_id: str) -> bool:
+    return celery_app.backend.get(_stop_key(task_id)) is not None
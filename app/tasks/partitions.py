@@ -0,0 +1,105 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.db.session import database
+
+logger = get_logger(__name__)
+
+TABLE = "training_sessions"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_{month:%Y_%m}"
+
+
+class TrainingSessionPartitions:
+    """
+    Keeps monthly partitions of `training_sessions` ahead of time.
+
+    Only applies on PostgreSQL once the table was partitioned by the
+    b3f5c8e2d917 migration; otherwise it does nothing. Rows that reached the
+    DEFAULT partition for a month that had no partition yet are moved into
+    the new one: the DEFAULT partition is detached while the partition is
+    created and re-attached in the same transaction.
+    """
+
+    def __init__(self, months_ahead: int = Config.TRAINING_PARTITIONS_MONTHS_AHEAD, lock_timeout_ms: int = 5000):
+        self.months_ahead = months_ahead
+        self.lock_timeout_ms = lock_timeout_ms
+
+    async def _is_partitioned(self, db) -> bool:
+        if db.bind.dialect.name != "postgresql":
+            return False
+        result = await db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table)"
+        ), {"table": TABLE})
+        return bool(result.scalar())
+
+    async def _create(self, month: date) -> Optional[int]:
+        """
+        Create the partition of `month`. Returns how many rows moved out of
+        DEFAULT, or None if another worker created it first.
+        """
+        name, upper = partition_name(month), add_months(month, 1)
+        bounds = f"FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        in_range = "started_at >= :lower AND started_at < :upper"
+        params = {"lower": month, "upper": upper}
+        async with database.get_session() as db:
+            await db.execute(text(f"SET LOCAL lock_timeout = '{int(self.lock_timeout_ms)}ms'"))
+            # Every API worker runs this task: one at a time, and only the first creates it
+            await db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": TABLE})
+            if (await db.execute(text("SELECT to_regclass(:name)"), {"name": name})).scalar() is not None:
+                return None
+            default_rows = (await db.execute(
+                text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_range}"), params
+            )).scalar()
+            if not default_rows:
+                await db.execute(text(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES {bounds}"))
+            else:
+                # Creating it while DEFAULT holds rows in its range would fail
+                await db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+                await db.execute(text(f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES {bounds}"))
+                await db.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), params)
+                await db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), params)
+                await db.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+            await db.commit()
+        return default_rows
+
+    async def run_once(self) -> dict:
+        """Create any missing partition from this month to `months_ahead` months ahead."""
+        async with database.get_session(read_only=True) as db:
+            if not await self._is_partitioned(db):
+                return {"partitioned": False, "created": []}
+            result = await db.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table"
+            ), {"table": TABLE})
+            existing = set(result.scalars().all())
+
+        created = []
+        this_month = date.today().replace(day=1)
+        for offset in range(self.months_ahead + 1):
+            month = add_months(this_month, offset)
+            if partition_name(month) in existing:
+                continue
+            moved = await self._create(month)
+            if moved is None:
+                continue
+            created.append(partition_name(month))
+            logger.info(f"[PARTITIONS] Created {partition_name(month)}, moved {moved} rows out of {DEFAULT_PARTITION}")
+        return {"partitioned": True, "created": created}
+
+
+training_session_partitions = TrainingSessionPartitions()
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async callable every `interval` seconds inside the app's event loop.
+    Errors are logged and the loop keeps going; `stop()` cancels the task.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable], run_on_start: bool = False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_on_start = run_on_start
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=self.name)
+            logger.info(f"Periodic task '{self.name}' started (every {self.interval}s)")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"Periodic task '{self.name}' stopped")
+
+    async def _run(self):
+        if not self.run_on_start:
+            await asyncio.sleep(self.interval)
+        while True:
+            try:
+                await self.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Periodic task '{self.name}' failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,121 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from sqlalchemy import select, text, update
+
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.db.session import database
+from app.models.training import TrainingSession
+from app.utils.downsample import lttb_indices
+from app.utils.time import to_naive_utc, utcnow
+
+logger = get_logger(__name__)
+
+RETENTION_MODES = ("downsample", "summary")
+
+
+def _json_size(value) -> int:
+    return len(json.dumps(value)) if value is not None else 0
+
+
+class TrajectoryRetention:
+    """
+    Compacts trajectories of old training sessions.
+
+    Sessions older than `max_age_days` keep their summary columns, while their
+    `observations`/`rewards` arrays are either downsampled to `points` entries
+    ("downsample") or dropped altogether ("summary"). Work is done in batches of
+    `batch_size` rows, each in its own short transaction, so row locks are only
+    held for a single batch.
+    """
+
+    def __init__(
+        self,
+        max_age_days: int = Config.TRAJECTORY_RETENTION_DAYS,
+        mode: str = Config.TRAJECTORY_RETENTION_MODE,
+        points: int = Config.TRAJECTORY_RETENTION_POINTS,
+        batch_size: int = Config.TRAJECTORY_RETENTION_BATCH_SIZE,
+        lock_timeout_ms: int = 2000,
+    ):
+        if mode not in RETENTION_MODES:
+            raise ValueError(f"Unknown retention mode '{mode}', expected one of {RETENTION_MODES}.")
+        self.max_age_days = max_age_days
+        self.mode = mode
+        self.points = points
+        self.batch_size = batch_size
+        self.lock_timeout_ms = lock_timeout_ms
+
+    def compact(self, observations, rewards):
+        """Return the compacted (observations, rewards) pair."""
+        if self.mode == "summary" or not rewards:
+            return None, None
+
+        keep = lttb_indices(range(len(rewards)), rewards, self.points)
+        rewards = [rewards[i] for i in keep]
+        if observations:
+            observations = [observations[i] for i in keep if i < len(observations)]
+        return observations, rewards
+
+    async def _compact_batch(self, cutoff) -> tuple[int, int]:
+        async with database.get_session() as db:
+            if db.bind.dialect.name == "postgresql":
+                await db.execute(text(f"SET LOCAL lock_timeout = '{int(self.lock_timeout_ms)}ms'"))
+
+            result = await db.execute(
+                select(TrainingSession.id, TrainingSession.observations, TrainingSession.rewards)
+                .where(TrainingSession.started_at < cutoff, TrainingSession.compacted_at.is_(None))
+                .order_by(TrainingSession.started_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.all()
+            if not rows:
+                return 0, 0
+
+            compacted_at = to_naive_utc(utcnow())
+            reclaimed = 0
+            updates = []
+            for row in rows:
+                observations, rewards = self.compact(row.observations, row.rewards)
+                reclaimed += (
+                    _json_size(row.observations) + _json_size(row.rewards)
+                    - _json_size(observations) - _json_size(rewards)
+                )
+                updates.append({
+                    "id": row.id,
+                    "observations": observations,
+                    "rewards": rewards,
+                    "compacted_at": compacted_at,
+                })
+
+            await db.execute(update(TrainingSession), updates)
+            await db.commit()
+            return len(rows), reclaimed
+
+    async def run_once(self) -> dict:
+        """Compact every eligible session and report what was reclaimed."""
+        cutoff = to_naive_utc(utcnow() - timedelta(days=self.max_age_days))
+        sessions = 0
+        reclaimed = 0
+
+        while True:
+            count, freed = await self._compact_batch(cutoff)
+            sessions += count
+            reclaimed += freed
+            if count < self.batch_size:
+                break
+            # Give request handlers a chance to run between batches
+            await asyncio.sleep(0)
+
+        report = {"mode": self.mode, "sessions_compacted": sessions, "reclaimed_bytes": reclaimed}
+        if sessions:
+            logger.info(
+                f"[RETENTION] Compacted {sessions} sessions older than {self.max_age_days} days "
+                f"({self.mode}), reclaimed ~{reclaimed} bytes"
+            )
+        return report
+
+
+trajectory_retention = TrajectoryRetention()
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Optional
+
+from celery.worker import state as worker_state
+from sqlalchemy import update
+
+from app.core.config import Config
+from app.core.logging import get_logger
+from app.db.session import database
+from app.models.environment import Environment
+from app.services.job_registry import job_registry
+from app.services.training import TRAIN_TASK, TrainingJob, TrainingStopped, celery_owner, training_manager
+from app.tasks.celery_app import celery_app, stop_requested
+
+logger = get_logger(__name__)
+
+
+def _step_reporter(task, interval: float = Config.TRAINING_PROGRESS_INTERVAL_SECONDS):
+    """
+    Per-step hook for the episode loop. At most every `interval` seconds it
+    publishes progress to the result backend and checks for a stop request,
+    aborting the episode if there is one.
+    """
+    task_id = task.request.id
+    last_report = 0.0
+
+    def on_step(job: TrainingJob):
+        nonlocal last_report
+        now = time.monotonic()
+        if now - last_report < interval:
+            return
+        last_report = now
+        if task_id in worker_state.revoked or stop_requested(task_id):
+            raise TrainingStopped()
+        task.update_state(state="PROGRESS", meta=job.progress())
+
+    return on_step
+
+
+async def _mark_not_training(env_name: str):
+    async with database.get_session() as db:
+        await db.execute(update(Environment).where(Environment.name == env_name).values(is_training=False))
+        await db.commit()
+
+
+async def _train(task, env_name: str, max_steps: Optional[int], resume: bool) -> dict:
+    try:
+        try:
+            return await training_manager.run_job(
+                env_name, max_steps, on_step=_step_reporter(task), owner=celery_owner(task.request.id),
+                resume=resume,
+            )
+        except (TrainingStopped, asyncio.CancelledError):
+            # CancelledError: the heartbeat saw a stop request or lost the lease
+            logger.info(f"Training of '{env_name}' stopped by request")
+            await _mark_not_training(env_name)
+            return {"env_name": env_name, "stopped": True}
+        except Exception:
+            await _mark_not_training(env_name)
+            raise
+    finally:
+        # Each task runs in its own event loop; pools can't outlive it
+        await job_registry.close()
+        await database.dispose()
+
+
+@celery_app.task(bind=True, name=TRAIN_TASK)
+def train(self, env_name: str, max_steps: Optional[int] = None, resume: bool = False) -> dict:
+    """Run one training episode for `env_name` on this worker."""
+    return asyncio.run(_train(self, env_name, max_steps, resume))
@@ -0,0 +1,75 @@
+# app/utils/stats.py
+import math
+
+
+class RunningStats:
+    """Welford's online mean/variance with min/max, O(1) per update."""
+
+    __slots__ = ("count", "total", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float):
+        value = float(value)
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class EpisodeStats:
+    """
+    Summary statistics for a single training episode, updated once per step.
+    Mirrors the summary columns stored on TrainingSession.
+    """
+
+    __slots__ = ("reward", "td_error", "epsilon")
+
+    def __init__(self):
+        self.reward = RunningStats()
+        self.td_error = RunningStats()
+        self.epsilon = None
+
+    def update(self, reward: float, td_error: float, epsilon: float):
+        self.reward.update(reward)
+        self.td_error.update(abs(td_error))
+        self.epsilon = float(epsilon)
+
+    @property
+    def steps(self) -> int:
+        return self.reward.count
+
+    def as_columns(self) -> dict:
+        """Column values for TrainingSession."""
+        if not self.steps:
+            return {"steps": 0, "total_reward": 0.0, "epsilon": self.epsilon}
+        return {
+            "steps": self.steps,
+            "total_reward": self.reward.total,
+            "reward_mean": self.reward.mean,
+            "reward_std": self.reward.std,
+            "reward_min": self.reward.min,
+            "reward_max": self.reward.max,
+            "td_error_mean": self.td_error.mean,
+            "td_error_max": self.td_error.max,
+            "epsilon": self.epsilon,
+        }
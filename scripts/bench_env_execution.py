@@ -0,0 +1,149 @@
+"""
+Benchmark for the env.step() execution policy (inline vs thread pool).
+
+Steps `--envs` CartPole environments through their actors from `--clients`
+concurrent clients. Each step is padded with `--work-us` microseconds of
+GIL-releasing native work (hashing), which stands in for heavy simulators
+such as Box2D. Every combination runs once inline on the event loop and once
+in a thread pool. The script reports step throughput, step latency and event
+loop lag, the delay any other request would have seen.
+
+Usage:
+    python -m scripts.bench_env_execution
+    python -m scripts.bench_env_execution --work-us 0 20 100 500 2000 --envs 8 --threads 8
+
+Inline wins while the step is cheap, because the pool hop costs a few tens
+of microseconds. The script reports two crossovers: the first work size
+where the pool keeps event loop lag lower than inline, and the first where
+it also matches inline throughput (this one needs free cores). Set
+ENV_EXECUTION_POLICY to "thread" for env_ids whose step costs more than that.
+"""
+import argparse
+import asyncio
+import hashlib
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gymnasium as gym
+
+from app.services.env_actor import EnvActor
+
+
+class NativeWork(gym.Wrapper):
+    """Adds a fixed amount of GIL-releasing work to every step."""
+
+    def __init__(self, env: gym.Env, payload: bytes):
+        super().__init__(env)
+        self.payload = payload
+
+    def step(self, action):
+        if self.payload:
+            hashlib.sha256(self.payload).digest()
+        return self.env.step(action)
+
+
+def payload_for(work_us: float) -> bytes:
+    """Calibrate a payload whose sha256 takes about `work_us` microseconds."""
+    if work_us <= 0:
+        return b""
+    probe = b"x" * (1 << 20)
+    started = time.perf_counter()
+    for _ in range(20):
+        hashlib.sha256(probe).digest()
+    bytes_per_us = len(probe) * 20 / ((time.perf_counter() - started) * 1e6)
+    # hashlib only releases the GIL for inputs over 2 KiB
+    return b"x" * max(int(bytes_per_us * work_us), 4096)
+
+
+def step_command(env):
+    observation, reward, terminated, truncated, info = env.step(env.action_space.sample())
+    if terminated or truncated:
+        env.reset()
+    return reward
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> list:
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+    return lags
+
+
+async def run(work_us: float, mode: str, args) -> dict:
+    payload = payload_for(work_us)
+    executor = ThreadPoolExecutor(max_workers=args.threads) if mode == "thread" else None
+    actors = []
+    for i in range(args.envs):
+        env = NativeWork(gym.make("CartPole-v1"), payload)
+        env.reset(seed=i)
+        # Without an executor the actor follows the policy, which runs CartPole inline
+        actors.append(EnvActor(f"bench-{i}", env, executor=executor))
+
+    latencies = []
+
+    async def client(i: int):
+        actor = actors[i % len(actors)]
+        for _ in range(args.steps):
+            started = time.perf_counter()
+            await actor.submit(step_command)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = await lag_task
+
+    for actor in actors:
+        actor.stop()
+    await asyncio.gather(*(actor.wait_closed() for actor in actors))
+    if executor is not None:
+        executor.shutdown()
+
+    latencies.sort()
+    return {
+        "steps_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "lag_p99_ms": sorted(lags)[int(len(lags) * 0.99) - 1] * 1000 if len(lags) > 1 else 0.0,
+    }
+
+
+async def main(args):
+    print(f"{args.envs} envs, {args.clients} clients x {args.steps} steps, {args.threads} threads\n")
+    print(f"{'work_us':>8} {'mode':>7} {'steps/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'lag p99 ms':>11}")
+    throughput_crossover = lag_crossover = None
+    for work_us in args.work_us:
+        results = {}
+        for mode in ("inline", "thread"):
+            results[mode] = r = await run(work_us, mode, args)
+            print(f"{work_us:>8} {mode:>7} {r['steps_per_s']:>10.0f} {r['p50_ms']:>8.3f} "
+                  f"{r['p95_ms']:>8.3f} {r['lag_p99_ms']:>11.3f}")
+        inline, thread = results["inline"], results["thread"]
+        if throughput_crossover is None and thread["steps_per_s"] >= inline["steps_per_s"]:
+            throughput_crossover = work_us
+        if lag_crossover is None and thread["lag_p99_ms"] < inline["lag_p99_ms"]:
+            lag_crossover = work_us
+
+    print()
+    for label, crossover in (("throughput", throughput_crossover), ("event loop lag", lag_crossover)):
+        if crossover is None:
+            print(f"{label}: inline was better at every work size tested")
+        else:
+            print(f"{label}: thread pool wins from ~{crossover:g}us of native work per step")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--work-us", type=float, nargs="+", default=[0, 10, 50, 100, 500, 1000, 5000],
+                        help="Native work added per step, in microseconds")
+    parser.add_argument("--envs", type=int, default=4, help="Live environments")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--steps", type=int, default=500, help="Steps per client")
+    parser.add_argument("--threads", type=int, default=4, help="Thread pool size")
+    asyncio.run(main(parser.parse_args()))
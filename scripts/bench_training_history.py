@@ -0,0 +1,156 @@
+"""
+Benchmark for the training history query at scale.
+
+Seeds `--sessions` training sessions spread over `--environments`
+environments and measures the latency of the same query used by
+GET /training/{env_name}/history.
+
+Usage:
+    python -m scripts.bench_training_history --sessions 1000000 --environments 50
+    python -m scripts.bench_training_history --skip-seed --iterations 200
+
+Run it before and after `alembic upgrade head` to compare the sequential
+scan against the (environment_id, started_at) index.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select, text
+
+from app.db.session import database
+from app.db.utils import create_tables
+from app.models.environment import Environment
+from app.models.training import TrainingSession
+from app.models.user import User
+from app.utils.time import to_naive_utc, utcnow
+
+BENCH_PREFIX = "bench-"
+
+
+async def seed(sessions: int, environments: int, batch_size: int, trajectory_len: int):
+    await create_tables()
+
+    async with database.get_session() as db:
+        user = User(email=f"{BENCH_PREFIX}{uuid.uuid4().hex[:8]}@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+
+        env_ids = []
+        for i in range(environments):
+            env = Environment(name=f"{BENCH_PREFIX}{i}", env_id=f"{BENCH_PREFIX}{i}-v0", user_id=user.id)
+            db.add(env)
+            await db.flush()
+            env_ids.append(env.id)
+        await db.commit()
+
+    rewards = [1.0] * trajectory_len
+    observations = [[0.0, 0.0, 0.0, 0.0]] * (trajectory_len + 1)
+    start = to_naive_utc(utcnow() - timedelta(days=365))
+
+    started = time.perf_counter()
+    for offset in range(0, sessions, batch_size):
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "environment_id": env_ids[i % environments],
+                "started_at": start + timedelta(seconds=i * 30),
+                "ended_at": start + timedelta(seconds=i * 30 + 5),
+                "observations": observations,
+                "rewards": rewards,
+                "steps": trajectory_len,
+                "total_reward": float(trajectory_len),
+            }
+            for i in range(offset, min(offset + batch_size, sessions))
+        ]
+        async with database.get_session() as db:
+            await db.execute(insert(TrainingSession), rows)
+            await db.commit()
+        print(f"seeded {offset + len(rows)}/{sessions}", end="\r", flush=True)
+
+    print(f"\nseeded {sessions} sessions in {time.perf_counter() - started:.1f}s")
+
+    if database.create_engine().dialect.name == "postgresql":
+        async with database.get_session() as db:
+            await db.execute(text("ANALYZE training_sessions"))
+            await db.commit()
+
+
+async def measure(iterations: int, limit: int | None):
+    async with database.get_session() as db:
+        result = await db.execute(
+            select(Environment.id, Environment.name).where(Environment.name.startswith(BENCH_PREFIX))
+        )
+        envs = result.all()
+    if not envs:
+        raise SystemExit("No benchmark environments found, run without --skip-seed first.")
+
+    latencies = []
+    rows = 0
+    for i in range(iterations):
+        env_id, _ = envs[i % len(envs)]
+        query = (
+            select(TrainingSession)
+            .filter_by(environment_id=env_id)
+            .order_by(TrainingSession.started_at)
+        )
+        if limit:
+            query = query.limit(limit)
+
+        started = time.perf_counter()
+        async with database.get_session() as db:
+            result = await db.execute(query)
+            rows = len(result.scalars().all())
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    print(f"history query over {iterations} iterations ({rows} rows/query)")
+    print(f"  p50={statistics.median(latencies):.2f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1]:.2f}ms "
+          f"max={latencies[-1]:.2f}ms")
+
+    if database.create_engine().dialect.name == "postgresql":
+        async with database.get_session() as db:
+            plan = await db.execute(
+                text("EXPLAIN ANALYZE SELECT * FROM training_sessions "
+                     "WHERE environment_id = :env_id ORDER BY started_at"),
+                {"env_id": envs[0][0]},
+            )
+            print("\n".join(row[0] for row in plan))
+
+
+async def cleanup():
+    async with database.get_session() as db:
+        env_ids = select(Environment.id).where(Environment.name.startswith(BENCH_PREFIX))
+        await db.execute(delete(TrainingSession).where(TrainingSession.environment_id.in_(env_ids)))
+        await db.execute(delete(Environment).where(Environment.name.startswith(BENCH_PREFIX)))
+        await db.execute(delete(User).where(User.email.startswith(BENCH_PREFIX)))
+        await db.commit()
+
+
+async def main(args):
+    try:
+        if args.cleanup:
+            await cleanup()
+            return
+        if not args.skip_seed:
+            await seed(args.sessions, args.environments, args.batch_size, args.trajectory_len)
+        await measure(args.iterations, args.limit)
+    finally:
+        await database.create_engine().dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--environments", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--trajectory-len", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=None, help="Optional LIMIT on the history query")
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true", help="Delete benchmark rows and exit")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,72 @@
+import uuid
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from app.db.session import database
+from app.models import Environment, User
+
+
+def new_user() -> User:
+    return User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+
+
+async def delete_user(user_id: str):
+    async with database.get_session() as db:
+        user = await db.get(User, user_id)
+        if user is not None:
+            await db.delete(user)
+
+
+@pytest.mark.asyncio
+async def test_session_commits_pending_changes():
+    async with database.get_session() as db:
+        # No connection is checked out until the session is used
+        assert not db.materialized
+        user = new_user()
+        db.add(user)
+        assert db.materialized
+
+    try:
+        async with database.get_session(read_only=True) as db:
+            assert await db.get(User, user.id) is not None
+    finally:
+        await delete_user(user.id)
+
+
+@pytest.mark.asyncio
+async def test_session_rolls_back_on_error():
+    user = new_user()
+    with pytest.raises(RuntimeError):
+        async with database.get_session() as db:
+            db.add(user)
+            await db.flush()
+            raise RuntimeError("boom")
+
+    async with database.get_session(read_only=True) as db:
+        assert await db.get(User, user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_detaches_results():
+    user = new_user()
+    env = Environment(name="LazyEnv", env_id="CartPole-v1", owner=user)
+    async with database.get_session() as db:
+        db.add(env)
+
+    try:
+        async with database.get_session(read_only=True) as db:
+            loaded = await db.get(Environment, env.id)
+            assert inspect(loaded).detached
+            # Columns loaded by the query are still readable...
+            assert loaded.name == "LazyEnv"
+            # ...but lazy relationships can't be loaded anymore
+            with pytest.raises(DetachedInstanceError):
+                loaded.owner
+            # The session is reusable for the next read
+            assert await db.get(User, user.id) is not None
+    finally:
+        async with database.get_session() as db:
+            await db.delete(await db.get(Environment, env.id))
+        await delete_user(user.id)
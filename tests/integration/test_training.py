@@ -0,0 +1,45 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.agents import agent_manager
+from app.agents.agent_manager import AgentManager
+from app.db.session import database
+from app.models import Environment, User
+from app.models.training import TrainingSession
+from app.services.checkpoints import checkpoint_store
+from app.services.job_registry import InMemoryJobRegistry
+from app.services.training import TrainingManager, TrainingStopped
+
+
+@pytest.mark.asyncio
+async def test_stop_from_on_step_keeps_a_partial_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_manager, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(checkpoint_store, "directory", str(tmp_path))
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="x")
+    env = Environment(name="StopEnv", env_id="CartPole-v1", owner=user)
+    async with database.get_session() as db:
+        db.add(env)
+
+    def on_step(job):
+        # As the Celery worker's hook does once the task is revoked
+        if job.stats.reward.count == 5:
+            raise TrainingStopped()
+
+    try:
+        manager = TrainingManager(backend="local", registry=InMemoryJobRegistry())
+        with pytest.raises(TrainingStopped):
+            await manager.run_job("StopEnv", on_step=on_step)
+
+        async with database.get_session(read_only=True) as db:
+            result = await db.execute(select(TrainingSession).filter_by(environment_id=env.id))
+            sessions = result.scalars().all()
+        assert [session.steps for session in sessions] == [5]
+        checkpoint = checkpoint_store.load("StopEnv")
+        assert checkpoint.steps == 5 and checkpoint.session_id == sessions[0].id
+        assert AgentManager.load("StopEnv") is not None
+    finally:
+        async with database.get_session() as db:
+            await db.delete(await db.get(Environment, env.id))
+            await db.delete(await db.get(User, user.id))
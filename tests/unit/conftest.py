@@ -0,0 +1,18 @@
+import pytest
+
+from app.agents import agent_manager
+from app.services.checkpoints import checkpoint_store
+
+
+@pytest.fixture(autouse=True)
+def reset_db():
+    """Unit tests never touch the database."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def agent_files(tmp_path, monkeypatch):
+    """Saved agents and checkpoints go to a temporary directory, not the repo."""
+    monkeypatch.setattr(agent_manager, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(checkpoint_store, "directory", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,37 @@
+import asyncio
+
+from app.agents.q_agent import QAgent
+from app.services.checkpoints import Checkpoint, CheckpointStore
+from app.utils.stats import EpisodeStats
+from app.utils.time import utcnow
+
+
+def make_checkpoint(steps: int) -> Checkpoint:
+    return Checkpoint(
+        env_name="cartpole",
+        agent=QAgent(state_size=4, action_size=2),
+        observation=[0.0, 0.0, 0.0, 0.0],
+        states=[],
+        rewards=[1.0] * steps,
+        stats=EpisodeStats(),
+        snapshot=None,
+        started_at=utcnow(),
+    )
+
+
+def test_save_skips_while_a_write_is_in_flight(tmp_path):
+    async def run():
+        store = CheckpointStore(str(tmp_path))
+        first = store.save(make_checkpoint(10))
+        assert store.save(make_checkpoint(20)) is None
+        await first
+
+        assert store.load("cartpole").steps == 10
+        assert not list(tmp_path.glob("*.tmp"))
+        await store.save(make_checkpoint(30))
+        assert store.load("cartpole").steps == 30
+
+        await store.delete("cartpole")
+        assert store.load("cartpole") is None
+
+    asyncio.run(run())
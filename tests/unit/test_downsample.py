@@ -0,0 +1,27 @@
+import numpy as np
+
+from app.utils.downsample import lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(10_000)
+    y = np.sin(x / 300)
+
+    keep = lttb_indices(x, y, 100)
+
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_returns_everything_under_budget():
+    assert list(lttb_indices([0, 1, 2], [3, 1, 2], 10)) == [0, 1, 2]
+
+
+def test_lttb_preserves_spikes():
+    y = np.zeros(1000)
+    y[537] = 50.0
+
+    keep = lttb_indices(np.arange(1000), y, 20)
+
+    assert 537 in keep
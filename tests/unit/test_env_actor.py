@@ -0,0 +1,40 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import gymnasium as gym
+import pytest
+
+from app.services.env_actor import EnvActor
+
+
+def test_commands_fail_once_the_executor_is_gone():
+    async def run():
+        executor = ThreadPoolExecutor(1)
+        executor.shutdown()
+        env = gym.make("CartPole-v1")
+        actor = EnvActor("cartpole", env, max_batch=1, executor=executor)
+        first = actor.submit(lambda env: env.reset())
+        queued = actor.submit(lambda env: env.reset())
+
+        with pytest.raises(RuntimeError, match="shutdown"):
+            await asyncio.wait_for(first, 1)
+        with pytest.raises(RuntimeError, match="is closed"):
+            await asyncio.wait_for(queued, 1)
+        with pytest.raises(RuntimeError):
+            actor.submit(lambda env: env.reset())
+        await actor.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_cancelled_actor_fails_pending_commands():
+    async def run():
+        actor = EnvActor("cartpole", gym.make("CartPole-v1"), executor=ThreadPoolExecutor(1))
+        pending = actor.submit(lambda env: env.reset())
+        actor._task.cancel()
+
+        with pytest.raises(Exception):
+            await asyncio.wait_for(pending, 1)
+        assert actor.closed
+
+    asyncio.run(run())
@@ -0,0 +1,76 @@
+import asyncio
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.agents.agent_manager import AgentManager
+from app.agents.q_agent import QAgent
+from app.services.evaluation import EvaluationService, run_greedy_episodes, summarize
+from app.services.training import TrainingJob, training_manager
+
+
+class FakeSession:
+    def __init__(self, env_obj):
+        self.env_obj = env_obj
+
+    async def execute(self, statement):
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: self.env_obj))
+
+    def add(self, record):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, record):
+        pass
+
+
+def trained_agent() -> QAgent:
+    agent = QAgent(state_size=4, action_size=2)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        agent.learn(rng.normal(size=4), int(rng.integers(2)), 1.0, rng.normal(size=4), False)
+    return agent
+
+
+def test_greedy_rollouts_are_deterministic():
+    payload = pickle.dumps(trained_agent())
+
+    first = run_greedy_episodes("CartPole-v1", payload, [0, 1, 2], max_steps=500)
+    second = run_greedy_episodes("CartPole-v1", payload, [0, 1, 2], max_steps=500)
+
+    assert first == second
+
+
+def test_evaluate_leaves_saved_and_training_agents_untouched(agent_files):
+    async def run():
+        service = EvaluationService(max_workers=2)
+        db = FakeSession(SimpleNamespace(id="env-1", env_id="CartPole-v1"))
+        try:
+            AgentManager.save("saved", trained_agent())
+            path = AgentManager.get_model_path("saved")
+            with open(path, "rb") as f:
+                saved = f.read()
+            await service.evaluate("saved", db, episodes=4)
+            with open(path, "rb") as f:
+                assert f.read() == saved
+
+            job = training_manager.jobs["live"] = TrainingJob(env_name="live", agent=trained_agent())
+            live = pickle.dumps(job.agent)
+            record = await service.evaluate("live", db, episodes=4)
+            assert pickle.dumps(job.agent) == live
+            assert record.q_table_states == len(job.agent.q_table) > 0
+        finally:
+            training_manager.jobs.pop("live", None)
+            service.shutdown()
+
+    asyncio.run(run())
+
+
+def test_summarize_percentiles():
+    summary = summarize([1.0, 2.0, 3.0, 4.0, 5.0], [10, 10, 10, 10, 10])
+    assert summary["mean_return"] == 3.0
+    assert summary["percentiles"]["p50"] == 3.0
+    assert summary["min_return"] == 1.0 and summary["max_return"] == 5.0
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import job_registry
+from app.services.job_registry import InMemoryJobRegistry, RedisJobRegistry
+
+
+def test_lease_ownership_and_stop_flag():
+    async def run():
+        registry = InMemoryJobRegistry()
+        assert await registry.register("cartpole", "worker-a", 30)
+        assert not await registry.register("cartpole", "worker-b", 30)
+        # The owner renews its own lease
+        assert await registry.register("cartpole", "worker-a", 30)
+
+        assert await registry.heartbeat("cartpole", "worker-a", 30, {"steps": 10}) is False
+        assert await registry.heartbeat("cartpole", "worker-b", 30) is None
+        assert (await registry.get("cartpole")).progress == {"steps": 10}
+
+        assert await registry.request_stop("cartpole")
+        assert await registry.heartbeat("cartpole", "worker-a", 30) is True
+        assert not await registry.release("cartpole", "worker-b")
+        assert await registry.release("cartpole", "worker-a")
+        assert await registry.get("cartpole") is None
+        assert not await registry.request_stop("cartpole")
+
+    asyncio.run(run())
+
+
+def test_lease_expires_without_heartbeats():
+    async def run():
+        registry = InMemoryJobRegistry()
+        await registry.register("cartpole", "worker-a", 0.05)
+        time.sleep(0.1)
+        assert await registry.get("cartpole") is None
+        assert await registry.heartbeat("cartpole", "worker-a", 30) is None
+        assert await registry.register("cartpole", "worker-b", 30)
+
+    asyncio.run(run())
+
+
+
+@pytest.fixture
+def redis_registry(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        job_registry.aioredis.Redis, "from_url",
+        lambda url, **kwargs: fakeredis.aioredis.FakeRedis(server=server, **kwargs),
+    )
+    return RedisJobRegistry("redis://fake")
+
+
+def test_redis_lease_ownership_and_stop_flag(redis_registry):
+    async def run():
+        registry = redis_registry
+        assert await registry.register("cartpole", "worker-a", 30)
+        assert not await registry.register("cartpole", "worker-b", 30)
+        assert await registry.heartbeat("cartpole", "worker-a", 30, {"steps": 10}) is False
+        assert await registry.heartbeat("cartpole", "worker-b", 30) is None
+
+        assert await registry.request_stop("cartpole")
+        lease = await registry.get("cartpole")
+        assert lease.owner == "worker-a" and lease.progress == {"steps": 10} and lease.stop_requested
+        assert await registry.heartbeat("cartpole", "worker-a", 30) is True
+
+        # Only the owner, or an unconditional release, removes the lease
+        assert not await registry.release("cartpole", "worker-b")
+        assert (await registry.get("cartpole")).owner == "worker-a"
+        assert await registry.release("cartpole", "worker-a")
+        assert await registry.get("cartpole") is None
+        assert await registry.register("cartpole", "worker-b", 30)
+        assert await registry.release("cartpole")
+        await registry.close()
+
+    asyncio.run(run())
+
+
+def test_redis_lease_expires_without_heartbeats(redis_registry):
+    async def run():
+        registry = redis_registry
+        await registry.register("cartpole", "worker-a", 0.05)
+        await asyncio.sleep(0.1)
+        assert await registry.get("cartpole") is None
+        assert await registry.heartbeat("cartpole", "worker-a", 30) is None
+        assert not await registry.request_stop("cartpole")
+        assert await registry.register("cartpole", "worker-b", 30)
+        await registry.close()
+
+    asyncio.run(run())
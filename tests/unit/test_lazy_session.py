@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+
+from app.db.session import LazySession
+
+
+def db_error(connection_invalidated: bool = False) -> exc.OperationalError:
+    return exc.OperationalError("SELECT 1", {}, Exception("db error"), connection_invalidated=connection_invalidated)
+
+
+class FakeSession:
+    def __init__(self, name: str, connect_error=None, execute_error=None):
+        self.name = name
+        self.connect_error = connect_error
+        self.execute_error = execute_error
+        self.closed = 0
+
+    async def connection(self):
+        if self.connect_error is not None:
+            raise self.connect_error
+
+    async def execute(self, statement):
+        if self.execute_error is not None:
+            raise self.execute_error
+        return self.name
+
+    async def close(self):
+        self.closed += 1
+
+
+def replica_session(replica: FakeSession, fallbacks: list) -> LazySession:
+    return LazySession(
+        lambda: replica, read_only=True,
+        fallback=lambda: FakeSession("primary"), on_fallback=fallbacks.append,
+    )
+
+
+def test_falls_back_when_the_replica_is_unreachable():
+    fallbacks = []
+    replica = FakeSession("replica", connect_error=db_error())
+    session = replica_session(replica, fallbacks)
+
+    assert asyncio.run(session.execute("SELECT 1")) == "primary"
+    assert fallbacks == [replica.connect_error]
+    assert replica.closed == 1
+    # Later reads of the session stay on the primary
+    assert asyncio.run(session.execute("SELECT 1")) == "primary"
+
+
+def test_falls_back_when_the_connection_drops_mid_statement():
+    fallbacks = []
+    session = replica_session(FakeSession("replica", execute_error=db_error(connection_invalidated=True)), fallbacks)
+
+    assert asyncio.run(session.execute("SELECT 1")) == "primary"
+    assert len(fallbacks) == 1
+
+
+def test_statement_errors_do_not_fall_back():
+    fallbacks = []
+    error = db_error()
+    session = replica_session(FakeSession("replica", execute_error=error), fallbacks)
+
+    with pytest.raises(exc.OperationalError) as raised:
+        asyncio.run(session.execute("SELECT * FROM missing"))
+    assert raised.value is error
+    assert fallbacks == []
@@ -0,0 +1,75 @@
+import asyncio
+
+from app.core.config import Config
+from app.services.job_registry import InMemoryJobRegistry
+from app.services.progress import ProgressBroadcaster, progress_broadcaster
+from app.services.training import TrainingManager
+
+
+def test_slow_subscribers_lose_their_oldest_events():
+    async def run():
+        broadcaster = ProgressBroadcaster(queue_size=2)
+        subscription = broadcaster.subscribe("cartpole")
+        for episode in range(1, 5):
+            broadcaster.publish("cartpole", {"event": "progress", "episode": episode})
+        broadcaster.publish("other", {"event": "progress", "episode": 99})
+
+        assert await subscription.get() == {"event": "progress", "episode": 3, "dropped": 2}
+        assert await subscription.get() == {"event": "progress", "episode": 4}
+        assert await subscription.get(timeout=0.01) is None
+
+    asyncio.run(run())
+
+
+def test_close_sends_the_end_event_and_drops_the_channel():
+    async def run():
+        broadcaster = ProgressBroadcaster(queue_size=1)
+        subscription = broadcaster.subscribe("cartpole")
+        broadcaster.publish("cartpole", {"event": "progress", "episode": 1})
+        broadcaster.close("cartpole", {"event": "end", "outcome": "finished"})
+
+        assert not broadcaster.has_subscribers("cartpole") and len(broadcaster) == 0
+        # The end event is never the one dropped
+        assert await subscription.get() == {"event": "end", "outcome": "finished", "dropped": 1}
+        broadcaster.publish("cartpole", {"event": "progress", "episode": 2})
+        assert await subscription.get(timeout=0.01) is None
+        broadcaster.unsubscribe(subscription)
+
+    asyncio.run(run())
+
+
+def test_watch_stops_after_the_end_event():
+    async def run():
+        manager = TrainingManager(backend="local", registry=InMemoryJobRegistry())
+        events = manager.watch("cartpole")
+        first = asyncio.create_task(anext(events))
+        await asyncio.sleep(0)
+        progress_broadcaster.publish("cartpole", {"event": "progress", "episode": 1})
+        progress_broadcaster.close("cartpole", {"event": "end", "outcome": "finished"})
+
+        assert await first == {"event": "progress", "episode": 1}
+        assert await anext(events) == {"event": "end", "outcome": "finished"}
+        assert [event async for event in events] == []
+        assert not progress_broadcaster.has_subscribers("cartpole")
+
+    asyncio.run(run())
+
+
+def test_watch_follows_leases_of_other_workers(monkeypatch):
+    monkeypatch.setattr(Config, "TRAINING_HEARTBEAT_SECONDS", 0.01)
+
+    async def run():
+        registry = InMemoryJobRegistry()
+        manager = TrainingManager(backend="local", registry=registry)
+        await registry.register("cartpole", "worker-b", 30)
+        await registry.heartbeat("cartpole", "worker-b", 30, {"episode": 5})
+        events = manager.watch("cartpole")
+
+        assert await anext(events) == {"event": "progress", "episode": 5}
+        # Nothing new until the next heartbeat
+        assert await anext(events) is None
+        await registry.release("cartpole", "worker-b")
+        assert await anext(events) == {"event": "end", "env_name": "cartpole", "outcome": "ended"}
+        assert [event async for event in events] == []
+
+    asyncio.run(run())
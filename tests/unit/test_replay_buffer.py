@@ -0,0 +1,46 @@
+import numpy as np
+
+from app.agents.q_agent import QAgent
+from app.agents.replay_buffer import ReplayBuffer
+
+
+def fill(buffer: ReplayBuffer, count: int):
+    for i in range(count):
+        buffer.add((float(i), 0.0), i % 2, 1.0, (float(i + 1), 0.0), False)
+
+
+def test_overwrites_oldest_transitions():
+    buffer = ReplayBuffer(capacity=4, state_size=2, seed=0)
+    fill(buffer, 6)
+
+    assert len(buffer) == 4
+    assert sorted(buffer.states[:, 0]) == [2.0, 3.0, 4.0, 5.0]
+    indices, weights = buffer.sample(100)
+    assert weights is None
+    assert indices.min() >= 0 and indices.max() < 4
+
+
+def test_prioritized_sampling_follows_td_errors():
+    buffer = ReplayBuffer(capacity=5, state_size=2, prioritized=True, alpha=1.0, seed=0)
+    fill(buffer, 5)
+    buffer.update_priorities(np.arange(5), np.array([0.0, 0.0, 9.0, 0.0, 1.0]))
+
+    indices, weights = buffer.sample(10000)
+    counts = np.bincount(indices, minlength=5)
+    assert counts[2] > 8 * counts[4] > 0
+    assert counts[0] == counts[1] == counts[3] == 0
+    # The most likely transition gets the smallest importance weight
+    assert weights[indices == 2].max() < weights[indices == 4].min() == 1.0
+
+
+def test_replay_applies_td_updates():
+    agent = QAgent(state_size=2, action_size=2, learning_rate=0.5, discount_factor=0.9)
+    buffer = ReplayBuffer(capacity=1, state_size=2, seed=0)
+    buffer.add(agent.get_state_key(np.array([0.0, 0.0])), 1, 1.0, agent.get_state_key(np.array([1.0, 0.0])), True)
+
+    td_errors = agent.replay(buffer, batch_size=2)
+
+    # Both samples use the values from before the batch
+    assert list(td_errors) == [1.0, 1.0]
+    assert list(agent.q_table[(0.0, 0.0)]) == [0.0, 1.0]
+    assert list(agent.q_table[(1.0, 0.0)]) == [0.0, 0.0]
@@ -0,0 +1,39 @@
+import pytest
+
+from app.exceptions.custom_error import TrainingBacklogFullError
+from app.services.scheduler import QueuedJob, TrainingScheduler
+
+
+def make_scheduler(**kwargs):
+    started = []
+    scheduler = TrainingScheduler(lambda job: started.append(job.env_name), **kwargs)
+    return scheduler, started
+
+
+def test_priority_then_round_robin_between_users():
+    scheduler, started = make_scheduler(max_concurrent=1, max_backlog=10)
+    scheduler.submit(QueuedJob("running", "alice"))
+    for name in ("a1", "a2", "a3"):
+        scheduler.submit(QueuedJob(name, "alice"))
+    scheduler.submit(QueuedJob("b1", "bob"))
+    scheduler.submit(QueuedJob("urgent", "bob", priority=5))
+
+    assert [job.env_name for job in scheduler.order()] == ["urgent", "a1", "b1", "a2", "a3"]
+    assert scheduler.status("b1")["queue_position"] == 3
+
+    for name in ["running", "urgent", "a1", "b1", "a2"]:
+        scheduler.release(name)
+    assert started == ["running", "urgent", "a1", "b1", "a2", "a3"]
+
+
+def test_backlog_limit_and_cancel():
+    scheduler, started = make_scheduler(max_concurrent=1, max_backlog=1)
+    assert scheduler.submit(QueuedJob("first", "alice"))
+    assert not scheduler.submit(QueuedJob("second", "alice"))
+    with pytest.raises(TrainingBacklogFullError):
+        scheduler.submit(QueuedJob("third", "bob"))
+
+    assert scheduler.cancel("second")
+    scheduler.release("first")
+    assert started == ["first"]
+    assert len(scheduler) == 0
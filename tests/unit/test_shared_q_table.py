@@ -0,0 +1,124 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from app.agents.q_agent import QAgent
+from app.agents.shared_q_table import HogwildQAgent, QTableFullError, SharedQTable
+from app.services.parallel_training import ParallelRun, ParallelTrainer, hogwild_worker
+
+
+def add_ones(table: SharedQTable, keys):
+    for key in keys:
+        with table.lock(key):
+            table.setdefault(key, np.zeros(table.action_size))[0] += 1.0
+    table.close()
+
+
+def learn_locked(table: SharedQTable, seed: int):
+    agent = HogwildQAgent(table, epsilon=0.0)
+    # A few hot states, each update leading to a new state that needs a slot
+    for i in range(1000):
+        agent.learn(np.array([float(i % 4), 0.0]), 0, 1.0, np.array([float(i), float(seed + 1)]), False)
+    table.close()
+
+
+@pytest.fixture
+def table():
+    table = SharedQTable.create(multiprocessing.get_context("spawn"), state_size=2, action_size=3, capacity=8, stripes=4)
+    yield table
+    table.close()
+
+
+def test_behaves_like_a_dict(table):
+    table[(0.1, 0.2)] = [1.0, 2.0, 3.0]
+    table[(0.1, 0.2)][1] += 1.0
+
+    assert (0.1, 0.2) in table
+    assert (0.2, 0.1) not in table
+    assert table.get((0.2, 0.1)) is None
+    assert list(table[(0.1, 0.2)]) == [1.0, 3.0, 3.0]
+    # setdefault keeps an existing row
+    assert list(table.setdefault((0.1, 0.2), np.zeros(3))) == [1.0, 3.0, 3.0]
+    assert len(table) == 1
+
+
+def test_raises_when_full(table):
+    table.update({(float(i), 0.0): np.zeros(3) for i in range(8)})
+    with pytest.raises(QTableFullError):
+        table[(9.0, 0.0)] = np.zeros(3)
+
+
+def test_processes_share_updates(table):
+    ctx = multiprocessing.get_context("spawn")
+    keys = [(float(i), 1.0) for i in range(4)]
+    workers = [ctx.Process(target=add_ones, args=(table, keys)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert {key: values[0] for key, values in table.items()} == {key: 2.0 for key in keys}
+
+
+def test_hogwild_agent_learns_into_the_table(table):
+    agent = HogwildQAgent(table, learning_rate=0.5)
+    agent.learn(np.array([0.0, 0.0]), 1, 1.0, np.array([1.0, 0.0]), True)
+
+    saved = QAgent(state_size=2, action_size=3)
+    saved.q_table = table.to_dict()
+    assert list(saved.q_table[(0.0, 0.0)]) == [0.0, 0.5, 0.0]
+    assert list(saved.q_table[(1.0, 0.0)]) == [0.0, 0.0, 0.0]
+
+
+def test_locked_updates_do_not_deadlock():
+    ctx = multiprocessing.get_context("spawn")
+    # A capacity that isn't a multiple of the stripes, nearly full: long probe paths
+    table = SharedQTable.create(ctx, state_size=2, action_size=1, capacity=4099, stripes=3, lock_updates=True)
+    try:
+        workers = [ctx.Process(target=learn_locked, args=(table, seed)) for seed in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert not any(worker.is_alive() for worker in workers)
+        assert all(worker.exitcode == 0 for worker in workers)
+        assert len(table) == 4004
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        table.close()
+
+
+def test_worker_reports_a_full_table_as_an_error():
+    ctx = multiprocessing.get_context("spawn")
+    table = SharedQTable.create(ctx, state_size=4, action_size=2, capacity=8)
+    results, stop_event = ctx.Queue(), ctx.Event()
+    try:
+        process = ctx.Process(target=hogwild_worker, args=(table, "CartPole-v1", {}, 1000, 0, 500, results, stop_event))
+        process.start()
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    finally:
+        table.close()
+
+    run = ParallelRun("cartpole", workers=1, episodes=1000, locked=False)
+    ParallelTrainer._drain(run, results)
+    assert run.error.startswith("worker 0: ")
+    assert run.finished == len(run.returns) < 1000
+
+
+def test_worker_reports_any_failure_as_an_error(table):
+    ctx = multiprocessing.get_context("spawn")
+    results, stop_event = ctx.Queue(), ctx.Event()
+    process = ctx.Process(target=hogwild_worker, args=(table, "NoSuchEnv-v0", {}, 10, 0, 500, results, stop_event))
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == 0
+
+    run = ParallelRun("nosuchenv", workers=1, episodes=10, locked=False)
+    ParallelTrainer._drain(run, results)
+    assert run.error.startswith("worker 0: NameNotFound") and run.finished == 0
@@ -0,0 +1,29 @@
+import numpy as np
+
+from app.utils.stats import EpisodeStats, RunningStats
+
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(0).normal(3.0, 2.0, size=1000)
+    stats = RunningStats()
+    for v in values:
+        stats.update(v)
+
+    assert stats.count == 1000
+    assert np.isclose(stats.total, values.sum())
+    assert np.isclose(stats.mean, values.mean())
+    assert np.isclose(stats.std, values.std())
+    assert stats.min == values.min() and stats.max == values.max()
+
+
+def test_episode_stats_columns():
+    stats = EpisodeStats()
+    for reward, td_error, epsilon in [(1.0, -0.5, 0.9), (0.0, 1.5, 0.8)]:
+        stats.update(reward, td_error, epsilon)
+
+    columns = stats.as_columns()
+    assert columns["steps"] == 2
+    assert columns["total_reward"] == 1.0
+    assert columns["td_error_mean"] == 1.0
+    assert columns["td_error_max"] == 1.5
+    assert columns["epsilon"] == 0.8
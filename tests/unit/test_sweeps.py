@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.sweep import SweepCreate
+from app.services.sweeps import best_trial, expand_space, halving_budgets, run_trial
+
+
+def test_grid_and_random_spaces():
+    grid = SweepCreate(space={"learning_rate": [0.1, 0.2], "discount_factor": [0.9, 0.95, 0.99]})
+    assert len(expand_space(grid)) == 6
+
+    random_search = SweepCreate(
+        strategy="random", trials=20, seeds=[7],
+        space={"learning_rate": {"low": 0.01, "high": 1.0, "log": True}, "epsilon_min": [0.01, 0.05]},
+    )
+    configs = expand_space(random_search)
+    assert len(configs) == 20
+    assert all(0.01 <= c["learning_rate"] <= 1.0 and c["epsilon_min"] in (0.01, 0.05) for c in configs)
+    assert configs == expand_space(random_search)
+
+    with pytest.raises(ValidationError):
+        SweepCreate(space={"learning_rate": {"low": 0.1, "high": 0.2}})
+    with pytest.raises(ValidationError):
+        SweepCreate(space={"batch_size": [32]})
+
+
+def test_successive_halving_budgets_and_best_trial():
+    assert halving_budgets(None, 50, 3) == [50]
+    assert halving_budgets(2, 50, 3) == [2, 6, 18, 50]
+
+    trials = [
+        {"params": {"lr": 0.1}, "episodes": 50, "score": 10.0},
+        {"params": {"lr": 0.2}, "episodes": 18, "score": 99.0},
+        {"params": {"lr": 0.3}, "episodes": 50, "score": 12.0},
+    ]
+    assert best_trial(trials)["params"] == {"lr": 0.3}
+
+
+def test_run_trial_returns_early_once_stopped():
+    stop = threading.Event()
+    stop.set()
+    assert run_trial("CartPole-v1", {}, 0, None, 0, 1000, [0], 500, stop) is None
+
+    agent_payload, score = run_trial("CartPole-v1", {}, 0, None, 0, 1, [0], 500, threading.Event())
+    assert agent_payload and score > 0
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import training
+from app.services.job_registry import InMemoryJobRegistry
+from app.services.training import TrainingManager, celery_owner
+
+
+class FakeSession:
+    def __init__(self, env_obj=None):
+        self.env_obj = env_obj
+
+    async def execute(self, statement):
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: self.env_obj))
+
+    async def commit(self):
+        pass
+
+
+def test_stopping_a_celery_job_keeps_its_lease(monkeypatch):
+    stopped = []
+    monkeypatch.setattr(training, "request_stop", stopped.append)
+
+    async def run():
+        registry = InMemoryJobRegistry()
+        manager = TrainingManager(backend="celery", registry=registry)
+        await registry.register("cartpole", celery_owner("task-1"), 30)
+
+        response = await manager.stop_training("cartpole", FakeSession())
+
+        assert response["worker"] == celery_owner("task-1")
+        assert stopped == ["task-1"]
+        # The worker still runs until its next poll: nobody else may start meanwhile
+        lease = await registry.get("cartpole")
+        assert lease.owner == celery_owner("task-1") and lease.stop_requested
+        assert (await manager.status("cartpole"))["state"] == "stopping"
+
+    asyncio.run(run())
+
+
+def test_celery_workers_look_for_the_checkpoint_to_resume(monkeypatch):
+    sent = []
+    monkeypatch.setattr(training.celery_app, "send_task", lambda name, args, task_id: sent.append(args))
+
+    async def run():
+        env_obj = SimpleNamespace(is_training=False)
+        local = TrainingManager(backend="local", registry=InMemoryJobRegistry())
+        with pytest.raises(ValueError, match="No checkpoint"):
+            await local.start_training("cartpole", FakeSession(env_obj), resume=True)
+
+        # This host's disk says nothing about what the worker sees
+        manager = TrainingManager(backend="celery", registry=InMemoryJobRegistry())
+        assert await manager.start_training("cartpole", FakeSession(env_obj), resume=True) == "queued"
+        assert sent == [["cartpole", None, True]]
+
+    asyncio.run(run())